@@ -0,0 +1,443 @@
+"""Vectorized NumPy simulation kernels for Cascade games
+
+These mirror the rules in game_logic.play_game (20 scoring opportunities,
+3/2/1 points for run/throw/kick, 1/15 cascade doubling, tie-breaker
+opportunities until the scores differ) but simulate many games at once.
+"""
+import numpy as np
+
+import bracket
+import game_logic
+
+CATEGORY_POINTS = np.array([3, 2, 1])  # run, throw, kick
+
+
+def scoring_weights(run_advantage, throw_advantage, kick_advantage):
+    """
+    Scoring-type weights used by play_game, as an array of shape [..., 3].
+    Accepts scalars or arrays of advantages.
+    """
+    advantages = np.stack(np.broadcast_arrays(run_advantage, throw_advantage, kick_advantage), axis=-1)
+    return np.maximum(1, 3 + advantages)
+
+
+def win_probabilities(advantage_diff, pd_diff, team1_total, team2_total, team1_best, team2_best, params=None):
+    """
+    Vectorized game_logic.win_probability_from_key, with the same operations
+    in the same order so results match it bit for bit.
+
+    Args:
+        advantage_diff: Overall advantage of team1 minus that of team2
+        pd_diff: Point differential of team1 minus that of team2
+        team1_total, team2_total: Points for + against of each team
+        team1_best, team2_best: best_stat_index of each team (0=Run, 1=Throw, 2=Kick)
+        params: game_logic.ModelParams (default: DEFAULT_PARAMS)
+
+    Returns:
+        Array of team1 win probabilities, broadcast over the arguments
+    """
+    params = params or game_logic.DEFAULT_PARAMS
+    team1_chance = 0.5 + advantage_diff * params.advantage_weight
+    pd_adjustment = (pd_diff / np.maximum(params.point_diff_floor, (team1_total + team2_total) / 2.0) *
+                     params.point_diff_weight)
+    team1_chance = np.where((team1_total > 0) & (team2_total > 0), team1_chance + pd_adjustment, team1_chance)
+    # Stat matchup bonus for team1, indexed [team1_best, team2_best]
+    team1_chance = team1_chance + np.array(params.stat_matchup_bonus)[team1_best, team2_best]
+    return np.clip(team1_chance, params.min_win_probability, params.max_win_probability)
+
+
+def _sample_categories(opportunities, weights, rng):
+    """Split each game's scoring opportunities into run/throw/kick counts"""
+    weights = weights.astype(float)
+    total = weights.sum(axis=-1)
+    runs = rng.binomial(opportunities, weights[..., 0] / total)
+    throws = rng.binomial(opportunities - runs, weights[..., 1] / (weights[..., 1] + weights[..., 2]))
+    kicks = opportunities - runs - throws
+    return np.stack([runs, throws, kicks], axis=-1)
+
+
+def _sample_single_category(weights, rng):
+    """Pick one scoring type per row, matching random.choices(weights=...)"""
+    cumulative = np.cumsum(weights, axis=-1)
+    draw = rng.random(len(weights)) * cumulative[:, -1]
+    return (draw[:, None] >= cumulative).sum(axis=1)
+
+
+def simulate_games_from_uniforms(team1_chance, team1_weights, team2_weights, uniforms, params=None):
+    """
+    Simulate games opportunity by opportunity, like play_game, with every
+    random decision taken from a given uniform.
+
+    Each game uses exactly scoring_opportunities + 1 opportunities' worth of
+    uniforms (the last one only if regulation ends tied; a tie always ends
+    after one tie-breaker since every score is worth at least 1 point), so
+    the same uniforms can be replayed against another scenario (common random
+    numbers) or mirrored as 1 - u (antithetic variates).
+
+    Args:
+        team1_chance, team1_weights, team2_weights: As for simulate_games
+        uniforms: Array [m, scoring_opportunities + 1, 3] of uniforms deciding, per
+            opportunity, who scores, the scoring type and the cascade zone
+        params: game_logic.ModelParams (default: DEFAULT_PARAMS)
+
+    Returns:
+        Dictionary of arrays as returned by simulate_games
+    """
+    params = params or game_logic.DEFAULT_PARAMS
+    team1_chance = np.asarray(team1_chance, dtype=float)
+    team1_weights = np.asarray(team1_weights, dtype=float)
+    team2_weights = np.asarray(team2_weights, dtype=float)
+    uniforms = np.asarray(uniforms)
+
+    team1_scores = uniforms[..., 0] < team1_chance[:, None]
+    weights = np.where(team1_scores[..., None], team1_weights[:, None, :], team2_weights[:, None, :])
+    cumulative = np.cumsum(weights, axis=-1)
+    category = (uniforms[..., 1:2] * cumulative[..., -1:] >= cumulative).sum(axis=-1)
+    cascade = uniforms[..., 2] < params.cascade_chance
+    points = CATEGORY_POINTS[category] * np.where(cascade, 2, 1)
+
+    regulation = params.scoring_opportunities
+    played = np.ones(team1_scores.shape, dtype=bool)
+    played[:, regulation] = ((points * team1_scores)[:, :regulation].sum(axis=1) ==
+                             (points * ~team1_scores)[:, :regulation].sum(axis=1))
+
+    result = {}
+    for side, scored in (('team1', team1_scores & played), ('team2', ~team1_scores & played)):
+        one_hot = (category[..., None] == np.arange(3)) & scored[..., None]
+        result[f'{side}_score'] = (points * scored).sum(axis=1)
+        result[f'{side}_counts'] = one_hot.sum(axis=1)
+        result[f'{side}_cascades'] = (one_hot & cascade[..., None]).sum(axis=1)
+    return {key: result[key] for key in ('team1_score', 'team2_score', 'team1_counts', 'team1_cascades',
+                                         'team2_counts', 'team2_cascades')}
+
+
+def simulate_games(team1_chance, team1_weights, team2_weights, rng=None, params=None):
+    """
+    Simulate independent games given per-game probabilities and weights.
+
+    Args:
+        team1_chance: Array of shape [m], chance team1 wins each scoring opportunity
+        team1_weights: Array of shape [m, 3] of run/throw/kick weights for team1
+        team2_weights: Array of shape [m, 3] of run/throw/kick weights for team2
+        rng: numpy Generator, seed or None
+        params: game_logic.ModelParams (default: DEFAULT_PARAMS)
+
+    Returns:
+        Dictionary of arrays: team1_score, team2_score, team1_counts, team1_cascades,
+        team2_counts, team2_cascades (counts are [m, 3] in run/throw/kick order)
+    """
+    rng = np.random.default_rng(rng)
+    params = params or game_logic.DEFAULT_PARAMS
+    team1_chance = np.asarray(team1_chance, dtype=float)
+    team1_weights = np.asarray(team1_weights)
+    team2_weights = np.asarray(team2_weights)
+
+    # Regulation: team1's share of the 20 opportunities is binomial, and the
+    # category/cascade splits are binomial thinnings of that share
+    team1_opportunities = rng.binomial(params.scoring_opportunities, team1_chance)
+    team2_opportunities = params.scoring_opportunities - team1_opportunities
+    team1_counts = _sample_categories(team1_opportunities, team1_weights, rng)
+    team2_counts = _sample_categories(team2_opportunities, team2_weights, rng)
+    team1_cascades = rng.binomial(team1_counts, params.cascade_chance)
+    team2_cascades = rng.binomial(team2_counts, params.cascade_chance)
+
+    team1_score = (team1_counts + team1_cascades) @ CATEGORY_POINTS
+    team2_score = (team2_counts + team2_cascades) @ CATEGORY_POINTS
+
+    # Tie-breaker: one more scoring opportunity for every game still tied
+    tied = np.flatnonzero(team1_score == team2_score)
+    while tied.size:
+        team1_scores = rng.random(tied.size) < team1_chance[tied]
+        weights = np.where(team1_scores[:, None], team1_weights[tied], team2_weights[tied])
+        category = _sample_single_category(weights, rng)
+        cascade = rng.random(tied.size) < params.cascade_chance
+        points = CATEGORY_POINTS[category] * np.where(cascade, 2, 1)
+
+        for scored, counts, cascades, score in ((team1_scores, team1_counts, team1_cascades, team1_score),
+                                                (~team1_scores, team2_counts, team2_cascades, team2_score)):
+            games = tied[scored]
+            counts[games, category[scored]] += 1
+            cascades[games, category[scored]] += cascade[scored]
+            score[games] += points[scored]
+
+        tied = tied[team1_score[tied] == team2_score[tied]]
+
+    return {
+        'team1_score': team1_score,
+        'team2_score': team2_score,
+        'team1_counts': team1_counts,
+        'team1_cascades': team1_cascades,
+        'team2_counts': team2_counts,
+        'team2_cascades': team2_cascades
+    }
+
+
+def play_games_batch(team1, team2, n, rng=None, params=None):
+    """
+    Simulate n independent games of one matchup in a single NumPy pass.
+
+    Team states are read but not modified, so every game is played from the
+    same starting advantages (unlike repeated play_game calls).
+
+    Args:
+        team1: Team object (or anything with the same advantage/points attributes)
+        team2: Team object
+        n: Number of games to simulate
+        rng: numpy Generator, seed or None
+        params: game_logic.ModelParams (default: DEFAULT_PARAMS)
+
+    Returns:
+        Dictionary of arrays as returned by simulate_games
+    """
+    team1_chance = game_logic.calculate_win_probability(team1, team2, params)
+    team1_weights = scoring_weights(team1.run_advantage, team1.throw_advantage, team1.kick_advantage)
+    team2_weights = scoring_weights(team2.run_advantage, team2.throw_advantage, team2.kick_advantage)
+    return simulate_games(
+        np.full(n, team1_chance),
+        np.broadcast_to(team1_weights, (n, 3)),
+        np.broadcast_to(team2_weights, (n, 3)),
+        rng,
+        params
+    )
+
+
+class ReplicaLeague:
+    """
+    R independent replicas of a league, stored as struct-of-arrays.
+
+    Every per-team attribute of game_logic.Team is an array of shape
+    [replicas, n_teams]; team i in every replica is names[i]. Games are played
+    with params (game_logic.ModelParams, default DEFAULT_PARAMS).
+
+    Games can instead be played from per-opportunity uniforms
+    (simulate_games_from_uniforms) drawn from uniform_rng when that is set:
+    two leagues given uniform_rng generators with the same seed then see
+    common random numbers, the same game of the same replica replaying the
+    same uniforms. With antithetic=True, replica r and replica
+    r + replicas // 2 are an antithetic pair that get u and 1 - u.
+    """
+
+    STATE_FIELDS = game_logic.TEAM_STATE_FIELDS
+
+    def __init__(self, names, replicas=1, params=None, antithetic=False):
+        if antithetic and replicas % 2:
+            raise ValueError("Antithetic sampling needs an even number of replicas")
+        self.names = list(names)
+        self.replicas = replicas
+        self.params = params or game_logic.DEFAULT_PARAMS
+        self.antithetic = antithetic
+        self.uniform_rng = None
+        shape = (replicas, len(self.names))
+        for field in self.STATE_FIELDS:
+            setattr(self, field, np.zeros(shape, dtype=np.int32))
+        self.upsets = np.zeros(replicas, dtype=np.int32)
+
+    @classmethod
+    def from_teams(cls, teams, replicas=1, params=None, antithetic=False):
+        """Create replicas that all start from the current state of teams"""
+        league = cls([team.name for team in teams], replicas, params, antithetic)
+        for field in cls.STATE_FIELDS:
+            getattr(league, field)[:] = [getattr(team, field) for team in teams]
+        return league
+
+    def to_teams(self, replica=0):
+        """Build game_logic.Team objects holding the state of one replica"""
+        teams = []
+        for i, name in enumerate(self.names):
+            team = game_logic.Team(name)
+            for field in self.STATE_FIELDS:
+                setattr(team, field, int(getattr(self, field)[replica, i]))
+            teams.append(team)
+        return teams
+
+    def best_stat_index(self):
+        """Index (0=Run, 1=Throw, 2=Kick) of each team's best stat, like Team.best_stat"""
+        stats = np.stack([self.run_advantage, self.throw_advantage, self.kick_advantage], axis=-1)
+        return np.argmax(stats, axis=-1)
+
+    def standings_order(self):
+        """
+        Team indices sorted by (wins, point differential) descending for every
+        replica, with ties kept in team order like the sorted() used for seeding.
+        """
+        point_diff = self.points_for - self.points_against
+        return np.lexsort((-point_diff, -self.wins), axis=-1)
+
+    def win_probability(self, rows, team1_idx, team2_idx):
+        """Vectorized game_logic.calculate_win_probability for the given games"""
+        pf1, pa1 = self.points_for[rows, team1_idx], self.points_against[rows, team1_idx]
+        pf2, pa2 = self.points_for[rows, team2_idx], self.points_against[rows, team2_idx]
+        best = self.best_stat_index()
+        return win_probabilities(self.overall_advantage[rows, team1_idx] - self.overall_advantage[rows, team2_idx],
+                                 (pf1 - pa1) - (pf2 - pa2), pf1 + pa1, pf2 + pa2,
+                                 best[rows, team1_idx], best[rows, team2_idx], self.params)
+
+    def play_matchups(self, team1_idx, team2_idx, rows=None, rng=None):
+        """
+        Play one game for each (team1, team2) pair in every selected replica and
+        apply the results exactly as play_game does.
+
+        Args:
+            team1_idx: Team indices broadcastable to [len(rows), games]
+            team2_idx: Team indices, same shape; a team may appear at most once per replica
+            rows: Replica indices to play in (default: all replicas)
+            rng: numpy Generator, seed or None
+
+        Returns:
+            Dictionary of [len(rows), games] arrays: team1_won, team1_score, team2_score, upset
+        """
+        rng = np.random.default_rng(rng)
+        if rows is None:
+            rows = np.arange(self.replicas)
+        rows = np.asarray(rows)
+        team1_idx, team2_idx = np.broadcast_arrays(np.asarray(team1_idx), np.asarray(team2_idx))
+        team1_idx = np.broadcast_to(team1_idx, (len(rows),) + team1_idx.shape[-1:])
+        team2_idx = np.broadcast_to(team2_idx, team1_idx.shape)
+        rows = np.broadcast_to(rows[:, None], team1_idx.shape)
+
+        team1_weights = scoring_weights(self.run_advantage[rows, team1_idx],
+                                        self.throw_advantage[rows, team1_idx],
+                                        self.kick_advantage[rows, team1_idx])
+        team2_weights = scoring_weights(self.run_advantage[rows, team2_idx],
+                                        self.throw_advantage[rows, team2_idx],
+                                        self.kick_advantage[rows, team2_idx])
+        team1_chance = self.win_probability(rows, team1_idx, team2_idx)
+
+        if self.antithetic or self.uniform_rng is not None:
+            # Drawn for every replica so the draws line up whichever rows are playing
+            source = self.uniform_rng if self.uniform_rng is not None else rng
+            shape = (team1_idx.shape[-1], self.params.scoring_opportunities + 1, 3)
+            if self.antithetic:
+                half = source.random((self.replicas // 2,) + shape)
+                replica_uniforms = np.concatenate([half, 1 - half])
+            else:
+                replica_uniforms = source.random((self.replicas,) + shape)
+            result = simulate_games_from_uniforms(team1_chance.ravel(), team1_weights.reshape(-1, 3),
+                                                  team2_weights.reshape(-1, 3),
+                                                  replica_uniforms[rows[:, 0]].reshape((-1,) + shape[1:]),
+                                                  self.params)
+        else:
+            result = simulate_games(team1_chance.ravel(), team1_weights.reshape(-1, 3),
+                                    team2_weights.reshape(-1, 3), rng, self.params)
+        shape = team1_idx.shape
+        team1_score = result['team1_score'].reshape(shape)
+        team2_score = result['team2_score'].reshape(shape)
+        team1_won = team1_score > team2_score
+
+        # Upset = lower overall advantage team wins (checked before updating advantages)
+        overall1 = self.overall_advantage[rows, team1_idx]
+        overall2 = self.overall_advantage[rows, team2_idx]
+        upset = np.where(team1_won, overall1 < overall2, overall2 < overall1)
+        np.add.at(self.upsets, rows[:, 0], upset.sum(axis=1))
+
+        self.wins[rows, team1_idx] += team1_won
+        self.wins[rows, team2_idx] += ~team1_won
+        self.losses[rows, team1_idx] += ~team1_won
+        self.losses[rows, team2_idx] += team1_won
+        self.points_for[rows, team1_idx] += team1_score
+        self.points_against[rows, team1_idx] += team2_score
+        self.points_for[rows, team2_idx] += team2_score
+        self.points_against[rows, team2_idx] += team1_score
+
+        # Winner gains and loser drops one overall advantage, clamped to +/- advantage_cap (3)
+        cap = self.params.advantage_cap
+        overall_change = np.where(team1_won, 1, -1)
+        self.overall_advantage[rows, team1_idx] = np.clip(overall1 + overall_change, -cap, cap)
+        self.overall_advantage[rows, team2_idx] = np.clip(overall2 - overall_change, -cap, cap)
+
+        # Whichever side made more of a scoring type gains that advantage
+        team1_counts = result['team1_counts'].reshape(shape + (3,))
+        team2_counts = result['team2_counts'].reshape(shape + (3,))
+        for category, field in enumerate(('run_advantage', 'throw_advantage', 'kick_advantage')):
+            values = getattr(self, field)
+            change = np.sign(team1_counts[..., category] - team2_counts[..., category])
+            values[rows, team2_idx] = np.clip(values[rows, team2_idx] - change, -cap, cap)
+            values[rows, team1_idx] = np.clip(values[rows, team1_idx] + change, -cap, cap)
+
+        return {
+            'team1_won': team1_won,
+            'team1_score': team1_score,
+            'team2_score': team2_score,
+            'upset': upset
+        }
+
+    def play_week(self, matches, rng=None):
+        """Play one week of (team1_idx, team2_idx) matches in every replica"""
+        team1_idx = np.array([match[0] for match in matches])
+        team2_idx = np.array([match[1] for match in matches])
+        return self.play_matchups(team1_idx[None, :], team2_idx[None, :], rng=rng)
+
+    def play_round_robin(self, repetitions=1, max_rounds=None, rng=None):
+        """
+        Play repetitions of the generate_round_robin_schedule schedule in every replica.
+        Returns the number of weeks played.
+        """
+        rng = np.random.default_rng(rng)
+        weeks = 0
+        for _ in range(repetitions):
+            for matches in game_logic.iter_round_robin_weeks(range(len(self.names)), max_rounds=max_rounds):
+                self.play_week(matches, rng)
+                weeks += 1
+        return weeks
+
+    def play_bracket(self, bracket, rng=None):
+        """
+        Seed every replica by its standings and play a bracket.Bracket in all of
+        them at once: each round is one batch of games across replicas, and
+        best-of-N series keep playing only where they are undecided.
+
+        Returns:
+            Dictionary with seeds [R, n_teams] and rounds, a list with the team
+            indices of every round's entrants in slot order ([R, slots], -1 for
+            byes), ending with the champions [R, 1]
+        """
+        rng = np.random.default_rng(rng)
+        seeds = self.standings_order()
+        if seeds.shape[1] < bracket.n_teams:
+            raise ValueError(f"The bracket needs at least {bracket.n_teams} teams")
+
+        slot_order = np.array(bracket.slot_order)
+        entrants = np.where(slot_order < bracket.n_teams,
+                            seeds[:, np.minimum(slot_order, bracket.n_teams - 1)], -1)
+        rounds = [entrants]
+        for wins_needed in bracket.series:
+            team1, team2 = entrants[:, 0::2], entrants[:, 1::2]
+            # Byes sit in the same slots in every replica, so real matches are whole columns
+            playing = np.flatnonzero((team1[0] >= 0) & (team2[0] >= 0))
+            winners = np.where(team1 >= 0, team1, team2)
+
+            if wins_needed == 1:
+                result = self.play_matchups(team1[:, playing], team2[:, playing], rng=rng)
+                winners[:, playing] = np.where(result['team1_won'], team1[:, playing], team2[:, playing])
+            else:
+                for match in playing:
+                    series = np.zeros((self.replicas, 2), dtype=np.int32)
+                    active = np.arange(self.replicas)
+                    while active.size:
+                        result = self.play_matchups(team1[active, match:match + 1], team2[active, match:match + 1],
+                                                    rows=active, rng=rng)
+                        team1_won = result['team1_won'][:, 0]
+                        series[active, 0] += team1_won
+                        series[active, 1] += ~team1_won
+                        active = active[series[active].max(axis=1) < wins_needed]
+                    winners[:, match] = np.where(series[:, 0] == wins_needed, team1[:, match], team2[:, match])
+            entrants = winners
+            rounds.append(entrants)
+        return {'seeds': seeds, 'rounds': rounds}
+
+    def play_tournament(self, rng=None):
+        """
+        Play the 8-team tournament (quarterfinals 1v8, 2v7, 3v6, 4v5, semifinals
+        QF1/QF2 and QF3/QF4 winners, best 2 out of 3 final) in every replica.
+
+        Returns:
+            Dictionary of team index arrays: seeds [R, n_teams], semifinalists [R, 4],
+            finalists [R, 2] and champion [R]
+        """
+        result = self.play_bracket(bracket.CLASSIC_8, rng)
+        return {
+            'seeds': result['seeds'],
+            'semifinalists': result['rounds'][1],
+            'finalists': result['rounds'][2],
+            'champion': result['rounds'][3][:, 0]
+        }
@@ -0,0 +1,223 @@
+"""Single-elimination brackets of any size, with byes, seeding and best-of-N rounds"""
+import game_logic
+
+
+def seed_teams(teams):
+    """Teams in tournament seed order (wins, then point difference)"""
+    return sorted(teams, key=lambda t: (t.wins, t.points_for - t.points_against), reverse=True)
+
+
+def standard_slot_order(size):
+    """
+    Seeds (0 = top seed) in bracket order for a power-of-two bracket, so that
+    seed 1 meets seed size and the top seeds only meet in the last rounds.
+    """
+    order = [0]
+    while len(order) < size:
+        total = 2 * len(order) - 1
+        order = [seed for top in order for seed in (top, total - top)]
+    return order
+
+
+def game_number(match_index, game_index, wins_needed):
+    """
+    Game number within a round used for the game's seed: match_index and
+    game_index count from 0 and 1. Every match owns a block of 2 * wins_needed - 1
+    numbers, so single-game rounds number games by match and a lone series by game.
+    """
+    return match_index * (2 * wins_needed - 1) + game_index
+
+
+class Bracket:
+    """
+    Structure of a single-elimination tournament.
+
+    Slots are filled from the seeded teams in slot_order; slot 2i meets slot
+    2i + 1 in the first round, and the winners of neighbouring matches meet in
+    the next. Fields that are not a power of two get byes (empty slots), which
+    the standard order hands to the top seeds.
+
+    Args:
+        n_teams: Teams in the field
+        series: Wins needed in each round (default: single games, best 2 out of 3 final)
+        slot_order: Seed index for each slot (default: standard_slot_order)
+    """
+
+    def __init__(self, n_teams, series=None, slot_order=None):
+        if n_teams < 2:
+            raise ValueError("A bracket needs at least 2 teams")
+        self.n_teams = n_teams
+        self.size = 1 << (n_teams - 1).bit_length()
+        self.rounds = self.size.bit_length() - 1
+
+        slot_order = list(slot_order) if slot_order is not None else standard_slot_order(self.size)
+        if sorted(slot_order) != list(range(self.size)):
+            raise ValueError(f"slot_order must be a permutation of range({self.size})")
+        self.slot_order = tuple(slot_order)
+        for top, bottom in zip(self.slot_order[::2], self.slot_order[1::2]):
+            if top >= n_teams and bottom >= n_teams:
+                raise ValueError("slot_order pairs two byes in the first round")
+
+        self.series = tuple(series) if series is not None else (1,) * (self.rounds - 1) + (2,)
+        if len(self.series) != self.rounds:
+            raise ValueError(f"series needs one entry per round ({self.rounds})")
+
+    def __repr__(self):
+        return f"Bracket(n_teams={self.n_teams}, series={self.series}, slot_order={self.slot_order})"
+
+    def matches_in_round(self, round_index):
+        """Number of matches (byes included) in a round"""
+        return self.size >> (round_index + 1)
+
+    def _rounds_from_end(self, round_index):
+        return self.rounds - 1 - round_index
+
+    def round_label(self, round_index):
+        """Display name of a round: 'Final', 'Semifinals', 'Quarterfinals', 'Round of 16', ..."""
+        remaining = self._rounds_from_end(round_index)
+        if remaining < 3:
+            return ("Final", "Semifinals", "Quarterfinals")[remaining]
+        return f"Round of {2 ** (remaining + 1)}"
+
+    def game_type(self, round_index):
+        """game_type for image generation: 'final', 'semifinal', 'quarterfinal', 'round_of_16', ..."""
+        remaining = self._rounds_from_end(round_index)
+        if remaining < 3:
+            return ("final", "semifinal", "quarterfinal")[remaining]
+        return f"round_of_{2 ** (remaining + 1)}"
+
+    @staticmethod
+    def _stage_name(teams_left):
+        """'title', 'finals', 'semifinals', 'quarterfinals' or 'round_of_N' for the stage with teams_left teams"""
+        if teams_left <= 8:
+            return {1: "title", 2: "finals", 4: "semifinals", 8: "quarterfinals"}[teams_left]
+        return f"round_of_{teams_left}"
+
+    def stage_names(self):
+        """Name of the stage each round is played in, e.g. ('quarterfinals', 'semifinals', 'finals')"""
+        return tuple(self._stage_name(2 ** (self._rounds_from_end(round_index) + 1))
+                     for round_index in range(self.rounds))
+
+    def advancement_names(self):
+        """
+        For each round, the name of the stage winning it reaches, e.g.
+        ('semifinals', 'finals', 'title'), as used by odds_service.
+        """
+        return tuple(self._stage_name(2 ** self._rounds_from_end(round_index))
+                     for round_index in range(self.rounds))
+
+    def entrants(self, seeded):
+        """First-round slots filled from seeded (best first); None marks a bye"""
+        if len(seeded) < self.n_teams:
+            raise ValueError(f"The bracket needs {self.n_teams} teams, got {len(seeded)}")
+        return [seeded[seed] if seed < self.n_teams else None for seed in self.slot_order]
+
+    def play(self, seeded, play_match, on_round_start=None, on_round_end=None):
+        """
+        Play the bracket round by round.
+
+        The matches of a round are independent of each other; only the next
+        round waits for their winners.
+
+        Args:
+            seeded: Entrants in seed order (best first)
+            play_match: Function (round_index, match_index, team1, team2, wins_needed) -> winner,
+                called for every match that is not a bye; team1 is the upper slot
+            on_round_start: Optional function (round_index, history) called before a round
+            on_round_end: Optional function (round_index, history) called once its winners are in history
+
+        Returns:
+            List with the entrants of every round in slot order (None for byes),
+            ending with [champion]
+        """
+        history = [self.entrants(seeded)]
+        for round_index, wins_needed in enumerate(self.series):
+            if on_round_start is not None:
+                on_round_start(round_index, history)
+            current = history[-1]
+            winners = []
+            for match_index, (team1, team2) in enumerate(zip(current[::2], current[1::2])):
+                if team1 is None or team2 is None:
+                    winners.append(team2 if team1 is None else team1)
+                else:
+                    winners.append(play_match(round_index, match_index, team1, team2, wins_needed))
+            history.append(winners)
+            if on_round_end is not None:
+                on_round_end(round_index, history)
+        return history
+
+    def layout(self, left, top, width, height, first_round=0, column_gap=50):
+        """
+        Box rectangles for the matches of every round from first_round on.
+
+        The first round shown is spread evenly over the height; every later
+        match box is centred between the two boxes that feed it.
+
+        Returns:
+            List per shown round of (x0, y0, x1, y1) tuples, one per match
+        """
+        shown = self.rounds - first_round
+        box_width = (width - column_gap * (shown - 1)) // shown
+        spacing = height / self.matches_in_round(first_round)
+        box_height = int(min(140, spacing - 20))
+
+        centers = [top + (i + 0.5) * spacing for i in range(self.matches_in_round(first_round))]
+        boxes = []
+        for column in range(shown):
+            x0 = left + column * (box_width + column_gap)
+            boxes.append([(x0, int(center - box_height / 2), x0 + box_width, int(center + box_height / 2))
+                          for center in centers])
+            centers = [(upper + lower) / 2 for upper, lower in zip(centers[::2], centers[1::2])]
+        return boxes
+
+
+# The original 8-team tournament: 1v8, 2v7, 3v6, 4v5, then QF1/QF2 and QF3/QF4
+# winners, best 2 out of 3 final
+CLASSIC_8 = Bracket(8, series=(1, 1, 2), slot_order=(0, 7, 1, 6, 2, 5, 3, 4))
+
+
+def preset(n_teams):
+    """CLASSIC_8 for an 8-team field, otherwise a standard seeded bracket"""
+    return CLASSIC_8 if n_teams == 8 else Bracket(n_teams)
+
+
+def play_bracket(teams, bracket=None, seed=None, season=0, seeded=False,
+                 on_round_start=None, on_game=None, on_round_end=None):
+    """
+    Seed teams and play a bracket with game_logic.play_game.
+
+    Args:
+        teams: List of Team objects; the top bracket.n_teams by record qualify
+        bracket: Bracket to play (default: CLASSIC_8)
+        seed: Root seed (None uses the global random module)
+        season: Season number in the game seed path
+        seeded: teams are already in seed order (e.g. StandingsEngine.ranked_teams())
+        on_round_start, on_round_end: Optional round hooks, as in Bracket.play
+        on_game: Optional function (round_index, game_num, team1, team2, wins, play_result)
+            called after every game, with the series score wins = [team1 wins, team2 wins]
+            and the (result, upset, game_result) tuple from game_logic.play_game
+
+    Returns:
+        Dictionary with 'rounds' (Bracket.play history), 'champion' and
+        'games', a list of (round_index, match_index, game_result)
+    """
+    bracket = bracket or CLASSIC_8
+    games = []
+
+    def play_match(round_index, match_index, team1, team2, wins_needed):
+        wins = [0, 0]
+        game_index = 1
+        while max(wins) < wins_needed:
+            game_num = game_number(match_index, game_index, wins_needed)
+            play_result = game_logic.play_game(team1, team2, seed=game_logic.game_stream_seed(
+                seed, season, game_logic.TOURNAMENT_STREAM, round_index + 1, game_num))
+            game_result = play_result[2]
+            wins[0 if game_result['team1_score'] > game_result['team2_score'] else 1] += 1
+            games.append((round_index, match_index, game_result))
+            if on_game is not None:
+                on_game(round_index, game_num, team1, team2, wins, play_result)
+            game_index += 1
+        return team1 if wins[0] == wins_needed else team2
+
+    rounds = bracket.play(teams if seeded else seed_teams(teams), play_match, on_round_start, on_round_end)
+    return {'rounds': rounds, 'champion': rounds[-1][0], 'games': games}
@@ -0,0 +1,144 @@
+"""Exact tournament advancement probabilities by dynamic programming over the bracket"""
+import math
+
+import numpy as np
+
+import bracket
+import exact_odds
+import game_logic
+
+# advancement_names() of the classic bracket, as odds_service reports them by default
+ADVANCEMENT_ROUNDS = bracket.CLASSIC_8.advancement_names()
+# Short caption labels for advancement_names()
+ROUND_ABBREVIATIONS = {'quarterfinals': 'Quarters', 'semifinals': 'Semis', 'finals': 'Final', 'title': 'Title'}
+
+
+def series_win_probability(p, wins_needed):
+    """
+    Probability of winning a first-to-wins_needed series of independent games
+    won with probability p (works elementwise on arrays). Best of 3: p^2 (3 - 2p).
+    """
+    p = np.asarray(p, dtype=float)
+    return sum(math.comb(wins_needed - 1 + k, k) * p ** wins_needed * (1 - p) ** k
+               for k in range(wins_needed))
+
+
+def matchup_matrix(teams, params=None):
+    """
+    [N, N] array of exact single-game win probabilities: entry (i, j) is the
+    chance teams[i] beats teams[j] with teams[i] as team1 in play_game under
+    params (default: game_logic.DEFAULT_PARAMS). None entries are byes, which
+    every team beats.
+    """
+    params = params or game_logic.DEFAULT_PARAMS
+    n = len(teams)
+    matrix = np.full((n, n), 0.5)
+    for i in range(n):
+        for j in range(n):
+            if i == j:
+                continue
+            if teams[i] is None or teams[j] is None:
+                matrix[i, j] = float(teams[j] is None)
+            else:
+                matrix[i, j] = exact_odds.exact_win_probability(teams[i], teams[j], params)
+    return matrix
+
+
+def bracket_probabilities(matrix, series=bracket.CLASSIC_8.series):
+    """
+    Chance of every bracket slot winning each round.
+
+    Slot i meets slot i ^ 1 in the first round, then the winner of the
+    neighbouring pair, and so on; the upper half of each pairing is team1.
+
+    Args:
+        matrix: matchup_matrix of the teams in bracket slot order (length a power of 2)
+        series: Wins needed in each round
+
+    Returns:
+        [len(series), n_slots] array, row r = P(slot wins round r)
+    """
+    n = len(matrix)
+    alive = np.ones(n)
+    result = np.zeros((len(series), n))
+    size = 1
+    for round_index, wins_needed in enumerate(series):
+        series_prob = series_win_probability(matrix, wins_needed)
+        winning = np.empty(n)
+        for start in range(0, n, 2 * size):
+            upper = slice(start, start + size)
+            lower = slice(start + size, start + 2 * size)
+            # Each slot wins the round if it got here and beats whoever came out of the other half
+            winning[upper] = alive[upper] * (series_prob[upper, lower] @ alive[lower])
+            winning[lower] = alive[lower] * ((1 - series_prob[upper, lower]).T @ alive[upper])
+        alive = winning
+        result[round_index] = alive
+        size *= 2
+    return result
+
+
+def advancement_odds(teams, quarterfinal_winners=None, semifinal_winners=None, bracket_format=None,
+                     round_winners=None, params=None):
+    """
+    Exact chance of each team winning every round of the bracket.
+
+    Uses the current team states for every remaining game, so advantage changes
+    during the tournament itself are not modelled. Pass the winners of rounds
+    already played to get live odds for the rest of the bracket.
+
+    Args:
+        teams: List of Team objects; the top bracket_format.n_teams by record qualify
+        quarterfinal_winners: QF1..QF4 winners, once the quarterfinals are played (CLASSIC_8)
+        semifinal_winners: SF1 and SF2 winners, once the semifinals are played (CLASSIC_8)
+        bracket_format: bracket.Bracket to evaluate (default: bracket.CLASSIC_8)
+        round_winners: For other brackets, the winners of each round played so far in
+            slot order (Bracket.play history without the first entry)
+        params: game_logic.ModelParams the games are priced with (default: DEFAULT_PARAMS)
+
+    Returns:
+        Dictionary mapping team names to probabilities keyed by
+        Bracket.advancement_names(), e.g. {'semifinals', 'finals', 'title'}
+    """
+    bracket_format = bracket_format or bracket.CLASSIC_8
+    if round_winners is None:
+        round_winners = []
+        if semifinal_winners:
+            round_winners = [quarterfinal_winners, semifinal_winners]
+        elif quarterfinal_winners:
+            round_winners = [quarterfinal_winners]
+    played = len(round_winners)
+
+    if played:
+        field = list(round_winners[-1])
+    else:
+        if len(teams) < bracket_format.n_teams:
+            raise ValueError(f"Advancement odds need at least {bracket_format.n_teams} teams for the tournament")
+        field = bracket_format.entrants(bracket.seed_teams(teams))
+
+    probabilities = bracket_probabilities(matchup_matrix(field, params), bracket_format.series[played:])
+
+    round_names = bracket_format.advancement_names()
+    odds = {team.name: dict.fromkeys(round_names, 0.0) for team in teams}
+    for slot, team in enumerate(field):
+        if team is None:
+            continue
+        for round_index, round_name in enumerate(round_names):
+            if round_index < played:
+                odds[team.name][round_name] = 1.0
+            else:
+                odds[team.name][round_name] = float(probabilities[round_index - played, slot])
+    return odds
+
+
+def format_advancement_odds(odds):
+    """Caption lines for teams still alive (last three rounds), best title chance first"""
+    lines = []
+    for team_name, team_odds in sorted(odds.items(), key=lambda item: item[1]['title'], reverse=True):
+        if team_odds['title'] > 0:
+            parts = []
+            for round_name in list(team_odds)[-3:]:
+                label = ROUND_ABBREVIATIONS.get(round_name, round_name.replace('_', ' ').title())
+                precision = '.1%' if round_name == 'title' else '.0%'
+                parts.append(f"{label} {team_odds[round_name]:{precision}}")
+            lines.append(f"{team_name}: " + ", ".join(parts))
+    return "\n".join(lines)
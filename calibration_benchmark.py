@@ -0,0 +1,245 @@
+"""Calibration benchmark: posted win probabilities against actual play_game outcomes
+
+calculate_win_probability gives the chance of winning one scoring
+opportunity, and that number is what the posted odds are priced from. Who
+wins the game also depends on the weighted run/throw/kick choices, cascade
+doubling and the tie-breaker, so the posted number and the real win rate
+can disagree. This benchmark sweeps every combination of overall advantage
+and run/throw/kick advantages (-advantage_cap..advantage_cap each) for both
+teams, with point differentials at zero, and compares the two.
+"""
+import itertools
+import math
+import time
+
+import numpy as np
+
+import batch_simulation
+import exact_odds
+import game_logic
+
+
+def advantage_range(params=None):
+    """Every value an advantage can take under params: -advantage_cap..advantage_cap"""
+    cap = (params or game_logic.DEFAULT_PARAMS).advantage_cap
+    return range(-cap, cap + 1)
+
+
+def team_classes(params=None):
+    """
+    Distinct (scoring weights, best stat) combinations over all run/throw/kick
+    advantages in advantage_range(params), with how many advantage triples give each one.
+
+    Returns:
+        (weights [C, 3], best_stat [C], multiplicity [C])
+    """
+    classes = {}
+    for run, throw, kick in itertools.product(advantage_range(params), repeat=3):
+        team = game_logic.Team("")
+        team.run_advantage, team.throw_advantage, team.kick_advantage = run, throw, kick
+        key = (exact_odds.team_scoring_weights(team), game_logic.best_stat_index(team))
+        classes[key] = classes.get(key, 0) + 1
+    keys = sorted(classes)
+    return (np.array([weights for weights, _ in keys]),
+            np.array([best for _, best in keys]),
+            np.array([classes[key] for key in keys]))
+
+
+def state_space(params=None):
+    """
+    Every matchup state as a grid of overall advantage difference x team1 class x team2 class.
+
+    Args:
+        params: game_logic.ModelParams (default: DEFAULT_PARAMS)
+
+    Returns:
+        Dictionary with 'advantage_diff' [D], 'weights', 'best_stat' (per class),
+        'posted' [D, C, C] calculate_win_probability of each state and
+        'multiplicity' [D, C, C], the number of full team states mapping to it
+    """
+    params = params or game_logic.DEFAULT_PARAMS
+    weights, best_stat, class_multiplicity = team_classes(params)
+    values = len(advantage_range(params))
+    advantage_diff = np.arange(1 - values, values)
+    # Pairs (overall1, overall2) in advantage_range with each difference
+    diff_multiplicity = values - np.abs(advantage_diff)
+
+    posted = np.empty((len(advantage_diff), len(weights), len(weights)))
+    for d, diff in enumerate(advantage_diff):
+        for best1 in range(3):
+            for best2 in range(3):
+                probability = game_logic.win_probability_from_key((int(diff), best1, best2, 0, 0), params)
+                posted[d][np.ix_(best_stat == best1, best_stat == best2)] = probability
+    multiplicity = (diff_multiplicity[:, None, None] * class_multiplicity[None, :, None] *
+                    class_multiplicity[None, None, :])
+    return {
+        'advantage_diff': advantage_diff,
+        'weights': weights,
+        'best_stat': best_stat,
+        'posted': posted,
+        'multiplicity': multiplicity.astype(float)
+    }
+
+
+def exact_win_rates(posted, weights, params=None):
+    """
+    Exact play_game win probability for every state, vectorized over the grid.
+
+    Given team1 wins k of the n scoring opportunities, the scores are independent
+    k- and (n - k)-fold sums of per-opportunity points, so P(team1 ahead) and
+    P(tie) for every class pair are one matrix product per k; a tie is decided
+    by one more opportunity.
+
+    Args:
+        posted: [..., C, C] per-opportunity chance of team1 (calculate_win_probability)
+        weights: [C, 3] scoring weights of each class
+        params: game_logic.ModelParams (default: DEFAULT_PARAMS)
+
+    Returns:
+        Array shaped like posted
+    """
+    params = params or game_logic.DEFAULT_PARAMS
+    n = params.scoring_opportunities
+    powers = np.stack([exact_odds.points_distributions(w, params) for w in weights])
+    # below[c, m, s] = P(sum of m opportunities for class c < s)
+    below = np.concatenate([np.zeros(powers.shape[:2] + (1,)), np.cumsum(powers, axis=-1)[..., :-1]], axis=-1)
+    reverse = slice(None, None, -1)
+    ahead = np.einsum('aki,bki->kab', powers, below[:, reverse])
+    tied = np.einsum('aki,bki->kab', powers, powers[:, reverse])
+
+    posted = np.asarray(posted, dtype=float)
+    win = np.zeros(posted.shape)
+    for k in range(n + 1):
+        opportunity_prob = math.comb(n, k) * posted ** k * (1 - posted) ** (n - k)
+        win += opportunity_prob * (ahead[k] + tied[k] * posted)
+    return win
+
+
+def sample_win_rates(posted, team1_weights, team2_weights, games_per_state, rng=None, params=None):
+    """
+    Empirical win rates from batch_simulation.simulate_games.
+
+    Args:
+        posted: [S] team1 opportunity chance of each sampled state
+        team1_weights, team2_weights: [S, 3] scoring weights
+        games_per_state: Games simulated per state
+        params: game_logic.ModelParams (default: DEFAULT_PARAMS)
+
+    Returns:
+        [S] fraction of games team1 won
+    """
+    rng = np.random.default_rng(rng)
+    result = batch_simulation.simulate_games(np.repeat(posted, games_per_state),
+                                             np.repeat(team1_weights, games_per_state, axis=0),
+                                             np.repeat(team2_weights, games_per_state, axis=0), rng, params)
+    team1_won = result['team1_score'] > result['team2_score']
+    return team1_won.reshape(len(posted), games_per_state).mean(axis=1)
+
+
+def calibration_metrics(posted, actual, weight=None, bins=20):
+    """
+    How well posted probabilities match actual win rates.
+
+    Args:
+        posted: Posted team1 win probabilities
+        actual: True (or measured) team1 win probabilities of the same states
+        weight: How often each state occurs (default: equally often)
+        bins: Number of equal-width posted-probability bins
+
+    Returns:
+        Dictionary with:
+            expected_calibration_error: weighted mean |posted - actual| over bins
+            max_calibration_error: largest bin gap
+            mean_absolute_error: weighted mean |posted - actual| over states
+            brier: expected Brier score of the posted numbers against game outcomes
+            best_brier: the same for perfectly calibrated numbers (actual)
+            reliability: list of (bin low, bin high, share of states, mean posted, mean actual)
+    """
+    posted = np.ravel(posted)
+    actual = np.ravel(actual)
+    weight = np.ones_like(posted) if weight is None else np.ravel(weight).astype(float)
+    weight = weight / weight.sum()
+
+    edges = np.linspace(0.0, 1.0, bins + 1)
+    bin_index = np.clip(np.digitize(posted, edges) - 1, 0, bins - 1)
+    share = np.bincount(bin_index, weight, bins)
+    mean_posted = np.divide(np.bincount(bin_index, weight * posted, bins), share,
+                            out=np.zeros(bins), where=share > 0)
+    mean_actual = np.divide(np.bincount(bin_index, weight * actual, bins), share,
+                            out=np.zeros(bins), where=share > 0)
+    gap = np.abs(mean_posted - mean_actual)
+
+    return {
+        'expected_calibration_error': float(share @ gap),
+        'max_calibration_error': float(gap[share > 0].max()),
+        'mean_absolute_error': float(weight @ np.abs(posted - actual)),
+        # E[(p - y)^2] with y ~ Bernoulli(actual)
+        'brier': float(weight @ (actual * (1 - posted) ** 2 + (1 - actual) * posted ** 2)),
+        'best_brier': float(weight @ (actual * (1 - actual))),
+        'reliability': [(float(edges[b]), float(edges[b + 1]), float(share[b]), float(mean_posted[b]),
+                         float(mean_actual[b])) for b in range(bins) if share[b] > 0]
+    }
+
+
+def run_benchmark(sample_states=2000, games_per_state=500, seed=None, params=None):
+    """
+    Sweep the state space of a model (params, default DEFAULT_PARAMS) and time each stage.
+
+    The exact sweep covers every state; the sampler measures empirical win
+    rates of sample_states states (drawn by how often they occur) as a check
+    that the exact numbers match simulated games.
+
+    Returns:
+        Dictionary with 'states', 'exact' and 'sampled' calibration_metrics,
+        'sampler_max_z' (largest |empirical - exact| in standard errors),
+        'games_simulated' and 'timings' in seconds per stage
+    """
+    rng = np.random.default_rng(seed)
+    timings = {}
+
+    start = time.perf_counter()
+    space = state_space(params)
+    timings['state_space'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    exact = exact_win_rates(space['posted'], space['weights'], params)
+    timings['exact_sweep'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    multiplicity = space['multiplicity'].ravel()
+    chosen = rng.choice(multiplicity.size, size=sample_states, p=multiplicity / multiplicity.sum())
+    _, class1, class2 = np.unravel_index(chosen, space['posted'].shape)
+    posted = space['posted'].ravel()[chosen]
+    empirical = sample_win_rates(posted, space['weights'][class1], space['weights'][class2], games_per_state, rng, params)
+    timings['sampler'] = time.perf_counter() - start
+
+    expected = exact.ravel()[chosen]
+    standard_error = np.sqrt(expected * (1 - expected) / games_per_state)
+    return {
+        'states': int(exact.size),
+        'exact': calibration_metrics(space['posted'], exact, space['multiplicity']),
+        'sampled': calibration_metrics(posted, empirical),
+        'sampler_max_z': float(np.max(np.abs(empirical - expected) / standard_error)),
+        'games_simulated': sample_states * games_per_state,
+        'timings': timings
+    }
+
+
+def main():
+    result = run_benchmark(seed=0)
+    exact = result['exact']
+    print(f"States swept: {result['states']}")
+    print(f"Expected calibration error: {exact['expected_calibration_error']:.4f}")
+    print(f"Max calibration error:      {exact['max_calibration_error']:.4f}")
+    print(f"Mean absolute error:        {exact['mean_absolute_error']:.4f}")
+    print(f"Brier score: {exact['brier']:.4f} (calibrated: {exact['best_brier']:.4f})")
+    print("\nPosted      Share   Posted  Actual")
+    for low, high, share, mean_posted, mean_actual in exact['reliability']:
+        print(f"{low:.2f}-{high:.2f}  {share:6.1%}  {mean_posted:.3f}   {mean_actual:.3f}")
+    print(f"\nSampler check: {result['games_simulated']} games, "
+          f"ECE {result['sampled']['expected_calibration_error']:.4f}, max |z| {result['sampler_max_z']:.2f}")
+    print("Timings: " + ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in result['timings'].items()))
+
+
+if __name__ == "__main__":
+    main()
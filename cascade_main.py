@@ -1,401 +1,415 @@
 """Main entry point for Cascade game simulation"""
+import argparse
+
+import bracket
+import bracket_odds
 import game_logic
-import image_generator
-import instagram_poster
+import odds_matrix
+import standings
 import config
 
-# Try to import Gemini image generator (optional)
-try:
-    import gemini_image_generator
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
-    print("Note: Gemini image generation not available. Install google-generativeai to use it.")
+# Pipeline stages, each including the ones before it
+RUN_MODES = ('sim', 'render', 'full')
 
 
-def main():
-    # Get user input for number of round robins
-    print("="*60)
-    print("CASCADE GAME SIMULATION")
-    print("="*60)
-    
-    while True:
-        try:
-            num_round_robins = input("\nHow many round robins would you like to play before the tournament? ")
-            num_round_robins = int(num_round_robins)
-            if num_round_robins > 0:
-                break
+def parse_args(argv=None):
+    """
+    Command-line options. Anything not given falls back to config, and in
+    interactive mode to a prompt.
+    """
+    parser = argparse.ArgumentParser(description="Cascade game simulation")
+    parser.add_argument('--round-robins', type=int, default=None,
+                        help="Round robins to play before the tournament")
+    parser.add_argument('--seasons', type=int, default=getattr(config, 'SEASONS', 1),
+                        help="Number of independent seasons to play")
+    parser.add_argument('--mode', choices=RUN_MODES, default=getattr(config, 'RUN_MODE', 'full'),
+                        help="sim: simulation only, render: also generate images, full: also post to Instagram")
+    gemini_group = parser.add_mutually_exclusive_group()
+    gemini_group.add_argument('--gemini', dest='use_gemini', action='store_true', default=None,
+                              help="Also generate Gemini artistic images")
+    gemini_group.add_argument('--no-gemini', dest='use_gemini', action='store_false')
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Root simulation seed (default: config.SIMULATION_SEED or fresh entropy)")
+    parser.add_argument('--batch', action='store_true',
+                        help="Never prompt; use arguments and config defaults instead")
+    args = parser.parse_args(argv)
+    if args.round_robins is not None and args.round_robins <= 0:
+        parser.error("--round-robins must be a positive number")
+    if args.seasons <= 0:
+        parser.error("--seasons must be a positive number")
+    return args
+
+
+class Pipeline:
+    """
+    The rendering and posting stages of a run.
+
+    Modules for a stage are only imported when the stage is enabled, so a
+    simulation-only run never loads PIL, Gemini or the Instagram client.
+    """
+
+    def __init__(self, mode='full', use_gemini=False, interactive=True):
+        self.render = mode in ('render', 'full')
+        self.post = mode == 'full'
+        self.interactive = interactive
+        self.image_generator = None
+        self.gemini_image_generator = None
+        self.instagram_poster = None
+
+        if self.render:
+            import image_generator
+            self.image_generator = image_generator
+            if getattr(config, 'USE_LOGO_PACK', True):
+                # Decoded logos from the memory-mapped pack, rebuilt only if the source files changed
+                import logo_pack
+                logo_pack.load_pack()
+            if use_gemini:
+                try:
+                    import gemini_image_generator
+                    self.gemini_image_generator = gemini_image_generator
+                except ImportError:
+                    print("Note: Gemini image generation not available. Install google-generativeai to use it.")
+        if self.post:
+            import instagram_poster
+            self.instagram_poster = instagram_poster
+
+    @property
+    def use_gemini(self):
+        return self.gemini_image_generator is not None
+
+    def confirm(self, question, default):
+        """Ask a y/n question, or return default when not interactive"""
+        if not self.interactive:
+            return default
+        return input(question).lower() == 'y'
+
+    def game_images(self, game_result, filename, game_type="game", week=None, game_number=None):
+        """
+        Render the scoreboard image and, if enabled, the Gemini photo for one game.
+
+        Returns:
+            List of generated image files (empty when rendering is disabled)
+        """
+        if not self.render:
+            return []
+        self.image_generator.generate_game_image(game_result, filename, game_type=game_type,
+                                                 week=week, game_number=game_number)
+        images = [filename]
+
+        # Generate Gemini artistic photo if enabled
+        if self.use_gemini:
+            gemini_filename = filename.replace(".png", "_gemini.png")
+            success = self.gemini_image_generator.generate_game_image_with_gemini(
+                game_result, gemini_filename, game_type=game_type, week=week, game_number=game_number,
+                is_champion=False
+            )
+            if success:
+                images.append(gemini_filename)
             else:
-                print("Please enter a positive number.")
-        except ValueError:
-            print("Please enter a valid number.")
-    
-    ROUND_ROBIN_REPETITIONS = num_round_robins
-    
-    # Ask user if they want to use Gemini API for image generation
-    use_gemini = False
-    if GEMINI_AVAILABLE:
-        print("\n" + "="*60)
-        gemini_choice = input("Would you like to use Gemini API for image generation? (y/n): ")
-        if gemini_choice.lower() == 'y':
-            use_gemini = True
-            print("Using Gemini API with random prompts for image generation.")
-        else:
-            print("Using default PIL-based image generation.")
-    
-    team_names = [
-        "Apex Predators",
-        "Vista Vipers",
-        "Skybound Storm",
-        "Raven's Renegades",
-        "Cove Crushers",
-        "Ember Enforcers",
-        "Pinnacle Pioneers",
-        "Evan City Vanguards"
-    ]
-    teams = [game_logic.Team(name) for name in team_names]
-    
-    # Save initial team states (before any games) for standings calculation
-    initial_teams = []
-    for team in teams:
-        initial_team = game_logic.Team(team.name)
-        initial_team.overall_advantage = team.overall_advantage
-        initial_team.run_advantage = team.run_advantage
-        initial_team.throw_advantage = team.throw_advantage
-        initial_team.kick_advantage = team.kick_advantage
-        initial_teams.append(initial_team)
-    
-    # Track all generated images by week
-    all_images_by_week = {}
-    # Track game results by week for standings calculation
-    game_results_by_week = {}
-    current_week = 1
-    # Track upcoming schedule for odds calculation
-    upcoming_schedule = {}
-    
-    repetition_text = "Round Robin" if ROUND_ROBIN_REPETITIONS == 1 else f"Round Robin ({ROUND_ROBIN_REPETITIONS} repetitions)"
-    print(f"\n{repetition_text}:")
-    
-    # Verify Graph API credentials are configured
-    access_token = getattr(config, 'INSTAGRAM_ACCESS_TOKEN', None)
-    account_id = getattr(config, 'INSTAGRAM_ACCOUNT_ID', None)
-    if not access_token or not account_id:
+                print(f"Warning: Gemini artistic photo generation failed for {gemini_filename}")
+        return images
+
+    def bracket(self, bracket_format, rounds, filename, first_round, seeds=None, advancement_odds=None):
+        """Render a tournament bracket image before first_round; returns the generated files"""
+        if not self.render:
+            return []
+        print(f"\nGenerating tournament bracket (before {bracket_format.stage_names()[first_round]})...")
+        self.image_generator.generate_bracket_image(bracket_format, rounds, filename, first_round, seeds,
+                                                    advancement_odds)
+        return [filename]
+
+    def publish(self, title, images, caption):
+        """Post images to Instagram; returns True when posted or when posting is disabled"""
+        if not self.post or not images:
+            return True
+        print(f"\n{'='*60}")
+        print(title)
+        print(f"{'='*60}")
+        return self.instagram_poster.post_to_instagram(images, caption)
+
+    def check_credentials(self):
+        """Verify Graph API credentials before posting; returns False to abort the run"""
+        if not self.post:
+            return True
+        access_token = getattr(config, 'INSTAGRAM_ACCESS_TOKEN', None)
+        account_id = getattr(config, 'INSTAGRAM_ACCOUNT_ID', None)
+        if access_token and account_id:
+            print("✓ Instagram Graph API credentials configured")
+            return True
         print("\n⚠️  Warning: Instagram Graph API credentials not configured!")
         print("   Please set INSTAGRAM_ACCESS_TOKEN and INSTAGRAM_ACCOUNT_ID in config.py")
         print("   Instagram posts will fail until credentials are configured.")
-        response = input("\nContinue anyway? (y/n): ")
-        if response.lower() != 'y':
+        # Unattended runs stop rather than fail every post
+        if not self.confirm("\nContinue anyway? (y/n): ", default=False):
             print("Exiting...")
-            return
-    else:
-        print("✓ Instagram Graph API credentials configured")
-
-    for round_robin_num in range(ROUND_ROBIN_REPETITIONS):
-        # Generate the full schedule for this round robin
-        full_schedule = game_logic.generate_round_robin_schedule(teams)
-        max_rounds = config.ROUNDS_PER_ROUND_ROBIN if config.ROUNDS_PER_ROUND_ROBIN else len(full_schedule)
-        
+            return False
+        return True
+
+
+def week_caption(week, league_odds, league_standings, next_matches, futures, what_if=None):
+    """Instagram caption for one week: results header, standings, next week's odds, futures and what-ifs"""
+    caption_parts = [f"Week {week} Game Results"]
+
+    # Add standings as of this week's checkpoint
+    if week in league_standings.weeks():
+        caption_parts.append("")
+        caption_parts.append("Current Standings:")
+        caption_parts.append(league_standings.format_caption(week))
+
+    # Add odds for next week's matchups
+    next_week = week + 1
+    if next_matches and league_odds.teams:
+        caption_parts.append("")
+        caption_parts.append(f"Odds for Week {next_week}:")
+        caption_parts.extend(league_odds.format_week_odds(next_matches))
+
+    # Add championship futures simulated from the current state
+    if futures:
+        caption_parts.append("")
+        caption_parts.append("Championship Odds:")
+        for team_name, odds in sorted(futures.items(), key=lambda item: item[1]['title'], reverse=True):
+            title_odds = game_logic.probability_to_american_odds(odds['title'])
+            caption_parts.append(f"{team_name} {odds_matrix.format_odds(title_odds)} ({odds['title']:.1%})")
+
+    # Add title odds with next week's closest games decided each way
+    if what_if:
+        caption_parts.append("")
+        caption_parts.append(f"What If (Week {next_week}):")
+        caption_parts.extend(what_if_lines(what_if))
+
+    return "\n".join(caption_parts)
+
+
+def what_if_lines(what_if):
+    """Caption lines 'If A wins: A 25.0% (+8.1%)' from OddsService.what_if_odds"""
+    lines = []
+    for scenario, odds in what_if['odds'].items():
+        if scenario == 'current':
+            continue
+        verb = "wins" if len(scenario) == 1 else "win"
+        changes = ", ".join(f"{name} {odds[name]['title']:.1%} ({what_if['differences'][scenario][name]['title'][0]:+.1%})"
+                            for name in scenario)
+        lines.append(f"If {' & '.join(scenario)} {verb}: {changes}")
+    return lines
+
+
+def bracket_caption(advancement):
+    """Caption for a bracket post: exact advancement odds for the teams still alive"""
+    if not advancement:
+        return ""
+    return "Advancement Odds:\n" + bracket_odds.format_advancement_odds(advancement)
+
+
+def play_season(pipeline, team_names, repetitions, simulation_seed, season=0, file_prefix=""):
+    """
+    Play one season: the round robins and the tournament, rendering and
+    posting each week as the pipeline allows.
+
+    Args:
+        pipeline: Pipeline with the enabled stages
+        team_names: Names of the teams, in schedule order
+        repetitions: Round robins played before the tournament
+        simulation_seed: Root seed; every game gets its own stream from it
+        season: Season number, part of every game's seed path
+        file_prefix: Prefix for generated image files
+
+    Returns:
+        (teams, champion), or None when the run was stopped
+    """
+    teams = [game_logic.Team(name) for name in team_names]
+
+    # Standings are updated game by game and checkpointed every week
+    league_standings = standings.StandingsEngine(teams)
+    current_week = 1
+
+    # Play-by-play of every regular season game, for the season scoring totals
+    season_log = game_logic.GameLog()
+    team_index = {team.name: i for i, team in enumerate(teams)}
+
+    repetition_text = "Round Robin" if repetitions == 1 else f"Round Robin ({repetitions} repetitions)"
+    print(f"\n{repetition_text}:")
+
+    # Matchup odds for every pairing, recomputed only for teams whose state changed
+    league_odds = odds_matrix.OddsMatrix(teams)
+
+    # The playoff bracket; futures are simulated on the same bracket that is played
+    playoff = bracket.preset(getattr(config, 'PLAYOFF_TEAMS', min(8, len(teams))))
+
+    # Championship futures only feed the captions, so they are only simulated when posting
+    futures_service = None
+    if pipeline.post and len(teams) >= playoff.n_teams:
+        import odds_service
+        futures_service = odds_service.OddsService()
+    # Next-week games (closest odds first) whose outcomes the caption branches on, 0 to skip
+    what_if_games = getattr(config, 'WHAT_IF_GAMES', 1)
+    what_if_samples = getattr(config, 'WHAT_IF_SAMPLES', 4000)
+
+    # Weeks are generated one at a time from the circle method, never the whole schedule
+    weeks_per_round_robin = game_logic.round_robin_weeks(len(teams))
+    max_rounds = min(config.ROUNDS_PER_ROUND_ROBIN or weeks_per_round_robin, weeks_per_round_robin)
+
+    for round_robin_num in range(repetitions):
         # Process each week one at a time: generate images and post immediately
-        for week_offset, matches in enumerate(full_schedule[:max_rounds], 0):
+        for week_offset, matches in enumerate(game_logic.iter_round_robin_weeks(teams, max_rounds=max_rounds), 0):
             week = current_week + week_offset
-            
-            # Store upcoming matchups for odds calculation
-            if week_offset + 1 < len(full_schedule[:max_rounds]):
-                next_week = current_week + week_offset + 1
-                upcoming_schedule[next_week] = full_schedule[week_offset + 1]
-            
+
             print(f"\nWeek {week}:")
             week_image_files = []
-            week_game_results = []
             upsets = []
-            
+
             # Play games for this week
             for game_num, (team1, team2) in enumerate(matches, 1):
-                result, upset, game_result = game_logic.play_game(team1, team2)
+                result, upset, game_result = game_logic.play_game(
+                    team1, team2,
+                    seed=game_logic.game_seed(simulation_seed, season, game_logic.REGULAR_SEASON_STREAM, week, game_num),
+                    record_events=True)
                 print(result)
-                
+                season_log.append(team_index[team1.name], team_index[team2.name], game_result['events'])
+
                 if upset:
                     upsets.append(f"{team2.name} (adv: {team2.overall_advantage}) upset {team1.name} (adv: {team1.overall_advantage})")
-                
-                # Generate scoreboard image
-                filename = f"week_{week}_game_{game_num}.png"
-                image_generator.generate_game_image(game_result, filename, game_type="game", week=week)
-                week_image_files.append(filename)
-                week_game_results.append((filename, game_result))
-                
-                # Generate Gemini artistic photo if enabled
-                if use_gemini and GEMINI_AVAILABLE:
-                    gemini_filename = f"week_{week}_game_{game_num}_gemini.png"
-                    success = gemini_image_generator.generate_game_image_with_gemini(
-                        game_result, gemini_filename, game_type="game", week=week, is_champion=False
-                    )
-                    if success:
-                        week_image_files.append(gemini_filename)
-                    else:
-                        print(f"Warning: Gemini artistic photo generation failed for {gemini_filename}")
-            
+
+                filename = f"{file_prefix}week_{week}_game_{game_num}.png"
+                week_image_files.extend(pipeline.game_images(game_result, filename, game_type="game", week=week))
+                league_standings.record_game(game_result)
+
             if upsets:
                 print("\nUpsets this week:")
                 for upset in upsets:
                     print(upset)
-            
+
+            league_standings.end_week(week)
             print("\nCurrent Standings:")
-            game_logic.display_standings(teams)
-            
-            # Store images and game results
-            all_images_by_week[week] = week_image_files
-            game_results_by_week[week] = week_game_results
-            
+            league_standings.display()
+
             # Post to Instagram immediately after generating images for this week
-            print(f"\n{'='*60}")
-            print(f"Posting Week {week} to Instagram...")
-            print(f"{'='*60}")
-            
-            # Generate caption with standings and next week odds
-            caption_parts = [f"Week {week} Game Results"]
-            
-            # Add current standings (only up to current week)
-            if initial_teams and game_results_by_week:
-                caption_parts.append("")
-                caption_parts.append("Current Standings:")
-                standings = game_logic.calculate_standings_up_to_week(initial_teams, game_results_by_week, week)
-                caption_parts.append(standings)
-            
-            # Add odds for next week's matchups
-            next_week = week + 1
-            if upcoming_schedule and next_week in upcoming_schedule and teams:
-                caption_parts.append("")
-                caption_parts.append(f"Odds for Week {next_week}:")
-                matchups = upcoming_schedule[next_week]
-                for team1, team2 in matchups:
-                    odds1, odds2 = game_logic.calculate_matchup_odds(team1, team2)
-                    odds1_str = f"+{odds1}" if odds1 > 0 else str(odds1)
-                    odds2_str = f"+{odds2}" if odds2 > 0 else str(odds2)
-                    caption_parts.append(f"{team1.name} vs {team2.name}: {team1.name} {odds1_str}, {team2.name} {odds2_str}")
-            
-            caption = "\n".join(caption_parts)
-            
+            if not pipeline.post:
+                continue
+            # Odds for the next week of this round robin
+            next_matches = game_logic.round_robin_week(teams, week_offset + 1) if week_offset + 1 < max_rounds else None
+            futures = None
+            what_if = None
+            if futures_service is not None:
+                remaining_schedule = ([game_logic.round_robin_week(teams, k) for k in range(week_offset + 1, max_rounds)] +
+                                      list(game_logic.iter_round_robin_weeks(teams, max_rounds=max_rounds)) *
+                                      (repetitions - round_robin_num - 1))
+                futures = odds_service.futures_odds(
+                    teams, remaining_schedule, game_logic.game_seed(simulation_seed, season, game_logic.FUTURES_STREAM, week),
+                    bracket_format=playoff, service=futures_service)
+                if next_matches and what_if_games:
+                    # Branch the league on next week's closest games; the rest of the week is played out
+                    closest = sorted(next_matches, key=lambda match: abs(league_odds.win_probability(*match) - 0.5))
+                    forced = closest[:what_if_games]
+                    rest_of_week = [match for match in next_matches if match not in forced]
+                    what_if = futures_service.what_if_odds(
+                        teams, forced, ([rest_of_week] if rest_of_week else []) + remaining_schedule[1:],
+                        what_if_samples, seed=game_logic.game_seed(simulation_seed, season, game_logic.FUTURES_STREAM,
+                                                                   week, 1),
+                        bracket_format=playoff)
+            caption = week_caption(week, league_odds, league_standings, next_matches, futures, what_if)
+
             # Post all images for this week as a single carousel/gallery post
-            success = instagram_poster.post_to_instagram(week_image_files, caption)
+            success = pipeline.publish(f"Posting Week {week} to Instagram...", week_image_files, caption)
             if not success:
                 print(f"Warning: Failed to post Week {week} images")
-                response = input("Continue to next week? (y/n): ")
-                if response.lower() != 'y':
-                    break
-        
+                if not pipeline.confirm("Continue to next week? (y/n): ", default=True):
+                    # Stop the whole run, not just this round robin
+                    if futures_service is not None:
+                        futures_service.close()
+                    return None
+
         # Update current week for next round robin
-        num_teams = len(teams)
-        weeks_per_round_robin = num_teams - 1 if num_teams % 2 == 0 else num_teams
         current_week += weeks_per_round_robin
-    
-    repetition_label = "Round Robin" if ROUND_ROBIN_REPETITIONS == 1 else f"{ROUND_ROBIN_REPETITIONS}x Round Robin"
+
+    if futures_service is not None:
+        futures_service.close()
+
+    repetition_label = "Round Robin" if repetitions == 1 else f"{repetitions}x Round Robin"
     print(f"\nFinal Standings after {repetition_label}:")
-    game_logic.display_standings(teams)
-    
+    league_standings.display()
+
+    print(f"\nScoring after {repetition_label}:")
+    for team, detail in zip(teams, season_log.scoring_details(len(teams))):
+        print(f"{team.name}: {detail}")
+
     print("\nTournament:")
-    
-    # Sort teams by wins, then by point difference
-    sorted_teams = sorted(teams, key=lambda t: (t.wins, t.points_for - t.points_against), reverse=True)
-    
-    # Generate and post bracket before quarterfinals (showing all 8 teams)
-    print("\nGenerating tournament bracket (before quarterfinals)...")
-    bracket_qf_filename = "tournament_bracket_quarterfinals.png"
-    image_generator.generate_tournament_bracket(teams, bracket_qf_filename, round_stage='quarterfinals')
-    
-    print(f"\n{'='*60}")
-    print("Posting Tournament Bracket - Quarterfinals")
-    print(f"{'='*60}")
-    instagram_poster.post_to_instagram([bracket_qf_filename], "")
-    
-    # QUARTERFINALS - Generate and post
-    print("\nQuarterfinals:")
-    quarterfinal_winners = []
-    quarterfinal_images = []
-    
-    for game_num, game in enumerate([
-        (sorted_teams[0], sorted_teams[7]),
-        (sorted_teams[1], sorted_teams[6]),
-        (sorted_teams[2], sorted_teams[5]),
-        (sorted_teams[3], sorted_teams[4])
-    ], 1):
-        result, upset, game_result = game_logic.play_game(*game)
-        print(result)
-        
-        if upset:
-            print(f"Upset: {game[1].name} (adv: {game[1].overall_advantage}) upset {game[0].name} (adv: {game[0].overall_advantage})")
-        
-        # Generate scoreboard image
-        filename = f"tournament_quarterfinal_game_{game_num}.png"
-        image_generator.generate_game_image(game_result, filename, game_type="quarterfinal", game_number=game_num)
-        quarterfinal_images.append(filename)
-        
-        # Generate Gemini artistic photo if enabled
-        if use_gemini and GEMINI_AVAILABLE:
-            gemini_filename = f"tournament_quarterfinal_game_{game_num}_gemini.png"
-            success = gemini_image_generator.generate_game_image_with_gemini(
-                game_result, gemini_filename, game_type="quarterfinal", game_number=game_num, is_champion=False
-            )
-            if success:
-                quarterfinal_images.append(gemini_filename)
-            else:
-                print(f"Warning: Gemini artistic photo generation failed for {gemini_filename}")
-        
-        # Track winner
-        winner = game_result['team1'] if game_result['team1_score'] > game_result['team2_score'] else game_result['team2']
-        quarterfinal_winners.append(winner)
-    
-    # Post quarterfinals to Instagram
-    print(f"\n{'='*60}")
-    print("Posting Quarterfinals to Instagram...")
-    print(f"{'='*60}")
-    caption = "Tournament Quarterfinals"
-    success = instagram_poster.post_to_instagram(quarterfinal_images, caption)
-    if not success:
-        print("Warning: Failed to post quarterfinals images")
-    
-    # Generate and post bracket before semifinals (showing QF winners)
-    print("\nGenerating tournament bracket (before semifinals)...")
-    bracket_sf_filename = "tournament_bracket_semifinals.png"
-    image_generator.generate_tournament_bracket(teams, bracket_sf_filename, round_stage='semifinals', quarterfinal_winners=quarterfinal_winners)
-    
-    print(f"\n{'='*60}")
-    print("Posting Tournament Bracket - Semifinals")
-    print(f"{'='*60}")
-    instagram_poster.post_to_instagram([bracket_sf_filename], "")
-    
-    # SEMIFINALS - Generate and post
-    print("\nSemifinals:")
-    semifinal_winners = []
-    semifinal_images = []
-    
-    for game_num, game in enumerate([
-        (quarterfinal_winners[0], quarterfinal_winners[1]),  # QF1 winner vs QF2 winner
-        (quarterfinal_winners[2], quarterfinal_winners[3])   # QF3 winner vs QF4 winner
-    ], 1):
-        result, upset, game_result = game_logic.play_game(*game)
+
+    # Seed the playoff field from the standings; bracket.play_bracket plays it and
+    # the hooks below render and post each round
+    seeded_teams = league_standings.ranked_teams()
+    seeds = {team.name: seed for seed, team in enumerate(seeded_teams, 1)}
+    round_images = []
+    final_series = [0, 0]  # Wins in the last match played
+
+    def start_round(round_index, rounds):
+        label = playoff.round_label(round_index)
+        wins_needed = playoff.series[round_index]
+        stage = playoff.stage_names()[round_index]
+
+        # Generate and post the bracket before this round, with live advancement odds
+        advancement = (bracket_odds.advancement_odds(teams, bracket_format=playoff, round_winners=rounds[1:])
+                       if pipeline.render else None)
+        bracket_images = pipeline.bracket(playoff, rounds, f"{file_prefix}tournament_bracket_{stage}.png",
+                                          round_index, seeds, advancement)
+        pipeline.publish(f"Posting Tournament Bracket - {label}", bracket_images, bracket_caption(advancement))
+
+        if wins_needed == 1:
+            print(f"\n{label}:")
+        else:
+            print(f"\n{label} (Best {wins_needed} out of {2 * wins_needed - 1}):")
+        del round_images[:]
+
+    def record_game(round_index, game_num, team1, team2, wins, play_result):
+        result, upset, game_result = play_result
+        label = playoff.round_label(round_index)
+        game_type = playoff.game_type(round_index)
+        final_series[:] = wins
+
+        if playoff.series[round_index] > 1:
+            print(f"\nGame {game_num}:")
         print(result)
-        
         if upset:
-            print(f"Upset: {game[1].name} (adv: {game[1].overall_advantage}) upset {game[0].name} (adv: {game[0].overall_advantage})")
-        
-        # Generate scoreboard image
-        filename = f"tournament_semifinal_game_{game_num}.png"
-        image_generator.generate_game_image(game_result, filename, game_type="semifinal", game_number=game_num)
-        semifinal_images.append(filename)
-        
-        # Generate Gemini artistic photo if enabled
-        if use_gemini and GEMINI_AVAILABLE:
-            gemini_filename = f"tournament_semifinal_game_{game_num}_gemini.png"
-            success = gemini_image_generator.generate_game_image_with_gemini(
-                game_result, gemini_filename, game_type="semifinal", game_number=game_num, is_champion=False
-            )
-            if success:
-                semifinal_images.append(gemini_filename)
-            else:
-                print(f"Warning: Gemini artistic photo generation failed for {gemini_filename}")
-        
-        # Track winner
-        winner = game_result['team1'] if game_result['team1_score'] > game_result['team2_score'] else game_result['team2']
-        semifinal_winners.append(winner)
-    
-    # Generate bracket before finals (showing SF winners)
-    print("\nGenerating tournament bracket (before finals)...")
-    bracket_finals_filename = "tournament_bracket_finals.png"
-    image_generator.generate_tournament_bracket(teams, bracket_finals_filename, round_stage='finals', semifinal_winners=semifinal_winners)
-    # Store bracket image to be posted before finals
-    if 'bracket_finals' not in all_images_by_week:
-        all_images_by_week['bracket_finals'] = []
-    all_images_by_week['bracket_finals'].append(bracket_finals_filename)
-    
-    # Post semifinals to Instagram
-    print(f"\n{'='*60}")
-    print("Posting Semifinals to Instagram...")
-    print(f"{'='*60}")
-    caption = "Tournament Semifinals"
-    success = instagram_poster.post_to_instagram(semifinal_images, caption)
-    if not success:
-        print("Warning: Failed to post semifinals images")
-    
-    # Generate and post bracket before finals (showing SF winners)
-    print("\nGenerating tournament bracket (before finals)...")
-    bracket_finals_filename = "tournament_bracket_finals.png"
-    image_generator.generate_tournament_bracket(teams, bracket_finals_filename, round_stage='finals', semifinal_winners=semifinal_winners)
-    
-    print(f"\n{'='*60}")
-    print("Posting Tournament Bracket - Finals")
-    print(f"{'='*60}")
-    instagram_poster.post_to_instagram([bracket_finals_filename], "")
-    
-    # FINALS - Best 2 out of 3, generate and post after each game
-    print("\nFinal (Best 2 out of 3):")
-    team1, team2 = semifinal_winners[0], semifinal_winners[1]
-    
-    team1_wins = 0
-    team2_wins = 0
-    game_num = 1
-    last_game_result = None  # Store last game result for trophy image
-    
-    while team1_wins < 2 and team2_wins < 2:
-        print(f"\nGame {game_num}:")
-        result, upset, game_result = game_logic.play_game(team1, team2)
-        print(result)
-        last_game_result = game_result  # Keep track of last game result
-        
-        # Determine winner of this game
-        if game_result['team1_score'] > game_result['team2_score']:
-            team1_wins += 1
-            winner = team1
+            winner, loser = (team1, team2) if game_result['team1_score'] > game_result['team2_score'] else (team2, team1)
+            print(f"Upset: {winner.name} (adv: {winner.overall_advantage}) upset {loser.name} (adv: {loser.overall_advantage})")
+
+        game_images = pipeline.game_images(
+            game_result, f"{file_prefix}tournament_{game_type}_game_{game_num}.png",
+            game_type=game_type, game_number=game_num)
+
+        if playoff.series[round_index] == 1:
+            round_images.extend(game_images)
         else:
-            team2_wins += 1
-            winner = team2
-        
-        if upset:
-            print(f"Upset: {winner.name} (adv: {winner.overall_advantage}) upset {team2.name if winner == team1 else team1.name} (adv: {(team2 if winner == team1 else team1).overall_advantage})")
-        
-        print(f"Series: {team1.name} {team1_wins} - {team2_wins} {team2.name}")
-        
-        # Generate scoreboard image
-        filename = f"tournament_final_game_{game_num}.png"
-        image_generator.generate_game_image(game_result, filename, game_type="final", game_number=game_num)
-        final_game_images = [filename]
-        
-        # Generate Gemini artistic photo if enabled
-        if use_gemini and GEMINI_AVAILABLE:
-            gemini_filename = f"tournament_final_game_{game_num}_gemini.png"
-            success = gemini_image_generator.generate_game_image_with_gemini(
-                game_result, gemini_filename, game_type="final", game_number=game_num, is_champion=False
-            )
-            if success:
-                final_game_images.append(gemini_filename)
-            else:
-                print(f"Warning: Gemini artistic photo generation failed for {gemini_filename}")
-        
-        # Post this final game to Instagram immediately
-        print(f"\n{'='*60}")
-        print(f"Posting Final Game {game_num} to Instagram...")
-        print(f"{'='*60}")
-        caption = f"Tournament Final - Game {game_num}\nSeries: {team1.name} {team1_wins} - {team2_wins} {team2.name}"
-        success = instagram_poster.post_to_instagram(final_game_images, caption)
-        if not success:
-            print(f"Warning: Failed to post final game {game_num} images")
-        
-        game_num += 1
-    
-    # Determine tournament champion
-    if team1_wins == 2:
-        champion = team1
-    else:
-        champion = team2
-    
+            # Series games are posted one at a time
+            series_text = f"Series: {team1.name} {wins[0]} - {wins[1]} {team2.name}"
+            print(series_text)
+            caption = f"Tournament {label} - Game {game_num}\n{series_text}"
+            if not pipeline.publish(f"Posting {label} Game {game_num} to Instagram...", game_images, caption):
+                print(f"Warning: Failed to post {label.lower()} game {game_num} images")
+
+    def end_round(round_index, rounds):
+        # Post single-game rounds as one gallery
+        label = playoff.round_label(round_index)
+        if round_images and not pipeline.publish(f"Posting {label} to Instagram...", round_images, f"Tournament {label}"):
+            print(f"Warning: Failed to post {label.lower()} images")
+
+    outcome = bracket.play_bracket(seeded_teams, playoff, simulation_seed, season, seeded=True,
+                                   on_round_start=start_round, on_game=record_game, on_round_end=end_round)
+
+    # The final is the last match played
+    champion = outcome['champion']
+    last_game_result = outcome['games'][-1][2]  # Last game result for the trophy image
+    team1, team2 = last_game_result['team1'], last_game_result['team2']
+    team1_wins, team2_wins = final_series
+
     print(f"\n{'='*60}")
     print(f"🏆 TOURNAMENT CHAMPION: {champion.name} 🏆")
     print(f"Final Series: {team1.name} {team1_wins} - {team2_wins} {team2.name}")
     print(f"{'='*60}")
-    
+
     # Generate and post champion trophy image
-    if use_gemini and GEMINI_AVAILABLE and last_game_result:
+    if pipeline.use_gemini and last_game_result:
         # Use the last game result as the base for trophy
-        trophy_filename = "tournament_champion_trophy.png"
+        trophy_filename = f"{file_prefix}tournament_champion_trophy.png"
         trophy_game_result = {
             'team1': team1,
             'team2': team2,
@@ -404,31 +418,99 @@ def main():
             'team1_detail': last_game_result['team1_detail'],
             'team2_detail': last_game_result['team2_detail'],
             'upset': last_game_result.get('upset', False),
+            'seed': last_game_result.get('seed'),
             'is_champion': True
         }
-        
+
         print(f"\n{'='*60}")
         print("Generating Champion Trophy Image...")
         print(f"{'='*60}")
-        
-        success = gemini_image_generator.generate_game_image_with_gemini(
+
+        success = pipeline.gemini_image_generator.generate_game_image_with_gemini(
             trophy_game_result, trophy_filename, game_type="final", game_number=None, is_champion=True
         )
-        
+
         if success:
-            print(f"\n{'='*60}")
-            print("Posting Champion Trophy to Instagram...")
-            print(f"{'='*60}")
             caption = f"🏆 TOURNAMENT CHAMPION: {champion.name} 🏆\nFinal Series: {team1.name} {team1_wins} - {team2_wins} {team2.name}"
-            instagram_poster.post_to_instagram([trophy_filename], caption)
+            pipeline.publish("Posting Champion Trophy to Instagram...", [trophy_filename], caption)
         else:
             print("Warning: Champion trophy image generation failed")
-    
+
     print("\nFinal Team Stats:")
     for team in teams:
         print(f"{team}")
 
+    return teams, champion
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    interactive = not args.batch
+
+    print("="*60)
+    print("CASCADE GAME SIMULATION")
+    print("="*60)
+
+    # Get the number of round robins from the command line, a prompt or config
+    num_round_robins = args.round_robins
+    if num_round_robins is None and not interactive:
+        num_round_robins = getattr(config, 'ROUND_ROBIN_REPETITIONS', 1)
+    while num_round_robins is None:
+        try:
+            num_round_robins = int(input("\nHow many round robins would you like to play before the tournament? "))
+            if num_round_robins <= 0:
+                print("Please enter a positive number.")
+                num_round_robins = None
+        except ValueError:
+            print("Please enter a valid number.")
+
+    # Ask user if they want to use Gemini API for image generation
+    use_gemini = args.use_gemini
+    if use_gemini is None:
+        use_gemini = getattr(config, 'USE_GEMINI', False)
+        if interactive and args.mode != 'sim':
+            print("\n" + "="*60)
+            use_gemini = input("Would you like to use Gemini API for image generation? (y/n): ").lower() == 'y'
+    pipeline = Pipeline(args.mode, use_gemini and args.mode != 'sim', interactive)
+    if pipeline.render:
+        if pipeline.use_gemini:
+            print("Using Gemini API with random prompts for image generation.")
+        else:
+            print("Using default PIL-based image generation.")
+
+    team_names = [
+        "Apex Predators",
+        "Vista Vipers",
+        "Skybound Storm",
+        "Raven's Renegades",
+        "Cove Crushers",
+        "Ember Enforcers",
+        "Pinnacle Pioneers",
+        "Evan City Vanguards"
+    ]
+
+    # Every game gets its own random stream spawned from one root seed
+    simulation_seed = args.seed
+    if simulation_seed is None:
+        simulation_seed = getattr(config, 'SIMULATION_SEED', None)
+    if simulation_seed is None:
+        simulation_seed = game_logic.new_root_seed()
+    print(f"\nSimulation seed: {simulation_seed} (set SIMULATION_SEED in config.py to replay this run)")
+
+    if not pipeline.check_credentials():
+        return
+
+    for season in range(args.seasons):
+        if args.seasons > 1:
+            print(f"\n{'='*60}")
+            print(f"SEASON {season + 1} of {args.seasons}")
+            print(f"{'='*60}")
+        # Single-season runs keep the original image file names
+        file_prefix = f"season_{season + 1}_" if args.seasons > 1 else ""
+        if play_season(pipeline, team_names, num_round_robins, simulation_seed, season, file_prefix) is None:
+            print("\nRun stopped.")
+            return
+
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,137 @@
+"""Exact game outcome distributions computed by convolution instead of sampling"""
+import math
+from functools import lru_cache
+
+import numpy as np
+
+import game_logic
+
+MAX_POINTS_PER_OPPORTUNITY = 6  # cascade run
+
+
+def opportunity_points_pmf(weights, cascade_chance=game_logic.DEFAULT_PARAMS.cascade_chance):
+    """
+    Distribution of points from one scoring opportunity for a team with the
+    given (run, throw, kick) weights; index = points scored.
+    """
+    run, throw, kick = np.asarray(weights, dtype=float) / sum(weights)
+    pmf = np.zeros(MAX_POINTS_PER_OPPORTUNITY + 1)
+    for points, probability in ((3, run), (2, throw), (1, kick)):
+        pmf[points] += probability * (1 - cascade_chance)
+        pmf[points * 2] += probability * cascade_chance
+    return pmf
+
+
+def _convolution_powers(pmf, max_power):
+    """[pmf^*0, pmf^*1, ..., pmf^*max_power] padded to a common length"""
+    length = (len(pmf) - 1) * max_power + 1
+    powers = np.zeros((max_power + 1, length))
+    current = np.array([1.0])
+    for k in range(max_power + 1):
+        powers[k, :len(current)] = current
+        current = np.convolve(current, pmf)
+    return powers
+
+
+def points_distributions(weights, params=None):
+    """
+    Distributions of a team's points from 0, 1, ..., scoring_opportunities
+    scoring opportunities, for the given (run, throw, kick) weights.
+
+    Returns:
+        Array [scoring_opportunities + 1, S]; row k is P(k opportunities score s points)
+    """
+    params = params or game_logic.DEFAULT_PARAMS
+    return _convolution_powers(opportunity_points_pmf(weights, params.cascade_chance), params.scoring_opportunities)
+
+
+@lru_cache(maxsize=4096)
+def _game_distribution(team1_chance, team1_weights, team2_weights, params=game_logic.DEFAULT_PARAMS):
+    """Cached core of exact_game_distribution keyed on the model inputs"""
+    n = params.scoring_opportunities
+    team1_pmf = opportunity_points_pmf(team1_weights, params.cascade_chance)
+    team2_pmf = opportunity_points_pmf(team2_weights, params.cascade_chance)
+    team1_powers = points_distributions(team1_weights, params)
+    team2_powers = points_distributions(team2_weights, params)
+
+    # P(team1 gets k of the 20 opportunities)
+    k = np.arange(n + 1)
+    opportunity_pmf = (np.array([math.comb(n, i) for i in k], dtype=float) *
+                       team1_chance ** k * (1 - team1_chance) ** (n - k))
+
+    # Given k, the two teams' scores are independent sums of k and n-k opportunities
+    regulation = np.einsum('k,ki,kj->ij', opportunity_pmf, team1_powers, team2_powers[::-1])
+
+    # A tie always ends after exactly one tie-breaker opportunity, since every score is >= 1 point
+    tie = np.diag(regulation).copy()
+    tie_prob = tie.sum()
+    size = regulation.shape[0] + MAX_POINTS_PER_OPPORTUNITY
+    final = np.zeros((size, size))
+    final[:regulation.shape[0], :regulation.shape[1]] = regulation
+    diagonal = np.arange(len(tie))
+    final[diagonal, diagonal] = 0.0
+    for points in range(1, MAX_POINTS_PER_OPPORTUNITY + 1):
+        final[diagonal + points, diagonal] += tie * team1_chance * team1_pmf[points]
+        final[diagonal, diagonal + points] += tie * (1 - team1_chance) * team2_pmf[points]
+
+    team1_win_prob = np.tril(regulation, -1).sum() + tie_prob * team1_chance
+
+    # Expected opportunities include the tie-breaker one
+    expected_opportunities = n + tie_prob
+    team1_share = np.asarray(team1_weights, dtype=float) / sum(team1_weights)
+    team2_share = np.asarray(team2_weights, dtype=float) / sum(team2_weights)
+    team1_expected_counts = expected_opportunities * team1_chance * team1_share
+    team2_expected_counts = expected_opportunities * (1 - team1_chance) * team2_share
+    scores = np.arange(size)
+
+    result = {
+        'score_pmf': final,
+        'regulation_pmf': regulation,
+        'regulation_tie_prob': float(tie_prob),
+        'team1_win_prob': float(team1_win_prob),
+        'team2_win_prob': float(1 - team1_win_prob),
+        'team1_expected_score': float(final.sum(axis=1) @ scores),
+        'team2_expected_score': float(final.sum(axis=0) @ scores),
+        'team1_expected_counts': team1_expected_counts,
+        'team1_expected_cascades': team1_expected_counts * params.cascade_chance,
+        'team2_expected_counts': team2_expected_counts,
+        'team2_expected_cascades': team2_expected_counts * params.cascade_chance
+    }
+    # Results are shared through the cache, so hand out read-only arrays
+    for value in result.values():
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+    return result
+
+
+def team_scoring_weights(team):
+    """(run, throw, kick) weights used by play_game for a team"""
+    return (max(1, 3 + team.run_advantage),
+            max(1, 3 + team.throw_advantage),
+            max(1, 3 + team.kick_advantage))
+
+
+def exact_game_distribution(team1, team2, params=None):
+    """
+    Exact outcome distribution of play_game(team1, team2) for the current team
+    states, under params (default: game_logic.DEFAULT_PARAMS).
+
+    Returns:
+        Dictionary with:
+            score_pmf: [S, S] array, P(final team1 score = i, team2 score = j) after tie-breaks
+            regulation_pmf: Same for the 20 regulation opportunities only
+            regulation_tie_prob: Probability of a tie after regulation
+            team1_win_prob / team2_win_prob: Exact win probabilities, tie-breaker included
+            team1_expected_score / team2_expected_score
+            team1_expected_counts / team2_expected_counts: Expected (runs, throws, kicks)
+            team1_expected_cascades / team2_expected_cascades: Expected cascade (runs, throws, kicks)
+        Arrays are read-only because results are cached.
+    """
+    params = params or game_logic.DEFAULT_PARAMS
+    return _game_distribution(game_logic.calculate_win_probability(team1, team2, params),
+                              team_scoring_weights(team1), team_scoring_weights(team2), params)
+
+
+def exact_win_probability(team1, team2, params=None):
+    """Exact probability that team1 wins play_game(team1, team2), including the tie-breaker"""
+    return exact_game_distribution(team1, team2, params)['team1_win_prob']
@@ -0,0 +1,105 @@
+"""Font registry: each (family, weight, size) resolved and loaded once per process"""
+import os
+import sys
+from functools import lru_cache
+
+from PIL import ImageFont
+
+import config
+
+DEFAULT_FONT_FAMILY = 'arial'
+
+# File names tried for each family and weight, in order. Liberation Sans has
+# Arial's metrics, so text laid out for Arial fits the same on Linux hosts.
+FONT_FILES = {
+    ('arial', 'regular'): ['arial.ttf', 'Arial.ttf', 'LiberationSans-Regular.ttf', 'DejaVuSans.ttf'],
+    ('arial', 'bold'): ['arialbd.ttf', 'Arial Bold.ttf', 'LiberationSans-Bold.ttf', 'DejaVuSans-Bold.ttf'],
+}
+
+
+def font_search_directories():
+    """
+    Directories searched for font files: config.FONT_DIRECTORIES first, then
+    the platform font directories (on Linux the fontconfig defaults: the
+    user's font directories and fonts/ under each XDG data directory).
+    """
+    directories = list(getattr(config, 'FONT_DIRECTORIES', []))
+    if sys.platform == 'win32':
+        directories.append(os.path.join(os.environ.get('WINDIR', 'C:/Windows'), 'Fonts'))
+        local_appdata = os.environ.get('LOCALAPPDATA')
+        if local_appdata:
+            directories.append(os.path.join(local_appdata, 'Microsoft', 'Windows', 'Fonts'))
+    elif sys.platform == 'darwin':
+        directories += [os.path.expanduser('~/Library/Fonts'), '/Library/Fonts', '/System/Library/Fonts',
+                        '/System/Library/Fonts/Supplemental']
+    else:
+        data_home = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+        data_dirs = os.environ.get('XDG_DATA_DIRS') or '/usr/local/share:/usr/share'
+        directories += [os.path.expanduser('~/.fonts'), os.path.join(data_home, 'fonts')]
+        directories += [os.path.join(data_dir, 'fonts') for data_dir in data_dirs.split(':') if data_dir]
+    return directories
+
+
+@lru_cache(maxsize=1)
+def _font_index():
+    """Lower-case file name -> path of every font under the search directories (first found wins)"""
+    index = {}
+    for directory in font_search_directories():
+        if not os.path.isdir(directory):
+            continue
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.lower().endswith(('.ttf', '.otf', '.ttc')):
+                    index.setdefault(name.lower(), os.path.join(root, name))
+    return index
+
+
+@lru_cache(maxsize=None)
+def resolve_font_file(family=DEFAULT_FONT_FAMILY, weight='regular'):
+    """
+    Path of the font file for a family and weight, or None (also cached).
+
+    config.FONT_FILES can map (family, weight) or family to a file path or
+    a list of file names/paths tried before the built-in candidates. A
+    missing weight falls back to the family's regular weight.
+    """
+    configured = getattr(config, 'FONT_FILES', {})
+    candidates = configured.get((family, weight)) or configured.get(family) or []
+    if isinstance(candidates, str):
+        candidates = [candidates]
+    candidates = list(candidates) + FONT_FILES.get((family, weight), [f"{family}.ttf"])
+
+    for candidate in candidates:
+        # Paths (and names in the working directory, as truetype() would open them)
+        if os.path.isfile(candidate):
+            return candidate
+    index = _font_index()
+    for candidate in candidates:
+        path = index.get(os.path.basename(candidate).lower())
+        if path:
+            return path
+    if weight != 'regular':
+        return resolve_font_file(family, 'regular')
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_font(size, family=DEFAULT_FONT_FAMILY, weight='regular'):
+    """
+    Font at the given size, falling back to PIL's default font. Loaded once
+    per (size, family, weight); fonts are shared, so do not modify them.
+    """
+    path = resolve_font_file(family, weight)
+    if path is not None:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            pass
+    return ImageFont.load_default()
+
+
+def clear():
+    """Forget resolved files and loaded fonts, e.g. after installing fonts or changing config"""
+    get_font.cache_clear()
+    resolve_font_file.cache_clear()
+    _font_index.cache_clear()
@@ -1,7 +1,108 @@
 """Core game logic for Cascade game simulation"""
 import random
+from array import array
+from functools import lru_cache
 from itertools import combinations
 
+# Per-team state carried through a season, in the column order used by array-backed engines
+TEAM_STATE_FIELDS = ('overall_advantage', 'run_advantage', 'throw_advantage', 'kick_advantage',
+                     'wins', 'losses', 'points_for', 'points_against')
+
+# Best stat names in tie-break order (Team.best_stat picks the first maximum)
+STAT_NAMES = ("Run", "Throw", "Kick")
+
+# Maximum number of distinct matchup states kept in the win probability cache
+WIN_PROBABILITY_CACHE_SIZE = 65536
+
+# Second element of game_seed paths, separating the independent random streams of a season
+REGULAR_SEASON_STREAM = 0
+TOURNAMENT_STREAM = 1
+FUTURES_STREAM = 2
+PROMPT_STREAM = 3
+
+# Play-by-play event encoding: one byte per scoring opportunity
+#   bit 0     scoring side (0 = team1, 1 = team2)
+#   bits 1-2  score type index into SCORE_TYPES
+#   bit 3     cascade zone
+SCORE_TYPES = ('run', 'throw', 'kick')
+SCORE_TYPE_POINTS = (3, 2, 1)
+EVENT_TEAM2 = 1
+EVENT_TYPE_SHIFT = 1
+EVENT_CASCADE = 8
+
+
+class ModelParams:
+    """
+    Tunable constants of the game model.
+
+    DEFAULT_PARAMS holds the values the league is played with; other sets can
+    be passed to play_game, calculate_win_probability, the batch kernels,
+    exact_odds and multi_league_runner.LeagueSpec. Instances are treated as
+    immutable (use replace() for variations) and hash by value, so they can
+    be part of cache keys.
+
+    Args:
+        scoring_opportunities: Scoring opportunities per game before tie-breakers
+        cascade_chance: Chance a score lands in the cascade zone (double points)
+        advantage_weight: Win probability per point of overall advantage difference
+        point_diff_weight: Maximum win probability adjustment from point differential
+        point_diff_floor: Minimum points per team the point differential is normalized by
+        matchup_bonus: Rock-paper-scissors best-stat bonus
+        min_win_probability, max_win_probability: Clamp on the win probability
+        advantage_cap: Advantages are kept within +/- advantage_cap
+    """
+
+    FIELDS = ('scoring_opportunities', 'cascade_chance', 'advantage_weight', 'point_diff_weight',
+              'point_diff_floor', 'matchup_bonus', 'min_win_probability', 'max_win_probability',
+              'advantage_cap')
+
+    def __init__(self, scoring_opportunities=20, cascade_chance=1/15, advantage_weight=0.02,
+                 point_diff_weight=0.05, point_diff_floor=40, matchup_bonus=0.04,
+                 min_win_probability=0.25, max_win_probability=0.75, advantage_cap=3):
+        self.scoring_opportunities = scoring_opportunities
+        self.cascade_chance = cascade_chance
+        self.advantage_weight = advantage_weight
+        self.point_diff_weight = point_diff_weight
+        self.point_diff_floor = point_diff_floor
+        self.matchup_bonus = matchup_bonus
+        self.min_win_probability = min_win_probability
+        self.max_win_probability = max_win_probability
+        self.advantage_cap = advantage_cap
+        # Bonus for team1 (rock-paper-scissors: run > kick > throw > run),
+        # indexed by [team1 best stat index][team2 best stat index]
+        bonus = matchup_bonus
+        self.stat_matchup_bonus = ((0.0, -bonus, bonus), (bonus, 0.0, -bonus), (-bonus, bonus, 0.0))
+        self._key = tuple(getattr(self, field) for field in self.FIELDS)
+        self._hash = hash(self._key)
+
+    def __eq__(self, other):
+        return isinstance(other, ModelParams) and self._key == other._key
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return "ModelParams(" + ", ".join(f"{field}={value!r}" for field, value in zip(self.FIELDS, self._key)) + ")"
+
+    def __reduce__(self):
+        return (ModelParams, self._key)
+
+    def as_dict(self):
+        """Field values by name"""
+        return dict(zip(self.FIELDS, self._key))
+
+    def replace(self, **changes):
+        """Copy with some fields changed"""
+        values = self.as_dict()
+        for field in changes:
+            if field not in values:
+                raise TypeError(f"Unknown model parameter: {field}")
+        values.update(changes)
+        return ModelParams(**values)
+
+
+DEFAULT_PARAMS = ModelParams()
+
 
 class Team:
     def __init__(self, name):
@@ -21,8 +122,7 @@ class Team:
                 f"Kick: {self.kick_advantage}, W-L: {self.wins}-{self.losses})")
 
     def best_stat(self):
-        stats = [("Run", self.run_advantage), ("Throw", self.throw_advantage), ("Kick", self.kick_advantage)]
-        return max(stats, key=lambda x: x[1])[0]
+        return STAT_NAMES[best_stat_index(self)]
     
     def get_logo_filename(self):
         """Convert team name to logo filename format"""
@@ -46,192 +146,213 @@ class ScoringDetail:
                 f"Kicks: {self.kicks} (Cascade: {self.cascade_kicks})")
 
 
-def calculate_win_probability(team1, team2):
+def best_stat_index(team):
+    """Index into STAT_NAMES of the team's best stat (first maximum wins ties)"""
+    run, throw, kick = team.run_advantage, team.throw_advantage, team.kick_advantage
+    if run >= throw and run >= kick:
+        return 0
+    if throw >= kick:
+        return 1
+    return 2
+
+
+def win_probability_key(team1, team2):
     """
-    Calculate the probability that team1 wins against team2.
-    Factors in: advantage differences, point differential, and stat matchup bonuses.
-    
-    Returns: float between 0.25 and 0.75 (allowing meaningful upsets)
+    Compact key holding everything calculate_win_probability depends on:
+    (overall advantage difference, team1 best stat, team2 best stat,
+     point differential difference, combined total points).
+    The point differential terms are 0 until both teams have scored or conceded.
     """
+    team1_total = team1.points_for + team1.points_against
+    team2_total = team2.points_for + team2.points_against
+    if team1_total > 0 and team2_total > 0:
+        pd_diff = (team1.points_for - team1.points_against) - (team2.points_for - team2.points_against)
+        total_points = team1_total + team2_total
+    else:
+        pd_diff = 0
+        total_points = 0
+    return (team1.overall_advantage - team2.overall_advantage,
+            best_stat_index(team1), best_stat_index(team2),
+            pd_diff, total_points)
+
+
+@lru_cache(maxsize=WIN_PROBABILITY_CACHE_SIZE)
+def win_probability_from_key(key, params=DEFAULT_PARAMS):
+    """Memoized win probability for a win_probability_key (cached per key and params)"""
+    advantage_diff, team1_best, team2_best, pd_diff, total_points = key
     base_chance = 0.5
     
     # 1. Base probability from advantage difference (reduced impact)
-    advantage_diff = team1.overall_advantage - team2.overall_advantage
-    team1_win_prob = base_chance + advantage_diff * 0.02  # Reduced from 0.05
+    team1_win_prob = base_chance + advantage_diff * params.advantage_weight
     
     # 2. Add point differential adjustment
-    if team1.points_for + team1.points_against > 0 and team2.points_for + team2.points_against > 0:
-        team1_pd = team1.points_for - team1.points_against
-        team2_pd = team2.points_for - team2.points_against
-        
+    if total_points > 0:
         # Normalize point differential by total points to get a relative strength measure
         # Typical game scores around 20-40 points, so scale appropriately
-        team1_total = team1.points_for + team1.points_against
-        team2_total = team2.points_for + team2.points_against
-        avg_total_per_team = (team1_total + team2_total) / 2.0
+        avg_total_per_team = total_points / 2.0
         
-        if avg_total_per_team > 0:
-            # Normalize PD difference by average total points (gives per-game strength)
-            pd_diff_normalized = (team1_pd - team2_pd) / max(40, avg_total_per_team)
-            pd_adjustment = pd_diff_normalized * 0.05  # Max ±5% adjustment
-            team1_win_prob += pd_adjustment
+        # Normalize PD difference by average total points (gives per-game strength)
+        pd_diff_normalized = pd_diff / max(params.point_diff_floor, avg_total_per_team)
+        pd_adjustment = pd_diff_normalized * params.point_diff_weight  # Max ±5% adjustment by default
+        team1_win_prob += pd_adjustment
     
     # 3. Add stat matchup bonus (rock-paper-scissors: run > kick > throw > run)
-    team1_best = team1.best_stat()
-    team2_best = team2.best_stat()
-    
-    # Determine if team1 has a favorable matchup
-    stat_matchup_bonus = 0.0
-    if team1_best == "Run" and team2_best == "Kick":
-        stat_matchup_bonus = 0.04  # Run beats kick
-    elif team1_best == "Kick" and team2_best == "Throw":
-        stat_matchup_bonus = 0.04  # Kick beats throw
-    elif team1_best == "Throw" and team2_best == "Run":
-        stat_matchup_bonus = 0.04  # Throw beats run
-    elif team2_best == "Run" and team1_best == "Kick":
-        stat_matchup_bonus = -0.04  # Team2's run beats team1's kick
-    elif team2_best == "Kick" and team1_best == "Throw":
-        stat_matchup_bonus = -0.04  # Team2's kick beats team1's throw
-    elif team2_best == "Throw" and team1_best == "Run":
-        stat_matchup_bonus = -0.04  # Team2's throw beats team1's run
-    
-    team1_win_prob += stat_matchup_bonus
-    
-    # Cap between 25% and 75% to ensure meaningful upsets can occur
-    team1_win_prob = max(0.25, min(0.75, team1_win_prob))
+    team1_win_prob += params.stat_matchup_bonus[team1_best][team2_best]
+    
+    # Cap (25% to 75% by default) to ensure meaningful upsets can occur
+    team1_win_prob = max(params.min_win_probability, min(params.max_win_probability, team1_win_prob))
     
     return team1_win_prob
 
 
-def play_game(team1, team2):
+def calculate_win_probability(team1, team2, params=None):
+    """
+    Calculate the probability that team1 wins against team2.
+    Factors in: advantage differences, point differential, and stat matchup bonuses.
+    
+    Results are memoized on win_probability_key(team1, team2) and params
+    (default: DEFAULT_PARAMS).
+    
+    Returns: float between 0.25 and 0.75 (allowing meaningful upsets)
+    """
+    return win_probability_from_key(win_probability_key(team1, team2), params or DEFAULT_PARAMS)
+
+
+def win_probability_matrix(teams, params=None):
+    """
+    Win probabilities for every pair of teams.
+    
+    Returns a list of rows where matrix[i][j] is the probability teams[i] beats teams[j].
+    """
+    params = params or DEFAULT_PARAMS
+    states = [(team.overall_advantage, best_stat_index(team),
+               team.points_for - team.points_against, team.points_for + team.points_against)
+              for team in teams]
+    matrix = []
+    for overall1, best1, pd1, total1 in states:
+        row = []
+        for overall2, best2, pd2, total2 in states:
+            if total1 > 0 and total2 > 0:
+                key = (overall1 - overall2, best1, best2, pd1 - pd2, total1 + total2)
+            else:
+                key = (overall1 - overall2, best1, best2, 0, 0)
+            row.append(win_probability_from_key(key, params))
+        matrix.append(row)
+    return matrix
+
+
+def win_probability_cache_info():
+    """Hit/miss statistics for the win probability cache"""
+    info = win_probability_from_key.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'hit_rate': info.hits / lookups if lookups else 0.0,
+        'size': info.currsize,
+        'maxsize': info.maxsize
+    }
+
+
+def game_seed(root_seed, *path):
+    """
+    Seed for one independent random stream, spawned from root_seed along an
+    integer path such as (season, REGULAR_SEASON_STREAM, week, game).
+    
+    Streams come from numpy.random.SeedSequence, so every game gets the same
+    seed no matter which process or in which order it is simulated.
+    """
+    import numpy as np
+    return int(np.random.SeedSequence(root_seed, spawn_key=path).generate_state(1, np.uint64)[0])
+
+
+def new_root_seed():
+    """Fresh high-entropy root seed for a simulation run (print or store it to reproduce the run)"""
+    import numpy as np
+    return np.random.SeedSequence().entropy
+
+
+def _score_opportunity(team, detail, rng, events=None, side=0, params=DEFAULT_PARAMS):
+    """
+    Play one scoring opportunity won by team, update its ScoringDetail and return the points.
+    If events is an array, the encoded event is appended to it.
+    """
+    # Ensure weights are always positive (at least 1) to avoid ValueError
+    weights = [
+        max(1, 3 + team.run_advantage),
+        max(1, 3 + team.throw_advantage),
+        max(1, 3 + team.kick_advantage)
+    ]
+    score_type = rng.choices(['run', 'throw', 'kick'], weights=weights)[0]
+    cascade = rng.random() < params.cascade_chance  # Cascade zone chance
+    if score_type == 'run':
+        points = 3
+        detail.runs += 1
+        if cascade:
+            points *= 2
+            detail.cascade_runs += 1
+    elif score_type == 'throw':
+        points = 2
+        detail.throws += 1
+        if cascade:
+            points *= 2
+            detail.cascade_throws += 1
+    else:
+        points = 1
+        detail.kicks += 1
+        if cascade:
+            points *= 2
+            detail.cascade_kicks += 1
+    if events is not None:
+        events.append(side | SCORE_TYPES.index(score_type) << EVENT_TYPE_SHIFT | (EVENT_CASCADE if cascade else 0))
+    return points
+
+
+def play_game(team1, team2, seed=None, record_events=False, params=None):
+    """
+    Play one game and update both teams.
+    
+    Args:
+        team1: Team object
+        team2: Team object
+        seed: Optional seed (see game_seed) for this game's own random stream.
+              Replaying from the same team states with the same seed gives the
+              same game. Without a seed the global random module is used.
+        record_events: If True, game_result['events'] is an array('B') with one
+                       encoded event per scoring opportunity (see replay_events and
+                       GameLog); batch_simulation's vectorized games record none
+        params: ModelParams to play with (default: DEFAULT_PARAMS)
+    
+    Returns:
+        Tuple of (result_text, upset, game_result); game_result['seed'] holds the seed
+    """
+    rng = random.Random(seed) if seed is not None else random
+    params = params or DEFAULT_PARAMS
+    cap = params.advantage_cap
+    
     # Use the comprehensive win probability calculation
-    team1_chance = calculate_win_probability(team1, team2)
+    team1_chance = calculate_win_probability(team1, team2, params)
 
     team1_score = 0
     team2_score = 0
     team1_detail = ScoringDetail()
     team2_detail = ScoringDetail()
+    events = array('B') if record_events else None
 
-    for _ in range(20):  # 20 "scoring opportunities"
-        if random.random() < team1_chance:
-            # Ensure weights are always positive (at least 1) to avoid ValueError
-            team1_weights = [
-                max(1, 3 + team1.run_advantage),
-                max(1, 3 + team1.throw_advantage),
-                max(1, 3 + team1.kick_advantage)
-            ]
-            score_type = random.choices(['run', 'throw', 'kick'], 
-                                        weights=team1_weights)[0]
-            cascade = random.random() < 1/15  # Cascade zone chance
-            if score_type == 'run':
-                points = 3
-                team1_detail.runs += 1
-                if cascade:
-                    points *= 2
-                    team1_detail.cascade_runs += 1
-            elif score_type == 'throw':
-                points = 2
-                team1_detail.throws += 1
-                if cascade:
-                    points *= 2
-                    team1_detail.cascade_throws += 1
-            else:
-                points = 1
-                team1_detail.kicks += 1
-                if cascade:
-                    points *= 2
-                    team1_detail.cascade_kicks += 1
-            team1_score += points
+    for _ in range(params.scoring_opportunities):  # 20 "scoring opportunities" by default
+        if rng.random() < team1_chance:
+            team1_score += _score_opportunity(team1, team1_detail, rng, events, 0, params)
         else:
-            # Ensure weights are always positive (at least 1) to avoid ValueError
-            team2_weights = [
-                max(1, 3 + team2.run_advantage),
-                max(1, 3 + team2.throw_advantage),
-                max(1, 3 + team2.kick_advantage)
-            ]
-            score_type = random.choices(['run', 'throw', 'kick'], 
-                                        weights=team2_weights)[0]
-            cascade = random.random() < 1/15  # Cascade zone chance
-            if score_type == 'run':
-                points = 3
-                team2_detail.runs += 1
-                if cascade:
-                    points *= 2
-                    team2_detail.cascade_runs += 1
-            elif score_type == 'throw':
-                points = 2
-                team2_detail.throws += 1
-                if cascade:
-                    points *= 2
-                    team2_detail.cascade_throws += 1
-            else:
-                points = 1
-                team2_detail.kicks += 1
-                if cascade:
-                    points *= 2
-                    team2_detail.cascade_kicks += 1
-            team2_score += points
+            team2_score += _score_opportunity(team2, team2_detail, rng, events, EVENT_TEAM2, params)
 
     # Handle ties with a tie-breaking scoring opportunity
     while team1_score == team2_score:
-        if random.random() < team1_chance:
+        if rng.random() < team1_chance:
             # Team 1 scores in tie-breaker
-            team1_weights = [
-                max(1, 3 + team1.run_advantage),
-                max(1, 3 + team1.throw_advantage),
-                max(1, 3 + team1.kick_advantage)
-            ]
-            score_type = random.choices(['run', 'throw', 'kick'], 
-                                        weights=team1_weights)[0]
-            cascade = random.random() < 1/15
-            if score_type == 'run':
-                points = 3
-                team1_detail.runs += 1
-                if cascade:
-                    points *= 2
-                    team1_detail.cascade_runs += 1
-            elif score_type == 'throw':
-                points = 2
-                team1_detail.throws += 1
-                if cascade:
-                    points *= 2
-                    team1_detail.cascade_throws += 1
-            else:
-                points = 1
-                team1_detail.kicks += 1
-                if cascade:
-                    points *= 2
-                    team1_detail.cascade_kicks += 1
-            team1_score += points
+            team1_score += _score_opportunity(team1, team1_detail, rng, events, 0, params)
         else:
             # Team 2 scores in tie-breaker
-            team2_weights = [
-                max(1, 3 + team2.run_advantage),
-                max(1, 3 + team2.throw_advantage),
-                max(1, 3 + team2.kick_advantage)
-            ]
-            score_type = random.choices(['run', 'throw', 'kick'], 
-                                        weights=team2_weights)[0]
-            cascade = random.random() < 1/15
-            if score_type == 'run':
-                points = 3
-                team2_detail.runs += 1
-                if cascade:
-                    points *= 2
-                    team2_detail.cascade_runs += 1
-            elif score_type == 'throw':
-                points = 2
-                team2_detail.throws += 1
-                if cascade:
-                    points *= 2
-                    team2_detail.cascade_throws += 1
-            else:
-                points = 1
-                team2_detail.kicks += 1
-                if cascade:
-                    points *= 2
-                    team2_detail.cascade_kicks += 1
-            team2_score += points
+            team2_score += _score_opportunity(team2, team2_detail, rng, events, EVENT_TEAM2, params)
 
     if team1_score > team2_score:
         winner, loser = team1, team2
@@ -251,30 +372,30 @@ def play_game(team1, team2):
     loser.points_against += max(team1_score, team2_score)
 
     # Update advantages
-    winner.overall_advantage = min(3, winner.overall_advantage + 1)
-    loser.overall_advantage = max(-3, loser.overall_advantage - 1)
+    winner.overall_advantage = min(cap, winner.overall_advantage + 1)
+    loser.overall_advantage = max(-cap, loser.overall_advantage - 1)
 
     # Update specific advantages
     if winner_detail.runs > loser_detail.runs:
-        winner.run_advantage = min(3, winner.run_advantage + 1)
-        loser.run_advantage = max(-3, loser.run_advantage - 1)
+        winner.run_advantage = min(cap, winner.run_advantage + 1)
+        loser.run_advantage = max(-cap, loser.run_advantage - 1)
     elif winner_detail.runs < loser_detail.runs:
-        loser.run_advantage = min(3, loser.run_advantage + 1)
-        winner.run_advantage = max(-3, winner.run_advantage - 1)
+        loser.run_advantage = min(cap, loser.run_advantage + 1)
+        winner.run_advantage = max(-cap, winner.run_advantage - 1)
 
     if winner_detail.throws > loser_detail.throws:
-        winner.throw_advantage = min(3, winner.throw_advantage + 1)
-        loser.throw_advantage = max(-3, loser.throw_advantage - 1)
+        winner.throw_advantage = min(cap, winner.throw_advantage + 1)
+        loser.throw_advantage = max(-cap, loser.throw_advantage - 1)
     elif winner_detail.throws < loser_detail.throws:
-        loser.throw_advantage = min(3, loser.throw_advantage + 1)
-        winner.throw_advantage = max(-3, winner.throw_advantage - 1)
+        loser.throw_advantage = min(cap, loser.throw_advantage + 1)
+        winner.throw_advantage = max(-cap, winner.throw_advantage - 1)
 
     if winner_detail.kicks > loser_detail.kicks:
-        winner.kick_advantage = min(3, winner.kick_advantage + 1)
-        loser.kick_advantage = max(-3, loser.kick_advantage - 1)
+        winner.kick_advantage = min(cap, winner.kick_advantage + 1)
+        loser.kick_advantage = max(-cap, loser.kick_advantage - 1)
     elif winner_detail.kicks < loser_detail.kicks:
-        loser.kick_advantage = min(3, loser.kick_advantage + 1)
-        winner.kick_advantage = max(-3, winner.kick_advantage - 1)
+        loser.kick_advantage = min(cap, loser.kick_advantage + 1)
+        winner.kick_advantage = max(-cap, winner.kick_advantage - 1)
     
     game_result = {
         'team1': team1,
@@ -283,7 +404,12 @@ def play_game(team1, team2):
         'team2_score': team2_score,
         'team1_detail': team1_detail,
         'team2_detail': team2_detail,
-        'upset': upset
+        'upset': upset,
+        'seed': seed,
+        'events': events,
+        # Best stats right after this game, so replayed standings show them as of the game
+        'team1_best_stat': best_stat_index(team1),
+        'team2_best_stat': best_stat_index(team2)
     }
     
     result_text = (f"{team1.name} {team1_score} - {team2_score} {team2.name}\n"
@@ -293,28 +419,150 @@ def play_game(team1, team2):
     return result_text, upset, game_result
 
 
+def replay_events(events):
+    """
+    Rebuild a game's scores and scoring details from its event stream.
+    
+    Returns:
+        Tuple of (team1_score, team2_score, team1_detail, team2_detail)
+    """
+    scores = [0, 0]
+    details = [ScoringDetail(), ScoringDetail()]
+    for event in events:
+        side = event & EVENT_TEAM2
+        type_index = (event >> EVENT_TYPE_SHIFT) & 3
+        score_type = SCORE_TYPES[type_index]
+        points = SCORE_TYPE_POINTS[type_index]
+        detail = details[side]
+        # ScoringDetail counters are runs/throws/kicks and cascade_runs/...
+        setattr(detail, score_type + 's', getattr(detail, score_type + 's') + 1)
+        if event & EVENT_CASCADE:
+            points *= 2
+            setattr(detail, 'cascade_' + score_type + 's', getattr(detail, 'cascade_' + score_type + 's') + 1)
+        scores[side] += points
+    return scores[0], scores[1], details[0], details[1]
+
+
+class GameLog:
+    """
+    Compact play-by-play store for many games (from play_game with record_events=True).
+    
+    Each game costs two team indices (array('I')), one event offset (array('I'))
+    and one byte per scoring opportunity in a shared array('B') buffer, instead
+    of a dict holding Team and ScoringDetail objects.
+    """
+    
+    def __init__(self):
+        self.team1_indices = array('I')
+        self.team2_indices = array('I')
+        self.offsets = array('I', [0])
+        self.events = array('B')
+    
+    def __len__(self):
+        return len(self.team1_indices)
+    
+    def append(self, team1_index, team2_index, events):
+        """Record one game given both teams' indices and its event array"""
+        self.team1_indices.append(team1_index)
+        self.team2_indices.append(team2_index)
+        self.events.extend(events)
+        self.offsets.append(len(self.events))
+    
+    def game_events(self, game_index):
+        """Event array of one recorded game"""
+        return self.events[self.offsets[game_index]:self.offsets[game_index + 1]]
+    
+    def __iter__(self):
+        """Yield (team1_index, team2_index, events) for every recorded game"""
+        for i in range(len(self)):
+            yield self.team1_indices[i], self.team2_indices[i], self.game_events(i)
+    
+    def scoring_details(self, n_teams):
+        """
+        Total each team's scoring over the recorded games by replaying their events.
+        
+        Returns:
+            List of ScoringDetail objects indexed by team
+        """
+        totals = [ScoringDetail() for _ in range(n_teams)]
+        fields = ('runs', 'throws', 'kicks', 'cascade_runs', 'cascade_throws', 'cascade_kicks')
+        for team1_index, team2_index, events in self:
+            _, _, team1_detail, team2_detail = replay_events(events)
+            for index, detail in ((team1_index, team1_detail), (team2_index, team2_detail)):
+                for field in fields:
+                    setattr(totals[index], field, getattr(totals[index], field) + getattr(detail, field))
+        return totals
+
+
+def round_robin_weeks(n_teams, double=False):
+    """Weeks in a round robin of n_teams (one bye per week when n_teams is odd)"""
+    weeks = n_teams - 1 if n_teams % 2 == 0 else n_teams
+    return 2 * weeks if double else weeks
+
+
+def round_robin_week(teams, week_index, double=False, balance_home_away=False):
+    """
+    Matches of one week of the circle-method round robin, in O(n) without
+    building the rest of the schedule. Week order and match order are the same
+    as generate_round_robin_schedule.
+
+    Position 0 stays fixed and the other positions rotate one step per week,
+    so in week k position p > 0 holds team 1 + (p - 1 - k) mod (n - 1), and
+    position j plays position n - 1 - j.
+
+    Args:
+        teams: Sequence of teams (anything indexable, e.g. range(n_teams) for indices)
+        week_index: Week number counting from 0
+        double: Double round robin; the second half repeats the first with sides swapped
+        balance_home_away: Alternate the fixed team between team1 and team2 each week so
+            every team is team1 in half its games (+/- 1)
+
+    Returns:
+        List of (team1, team2) tuples
+    """
+    n_teams = len(teams)
+    n = n_teams + n_teams % 2  # odd leagues get a bye slot, index n_teams
+    weeks = n - 1
+    if not 0 <= week_index < round_robin_weeks(n_teams, double):
+        raise IndexError(f"week_index {week_index} out of range")
+    swap_all = week_index >= weeks
+    k = week_index % weeks
+
+    matches = []
+    for j in range(n // 2):
+        first = 0 if j == 0 else 1 + (j - 1 - k) % weeks
+        second = 1 + (n - 2 - j - k) % weeks
+        if first >= n_teams or second >= n_teams:
+            continue
+        if swap_all != (balance_home_away and j == 0 and k % 2 == 1):
+            first, second = second, first
+        matches.append((teams[first], teams[second]))
+    return matches
+
+
+def iter_round_robin_weeks(teams, double=False, balance_home_away=False, max_rounds=None):
+    """Yield the weeks of a round robin one at a time (see round_robin_week)"""
+    weeks = round_robin_weeks(len(teams), double)
+    for week_index in range(min(weeks, max_rounds) if max_rounds else weeks):
+        yield round_robin_week(teams, week_index, double, balance_home_away)
+
+
 def generate_round_robin_schedule(teams):
-    if len(teams) % 2:
-        teams = teams + [None]
-    n = len(teams)
-    matchups = []
-    for i in range(n - 1):
-        round = []
-        for j in range(n // 2):
-            match = (teams[j], teams[n - 1 - j])
-            if match[0] is not None and match[1] is not None:
-                round.append(match)
-        matchups.append(round)
-        teams = [teams[0]] + [teams[-1]] + teams[1:-1]
-    return matchups
-
-
-def round_robin(teams, max_rounds=None, start_week=1):
-    schedule = generate_round_robin_schedule(teams)
+    return list(iter_round_robin_weeks(teams))
+
+
+def game_stream_seed(root_seed, season, stream, round_number, game_number):
+    """game_seed for one game of a season, or None when the run is unseeded"""
+    if root_seed is None:
+        return None
+    return game_seed(root_seed, season, stream, round_number, game_number)
+
+
+def round_robin(teams, max_rounds=None, start_week=1, seed=None, season=0):
     results = []
     generated_images = {}  # Track images by week: {week: [list of filenames]}
     
-    for week_offset, matches in enumerate(schedule[:max_rounds] if max_rounds else schedule, 0):
+    for week_offset, matches in enumerate(iter_round_robin_weeks(teams, max_rounds=max_rounds), 0):
         week = start_week + week_offset
         print(f"\nWeek {week}:")
         week_results = []
@@ -322,7 +570,8 @@ def round_robin(teams, max_rounds=None, start_week=1):
         week_images = []
         
         for game_num, (team1, team2) in enumerate(matches, 1):
-            result, upset, game_result = play_game(team1, team2)
+            result, upset, game_result = play_game(
+                team1, team2, seed=game_stream_seed(seed, season, REGULAR_SEASON_STREAM, week, game_num))
             week_results.append(result)
             print(result)
             
@@ -354,11 +603,8 @@ def round_robin(teams, max_rounds=None, start_week=1):
 
 
 def display_standings(teams):
-    sorted_teams = sorted(teams, key=lambda t: (t.wins, t.points_for - t.points_against), reverse=True)
-    for i, team in enumerate(sorted_teams, 1):
-        print(f"{i}. {team.name}: W-L: {team.wins}-{team.losses}, "
-              f"PF: {team.points_for}, PA: {team.points_against}, "
-              f"Best Stat: {team.best_stat()}")
+    import standings
+    standings.StandingsEngine(teams).display()
 
 
 def probability_to_american_odds(probability):
@@ -385,7 +631,7 @@ def probability_to_american_odds(probability):
         return round(odds / 5) * 5
 
 
-def calculate_matchup_odds(team1, team2):
+def calculate_matchup_odds(team1, team2, params=None):
     """
     Calculate betting odds for a specific matchup between two teams.
     
@@ -395,7 +641,7 @@ def calculate_matchup_odds(team1, team2):
     Returns a tuple of (team1_odds, team2_odds) in American format.
     """
     # Use the same probability calculation as play_game() for consistency
-    team1_win_prob = calculate_win_probability(team1, team2)
+    team1_win_prob = calculate_win_probability(team1, team2, params)
     team2_win_prob = 1.0 - team1_win_prob
     
     # Convert to American odds
@@ -405,37 +651,33 @@ def calculate_matchup_odds(team1, team2):
     return team1_odds, team2_odds
 
 
-def calculate_team_odds(teams):
+def calculate_team_odds(teams, remaining_schedule=None, seed=None, bracket_format=None, params=None):
     """
     Calculate overall championship/league winner odds for all teams.
     
+    Title probabilities come from the same Monte Carlo futures run that is
+    posted each week (odds_service.futures_odds): the remaining schedule and
+    the playoff bracket, with the config.FUTURES_* sample budget.
+    
+    Args:
+        teams: List of Team objects in their current state
+        remaining_schedule: Weeks still to play, each a list of (team1, team2) tuples
+        seed: Seed of the run, e.g. game_seed(root, season, FUTURES_STREAM, week);
+              None draws fresh entropy, so the odds are not reproducible
+        bracket_format: bracket.Bracket of the playoff (default: bracket.CLASSIC_8)
+        params: ModelParams the games are played with (default: DEFAULT_PARAMS)
+    
     Returns a dictionary mapping team names to their American odds.
     """
-    # Calculate a strength score for each team
-    team_strengths = {}
-    for team in teams:
-        # Base strength from wins
-        win_pct = team.wins / max(1, team.wins + team.losses)
-        
-        # Point differential normalized
-        pd_normalized = (team.points_for - team.points_against) / max(1, team.points_for + team.points_against)
-        
-        # Overall advantage (ranges from -3 to +3, normalize to 0-1)
-        advantage_normalized = (team.overall_advantage + 3) / 6.0
-        
-        # Combined strength score
-        strength = (win_pct * 0.5 + advantage_normalized * 0.3 + pd_normalized * 0.2)
-        strength = max(0.01, min(0.99, strength))  # Ensure between 0.01 and 0.99
-        team_strengths[team.name] = strength
+    # Imported here so game_logic stays free of NumPy for simple runs
+    import odds_service
     
-    # Convert strengths to probabilities (sum to 1.0)
-    total_strength = sum(team_strengths.values())
-    team_probs = {name: strength / total_strength for name, strength in team_strengths.items()}
+    championship_odds = odds_service.futures_odds(teams, remaining_schedule, seed, bracket_format, params)
     
     # Convert probabilities to American odds
     team_odds = {}
-    for name, prob in team_probs.items():
-        team_odds[name] = probability_to_american_odds(prob)
+    for name, odds in championship_odds.items():
+        team_odds[name] = probability_to_american_odds(odds['title'])
     
     return team_odds
 
@@ -449,15 +691,8 @@ def format_standings_for_caption(teams):
     2. Team B (W-L, PF: X, PA: Y, Best: Stat, +/-)
     ...
     """
-    sorted_teams = sorted(teams, key=lambda t: (t.wins, t.points_for - t.points_against), reverse=True)
-    
-    standings_lines = []
-    for i, team in enumerate(sorted_teams, 1):
-        point_diff = team.points_for - team.points_against
-        point_diff_str = f"+{point_diff}" if point_diff >= 0 else str(point_diff)
-        standings_lines.append(f"{i}. {team.name} ({team.wins}-{team.losses}, PF: {team.points_for}, PA: {team.points_against}, Best: {team.best_stat()}, {point_diff_str})")
-    
-    return "\n".join(standings_lines)
+    import standings
+    return standings.StandingsEngine(teams).format_caption()
 
 
 def calculate_standings_up_to_week(initial_teams, game_results_by_week, max_week):
@@ -472,209 +707,85 @@ def calculate_standings_up_to_week(initial_teams, game_results_by_week, max_week
     Returns:
         Formatted standings string for caption
     """
-    # Create temporary copies of teams with initial state
-    temp_teams = []
-    team_dict = {}  # Map team names to team objects for quick lookup
-    
-    for team in initial_teams:
-        temp_team = Team(team.name)
-        temp_team.overall_advantage = team.overall_advantage
-        temp_team.run_advantage = team.run_advantage
-        temp_team.throw_advantage = team.throw_advantage
-        temp_team.kick_advantage = team.kick_advantage
-        temp_team.wins = 0
-        temp_team.losses = 0
-        temp_team.points_for = 0
-        temp_team.points_against = 0
-        temp_teams.append(temp_team)
-        team_dict[team.name] = temp_team
-    
-    # Replay games up to max_week
+    import standings
+    
+    # Start from the initial state with records cleared and apply each game once
+    engine = standings.StandingsEngine(initial_teams, reset_records=True)
     for week in sorted([w for w in game_results_by_week.keys() if isinstance(w, int) and w <= max_week]):
-        week_games = game_results_by_week[week]
-        # Extract game results (skip gemini images, they're tuples with filename first)
-        for item in week_games:
-            # Check if it's a tuple (filename, game_result) or just game_result
-            if isinstance(item, tuple):
-                _, game_result = item
-            else:
-                game_result = item
-            
-            # Apply game result to temp teams
-            team1_name = game_result['team1'].name
-            team2_name = game_result['team2'].name
-            team1_score = game_result['team1_score']
-            team2_score = game_result['team2_score']
-            
-            temp_team1 = team_dict[team1_name]
-            temp_team2 = team_dict[team2_name]
-            
-            # Update stats based on game result
-            if team1_score > team2_score:
-                temp_team1.wins += 1
-                temp_team2.losses += 1
-                temp_team1.points_for += team1_score
-                temp_team1.points_against += team2_score
-                temp_team2.points_for += team2_score
-                temp_team2.points_against += team1_score
-            else:
-                temp_team2.wins += 1
-                temp_team1.losses += 1
-                temp_team2.points_for += team2_score
-                temp_team2.points_against += team1_score
-                temp_team1.points_for += team1_score
-                temp_team1.points_against += team2_score
+        # Items are (filename, game_result) tuples or bare game_result dictionaries
+        for item in game_results_by_week[week]:
+            engine.record_game(item[1] if isinstance(item, tuple) else item)
     
     # Format and return standings
-    return format_standings_for_caption(temp_teams)
+    return engine.format_caption()
 
 
-def tournament(teams):
-    # Sort teams by wins, then by point difference
-    sorted_teams = sorted(teams, key=lambda t: (t.wins, t.points_for - t.points_against), reverse=True)
+def tournament(teams, seed=None, season=0):
+    """
+    Play the classic 8-team tournament (bracket.CLASSIC_8) with printed results.
+
+    Returns:
+        (quarterfinal results, semifinal results, last final game result,
+        list of (filename, game_result) images ending with the champion trophy)
+    """
+    import bracket
+
+    results = ([], [], [])
     tournament_images = []
-    
-    # Quarterfinals
-    print("\nQuarterfinals:")
-    quarterfinals = []
-    quarterfinal_winners = []
-    for game_num, game in enumerate([
-        (sorted_teams[0], sorted_teams[7]),
-        (sorted_teams[1], sorted_teams[6]),
-        (sorted_teams[2], sorted_teams[5]),
-        (sorted_teams[3], sorted_teams[4])
-    ], 1):
-        result, upset, game_result = play_game(*game)
-        quarterfinals.append(result)
-        print(result)
-        
-        # Generate quarterfinal image with standardized naming
-        team1, team2 = game
-        filename = f"tournament_quarterfinal_game_{game_num}.png"
-        tournament_images.append((filename, game_result))
-        # Add Gemini artistic photo
-        gemini_filename = f"tournament_quarterfinal_game_{game_num}_gemini.png"
-        tournament_images.append((gemini_filename, game_result))
-        
-        # Track winner
-        winner = game_result['team1'] if game_result['team1_score'] > game_result['team2_score'] else game_result['team2']
-        quarterfinal_winners.append(winner)
-        
-        if upset:
-            print(f"Upset: {game[1].name} (adv: {game[1].overall_advantage}) upset {game[0].name} (adv: {game[0].overall_advantage})")
-    
-    # Semifinals
-    print("\nSemifinals:")
-    semifinals = []
-    semifinal_winners = []
-    for game_num, game in enumerate([
-        (quarterfinal_winners[0], quarterfinal_winners[1]),  # QF1 winner vs QF2 winner
-        (quarterfinal_winners[2], quarterfinal_winners[3])   # QF3 winner vs QF4 winner
-    ], 1):
-        result, upset, game_result = play_game(*game)
-        semifinals.append(result)
-        print(result)
-        
-        # Generate semifinal image with standardized naming
-        team1, team2 = game
-        filename = f"tournament_semifinal_game_{game_num}.png"
-        tournament_images.append((filename, game_result))
-        # Add Gemini artistic photo
-        gemini_filename = f"tournament_semifinal_game_{game_num}_gemini.png"
-        tournament_images.append((gemini_filename, game_result))
-        
-        # Track winner
-        winner = game_result['team1'] if game_result['team1_score'] > game_result['team2_score'] else game_result['team2']
-        semifinal_winners.append(winner)
-        
-        if upset:
-            print(f"Upset: {game[1].name} (adv: {game[1].overall_advantage}) upset {game[0].name} (adv: {game[0].overall_advantage})")
-    
-    # Final - Best 2 out of 3
-    print("\nFinal (Best 2 out of 3):")
-    team1, team2 = semifinal_winners[0], semifinal_winners[1]
-    
-    team1_wins = 0
-    team2_wins = 0
-    game_num = 1
-    final_results = []
-    
-    while team1_wins < 2 and team2_wins < 2:
-        print(f"\nGame {game_num}:")
-        result, upset, game_result = play_game(team1, team2)
+
+    def start_round(round_index, history):
+        wins_needed = bracket.CLASSIC_8.series[round_index]
+        label = bracket.CLASSIC_8.round_label(round_index)
+        print(f"\n{label}:" if wins_needed == 1 else f"\n{label} (Best {wins_needed} out of {2 * wins_needed - 1}):")
+
+    def record_game(round_index, game_num, team1, team2, wins, play_result):
+        result, upset, game_result = play_result
+        series = bracket.CLASSIC_8.series[round_index] > 1
+        if series:
+            print(f"\nGame {game_num}:")
         print(result)
-        
-        # Determine winner of this game
-        # Note: play_game() handles ties internally, so scores should never be equal here
-        if game_result['team1_score'] > game_result['team2_score']:
-            team1_wins += 1
-            winner = team1
-        elif game_result['team2_score'] > game_result['team1_score']:
-            team2_wins += 1
-            winner = team2
-        else:
-            # This should never happen since play_game() handles ties, but handle it just in case
-            # Play one more scoring opportunity to break the tie
-            if random.random() < 0.5:
-                team1_wins += 1
-                winner = team1
-            else:
-                team2_wins += 1
-                winner = team2
-        
-        # Generate final game image
-        filename = f"tournament_final_game_{game_num}.png"
-        tournament_images.append((filename, game_result))
-        # Add Gemini artistic photo for final game
-        gemini_filename = f"tournament_final_game_{game_num}_gemini.png"
-        tournament_images.append((gemini_filename, game_result))
-        final_results.append(result)
-        
-        print(f"Series: {team1.name} {team1_wins} - {team2_wins} {team2.name}")
-        
+        results[round_index].append(result)
+
+        # Scoreboard image and Gemini artistic photo with standardized naming
+        game_type = bracket.CLASSIC_8.game_type(round_index)
+        tournament_images.append((f"tournament_{game_type}_game_{game_num}.png", game_result))
+        tournament_images.append((f"tournament_{game_type}_game_{game_num}_gemini.png", game_result))
+
+        if series:
+            print(f"Series: {team1.name} {wins[0]} - {wins[1]} {team2.name}")
         if upset:
-            # The upset flag indicates the lower-advantage team won
-            winner = team1 if game_result['team1_score'] > game_result['team2_score'] else team2
-            loser = team2 if game_result['team1_score'] > game_result['team2_score'] else team1
+            winner, loser = (team1, team2) if game_result['team1_score'] > game_result['team2_score'] else (team2, team1)
             print(f"Upset: {winner.name} (adv: {winner.overall_advantage}) upset {loser.name} (adv: {loser.overall_advantage})")
-        
-        game_num += 1
-    
-    # Determine tournament champion
-    if team1_wins == 2:
-        champion = team1
-        final_winner = team1
-    else:
-        champion = team2
-        final_winner = team2
-    
+
+    outcome = bracket.play_bracket(teams, bracket.CLASSIC_8, seed, season,
+                                   on_round_start=start_round, on_game=record_game)
+    champion = outcome['champion']
+
+    # The final is the last match played
+    last_game_result = outcome['games'][-1][2]
+    team1, team2 = last_game_result['team1'], last_game_result['team2']
+    final_games = [game_result for round_index, _, game_result in outcome['games'] if round_index == 2]
+    team1_wins = sum(game_result['team1_score'] > game_result['team2_score'] for game_result in final_games)
+
     print(f"\n{'='*60}")
     print(f"🏆 TOURNAMENT CHAMPION: {champion.name} 🏆")
-    print(f"Final Series: {team1.name} {team1_wins} - {team2_wins} {team2.name}")
+    print(f"Final Series: {team1.name} {team1_wins} - {len(final_games) - team1_wins} {team2.name}")
     print(f"{'='*60}")
-    
-    # Generate champion trophy image
-    # Use the final winning game result as the base
-    if tournament_images:
-        # Get the last game result (the final winning game)
-        last_game_result = tournament_images[-1][1]
-        # Create trophy image entry
-        trophy_filename = "tournament_champion_trophy.png"
-        # Create a copy of the game result for trophy image generation
-        trophy_game_result = {
-            'team1': last_game_result['team1'],
-            'team2': last_game_result['team2'],
-            'team1_score': last_game_result['team1_score'],
-            'team2_score': last_game_result['team2_score'],
-            'team1_detail': last_game_result['team1_detail'],
-            'team2_detail': last_game_result['team2_detail'],
-            'upset': last_game_result.get('upset', False),
-            'is_champion': True  # Flag to indicate this is a trophy image
-        }
-        tournament_images.append((trophy_filename, trophy_game_result))
-    
-    # Use the last game result as the final result for return value
-    final_result = final_results[-1]
-    
-    return quarterfinals, semifinals, final_result, tournament_images
+
+    # Champion trophy image, based on the final winning game
+    trophy_game_result = {
+        'team1': team1,
+        'team2': team2,
+        'team1_score': last_game_result['team1_score'],
+        'team2_score': last_game_result['team2_score'],
+        'team1_detail': last_game_result['team1_detail'],
+        'team2_detail': last_game_result['team2_detail'],
+        'upset': last_game_result.get('upset', False),
+        'seed': last_game_result.get('seed'),
+        'is_champion': True  # Flag to indicate this is a trophy image
+    }
+    tournament_images.append(("tournament_champion_trophy.png", trophy_game_result))
+
+    quarterfinals, semifinals, final_results = results
+    return quarterfinals, semifinals, final_results[-1], tournament_images
 
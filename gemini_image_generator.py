@@ -14,6 +14,8 @@ except ImportError:
     genai = None
 
 import config
+import game_logic
+import logo_cache
 
 # Expanded Actions
 ACTIONS = [
@@ -113,20 +115,23 @@ def load_gemini_api_key():
         return api_key
 
 
-def generate_random_prompt(winner_team_name, loser_team_name):
+def generate_random_prompt(winner_team_name, loser_team_name, rng=None):
     """
     Generate a random prompt with varying actions, styles, and compositions.
     
     Args:
         winner_team_name: Name of the winning team
         loser_team_name: Name of the losing team
+        rng: Optional random.Random to draw from (defaults to the global random module)
     
     Returns:
         A tuple of (prompt_string, action, style, scenario) for use in enhanced prompts
     """
-    action = random.choice(ACTIONS)
-    style = random.choice(ART_STYLES)
-    scenario = random.choice(SCENARIOS)
+    if rng is None:
+        rng = random
+    action = rng.choice(ACTIONS)
+    style = rng.choice(ART_STYLES)
+    scenario = rng.choice(SCENARIOS)
     
     prompt = (
         f"Show the team from logo 1 {action} the team from logo 2, "
@@ -139,21 +144,8 @@ def generate_random_prompt(winner_team_name, loser_team_name):
 
 
 def load_logo_image(team, logos_directory=None):
-    """Load a team's logo image"""
-    if logos_directory is None:
-        logos_directory = config.LOGOS_DIRECTORY
-    
-    logo_path = os.path.join(logos_directory, team.get_logo_filename())
-    
-    # Try different filename variations
-    for logo_file in [logo_path, logo_path.replace("'", "'"), logo_path.replace("'", "'")]:
-        try:
-            if os.path.exists(logo_file):
-                return Image.open(logo_file).convert('RGBA')
-        except Exception as e:
-            continue
-    
-    return None
+    """Load a team's logo image (from the shared logo cache; do not modify it in place)"""
+    return logo_cache.load_logo(team, logos_directory)
 
 
 def image_to_base64(image):
@@ -220,11 +212,15 @@ def generate_game_image_with_gemini(game_result, filename, game_type="game", wee
             winner_logo = None
             loser_logo = None
         
+        # Seeded games get a reproducible prompt derived from the game's seed
+        game_seed = game_result.get('seed')
+        prompt_rng = random.Random(game_logic.game_seed(game_seed, game_logic.PROMPT_STREAM)) if game_seed is not None else random
+        
         # Generate prompt - use trophy prompt for champion, otherwise random
         if is_champion:
             # For champion, use trophy victory prompt but keep random style
-            style = random.choice(ART_STYLES)
-            scenario = random.choice(SCENARIOS)
+            style = prompt_rng.choice(ART_STYLES)
+            scenario = prompt_rng.choice(SCENARIOS)
             action = "celebrating victory"
             prompt = (
                 f"Show the team from logo 1 standing on a victory podium holding a championship trophy, "
@@ -234,7 +230,7 @@ def generate_game_image_with_gemini(game_result, filename, game_type="game", wee
             )
         else:
             # Generate random prompt with all variations
-            prompt, action, style, scenario = generate_random_prompt(winner_team.name, loser_team.name)
+            prompt, action, style, scenario = generate_random_prompt(winner_team.name, loser_team.name, prompt_rng)
         
         try:
             import requests
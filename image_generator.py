@@ -2,6 +2,7 @@
 import os
 import random
 import math
+from functools import lru_cache
 try:
     from PIL import Image, ImageDraw, ImageFont, ImageStat
 except ImportError:
@@ -13,45 +14,69 @@ try:
     import numpy as np
 except ImportError:
     np = None  # Will use PIL-only method if numpy not available
+import bracket
 import config
+import font_registry
+import logo_cache
+
+
+# Most recently used gradient canvases kept by gradient_canvas
+GRADIENT_CACHE_SIZE = 8
+
+
+def _hex_to_rgb(hex_color):
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+
+
+@lru_cache(maxsize=GRADIENT_CACHE_SIZE)
+def _gradient_image(width, height, color1, color2, direction):
+    """Build a gradient once per (size, colors, direction); callers get copies"""
+    rgb1 = _hex_to_rgb(color1)
+    rgb2 = _hex_to_rgb(color2)
+    length = height if direction == 'vertical' else width
+
+    if np is None:
+        # Same colors line by line without numpy
+        img = Image.new('RGB', (width, height))
+        draw = ImageDraw.Draw(img)
+        for i in range(length):
+            ratio = i / length
+            color = tuple(int(rgb1[c] * (1 - ratio) + rgb2[c] * ratio) for c in range(3))
+            line = [(0, i), (width, i)] if direction == 'vertical' else [(i, 0), (i, height)]
+            draw.line(line, fill=color)
+        return img
+
+    # One color per row (or column), same arithmetic as the per-line loop, truncated like int()
+    ratio = (np.arange(length) / length)[:, None]
+    colors = (np.array(rgb1) * (1 - ratio) + np.array(rgb2) * ratio).astype(np.uint8)
+    if direction == 'vertical':
+        pixels = np.broadcast_to(colors[:, None, :], (height, width, 3))
+    else:
+        pixels = np.broadcast_to(colors[None, :, :], (height, width, 3))
+    return Image.fromarray(np.ascontiguousarray(pixels), 'RGB')
+
+
+def gradient_canvas(width, height, color1, color2, direction='vertical'):
+    """New RGB image filled with a gradient, copied from a cached base canvas"""
+    return _gradient_image(width, height, color1, color2, direction).copy()
 
 
 def draw_gradient_background(img, width, height, color1, color2, direction='vertical'):
     """Draw a gradient background on the image"""
-    draw = ImageDraw.Draw(img)
-    
-    # Parse colors
-    def hex_to_rgb(hex_color):
-        hex_color = hex_color.lstrip('#')
-        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-    
-    rgb1 = hex_to_rgb(color1)
-    rgb2 = hex_to_rgb(color2)
-    
-    if direction == 'vertical':
-        for y in range(height):
-            ratio = y / height
-            r = int(rgb1[0] * (1 - ratio) + rgb2[0] * ratio)
-            g = int(rgb1[1] * (1 - ratio) + rgb2[1] * ratio)
-            b = int(rgb1[2] * (1 - ratio) + rgb2[2] * ratio)
-            draw.line([(0, y), (width, y)], fill=(r, g, b))
-    else:  # horizontal
-        for x in range(width):
-            ratio = x / width
-            r = int(rgb1[0] * (1 - ratio) + rgb2[0] * ratio)
-            g = int(rgb1[1] * (1 - ratio) + rgb2[1] * ratio)
-            b = int(rgb1[2] * (1 - ratio) + rgb2[2] * ratio)
-            draw.line([(x, 0), (x, height)], fill=(r, g, b))
-
-
-def extract_dominant_color(logo_image):
+    img.paste(_gradient_image(width, height, color1, color2, direction), (0, 0))
+
+
+# Colors within this many RGB units per channel fall in the same bucket
+COLOR_BUCKET_SIZE = 20
+DEFAULT_THEME_COLOR = (78, 205, 196)  # Default teal color
+
+
+def logo_pixels(logo_image, sample_size=50):
     """
-    Extract the single most dominant color from a logo image.
-    Returns RGB tuple of the dominant color.
+    Logo flattened onto white as RGB, resized to sample_size x sample_size
+    (None keeps the full resolution).
     """
-    if logo_image is None:
-        return (78, 205, 196)  # Default teal color
-    
     # Convert to RGB if needed
     if logo_image.mode != 'RGB':
         rgb_logo = Image.new('RGB', logo_image.size, (255, 255, 255))
@@ -62,7 +87,67 @@ def extract_dominant_color(logo_image):
         logo_image = rgb_logo
     
     # Resize to smaller size for faster processing
-    small_logo = logo_image.resize((50, 50), Image.Resampling.LANCZOS)
+    if sample_size is None:
+        return logo_image
+    return logo_image.resize((sample_size, sample_size), Image.Resampling.LANCZOS)
+
+
+def meaningful_pixel_mask(pixels):
+    """[N] mask of pixels that are neither near-white (background) nor near-black (outlines)"""
+    light = (pixels > 240).all(axis=1)
+    dark = (pixels < 30).all(axis=1)
+    return ~(light | dark)
+
+
+def color_buckets(pixels, bucket_size=COLOR_BUCKET_SIZE):
+    """
+    Bucket histogram of [N, 3] uint8 pixels.
+
+    Returns:
+        (bucket ids in order of first appearance, pixel count, per-channel sums [B, 3])
+    """
+    levels = 256 // bucket_size + 1
+    coarse = pixels.astype(np.int64) // bucket_size
+    ids = (coarse[:, 0] * levels + coarse[:, 1]) * levels + coarse[:, 2]
+    unique, first_seen, inverse = np.unique(ids, return_index=True, return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(unique))
+    sums = np.stack([np.bincount(inverse, weights=pixels[:, c], minlength=len(unique)) for c in range(3)], axis=1)
+    order = np.argsort(first_seen, kind='stable')
+    return unique[order], counts[order], sums[order].astype(np.int64)
+
+
+def dominant_color_from_pixels(pixels, bucket_size=COLOR_BUCKET_SIZE):
+    """
+    Mean color of the most populated bucket of [N, 3] uint8 pixels, ignoring
+    near-white and near-black pixels unless nothing else is left. Ties go to
+    the bucket seen first, as with the dictionary of buckets this replaced.
+    """
+    if len(pixels) == 0:
+        return DEFAULT_THEME_COLOR
+    meaningful = pixels[meaningful_pixel_mask(pixels)]
+    if len(meaningful) == 0:
+        # If no meaningful pixels found, use all pixels
+        meaningful = pixels
+    _, counts, sums = color_buckets(meaningful, bucket_size)
+    largest = int(np.argmax(counts))
+    return tuple(int(total) // int(counts[largest]) for total in sums[largest])
+
+
+def extract_dominant_color(logo_image, sample_size=50):
+    """
+    Extract the single most dominant color from a logo image.
+    Returns RGB tuple of the dominant color.
+
+    Args:
+        logo_image: The logo image (None gives the default color)
+        sample_size: Side of the square the logo is resized to first (None for full resolution)
+    """
+    if logo_image is None:
+        return DEFAULT_THEME_COLOR
+    
+    small_logo = logo_pixels(logo_image, sample_size)
+    if np is not None:
+        return dominant_color_from_pixels(np.asarray(small_logo).reshape(-1, 3))
     
     # Get all pixel colors
     pixels = list(small_logo.getdata())
@@ -86,7 +171,7 @@ def extract_dominant_color(logo_image):
     # Calculate average of top colors by frequency
     # Group similar colors together
     color_buckets = {}
-    bucket_size = 20  # Group colors within 20 RGB units
+    bucket_size = COLOR_BUCKET_SIZE
     
     for r, g, b in meaningful_pixels:
         # Round to bucket size
@@ -111,16 +196,66 @@ def extract_dominant_color(logo_image):
         avg_b = sum(p[2] for p in pixels) // len(pixels)
         return (avg_r, avg_g, avg_b)
     
-    return (78, 205, 196)  # Default teal color
+    return DEFAULT_THEME_COLOR
 
 
-def apply_translucent_logo_background(img, logo_image, width, height):
+def extract_palette(logo_image, colors=3, sample_size=100, iterations=20):
     """
-    Apply a translucent version of the winner's logo as the background.
-    Scales the logo to cover the entire image and centers it.
+    Main colors of a logo by k-means over its meaningful pixels, started
+    from the means of the most populated color buckets.
+
+    Args:
+        logo_image: The logo image
+        colors: Number of palette colors
+        sample_size: Side of the square the logo is resized to first (None for full resolution)
+        iterations: Most k-means passes
+
+    Returns:
+        List of ((r, g, b), share of pixels), most common first
     """
     if logo_image is None:
-        return
+        return [(DEFAULT_THEME_COLOR, 1.0)]
+    if np is None:
+        return [(extract_dominant_color(logo_image, sample_size), 1.0)]
+    
+    pixels = np.asarray(logo_pixels(logo_image, sample_size)).reshape(-1, 3)
+    meaningful = pixels[meaningful_pixel_mask(pixels)]
+    if len(meaningful) == 0:
+        meaningful = pixels
+    _, counts, sums = color_buckets(meaningful)
+    largest = np.argsort(-counts, kind='stable')[:colors]
+    centers = sums[largest] / counts[largest, None]
+    
+    points = meaningful.astype(float)
+    labels = None
+    for _ in range(iterations):
+        distances = ((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        new_labels = distances.argmin(axis=1)
+        if labels is not None and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        sizes = np.bincount(labels, minlength=len(centers))
+        for c in range(3):
+            totals = np.bincount(labels, weights=points[:, c], minlength=len(centers))
+            centers[:, c] = np.where(sizes > 0, totals / np.maximum(sizes, 1), centers[:, c])
+    
+    sizes = np.bincount(labels, minlength=len(centers))
+    palette = [(tuple(int(round(value)) for value in centers[k]), float(sizes[k] / len(points)))
+               for k in np.argsort(-sizes, kind='stable') if sizes[k] > 0]
+    return palette
+
+
+def translucent_cover_overlay(logo_image, size, opacity=0.7):
+    """
+    Canvas-sized RGBA overlay with the logo scaled to cover it, centered,
+    with its alpha scaled by opacity.
+
+    Args:
+        logo_image: The logo image
+        size: (width, height) of the canvas
+        opacity: Opacity level (0.0 to 1.0, default 0.7 = 70%)
+    """
+    width, height = size
     
     # Convert to RGBA if needed
     if logo_image.mode != 'RGBA':
@@ -143,7 +278,7 @@ def apply_translucent_logo_background(img, logo_image, width, height):
     
     # Make logo translucent (reduce alpha)
     alpha = logo_resized.split()[3]
-    alpha_reduced = alpha.point(lambda p: int(p * 0.7))  # 70% opacity
+    alpha_reduced = alpha.point(lambda p: int(p * opacity))
     logo_translucent = logo_resized.copy()
     logo_translucent.putalpha(alpha_reduced)
     
@@ -151,8 +286,19 @@ def apply_translucent_logo_background(img, logo_image, width, height):
     logo_x = (width - logo_width) // 2
     logo_y = (height - logo_height) // 2
     overlay.paste(logo_translucent, (logo_x, logo_y), logo_translucent)
+    return overlay
+
+
+def apply_translucent_logo_background(img, logo_image, width, height):
+    """
+    Apply a translucent version of the winner's logo as the background.
+    Scales the logo to cover the entire image and centers it.
+    """
+    if logo_image is None:
+        return
     
     # Composite onto image
+    overlay = translucent_cover_overlay(logo_image, (width, height))
     img.paste(overlay, (0, 0), overlay)
 
 
@@ -223,7 +369,8 @@ def generate_game_image(game_result, filename, game_type="game", week=None, game
     try:
         # Create square image with gradient background (Instagram-friendly 1:1 aspect ratio)
         width, height = 1600, 1600
-        img = Image.new('RGB', (width, height), color='#0a0a1a')
+        # Start from a copy of the prebuilt gradient background
+        img = gradient_canvas(width, height, '#0a0a1a', '#1a1a2e', 'vertical')
         draw = ImageDraw.Draw(img)
         
         # Get team scores early to determine winner for background theme
@@ -232,84 +379,36 @@ def generate_game_image(game_result, filename, game_type="game", week=None, game
         team1_score = game_result['team1_score']
         team2_score = game_result['team2_score']
         
-        # Draw base gradient background
-        draw_gradient_background(img, width, height, '#0a0a1a', '#1a1a2e', 'vertical')
-        
-        # Try to load fonts, fallback to default if not available
-        try:
-            title_font = ImageFont.truetype("arial.ttf", 72)
-            try:
-                title_bold_font = ImageFont.truetype("arialbd.ttf", 72)
-            except:
-                title_bold_font = ImageFont.truetype("arial.ttf", 72)
-            score_font = ImageFont.truetype("arial.ttf", 160)
-            team_font = ImageFont.truetype("arial.ttf", 52)
-            detail_font = ImageFont.truetype("arial.ttf", 32)
-            vs_font = ImageFont.truetype("arial.ttf", 52)
-        except:
-            try:
-                title_font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 72)
-                try:
-                    title_bold_font = ImageFont.truetype("C:/Windows/Fonts/arialbd.ttf", 72)
-                except:
-                    title_bold_font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 72)
-                score_font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 160)
-                team_font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 52)
-                detail_font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 32)
-                vs_font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 52)
-            except:
-                title_font = ImageFont.load_default()
-                title_bold_font = ImageFont.load_default()
-                score_font = ImageFont.load_default()
-                team_font = ImageFont.load_default()
-                detail_font = ImageFont.load_default()
-                vs_font = ImageFont.load_default()
+        # Fonts from the registry: resolved and loaded once per process
+        title_font = font_registry.get_font(72)
+        title_bold_font = font_registry.get_font(72, weight='bold')
+        score_font = font_registry.get_font(160)
+        team_font = font_registry.get_font(52)
+        detail_font = font_registry.get_font(32)
+        vs_font = font_registry.get_font(52)
         
         team1_detail = game_result['team1_detail']
         team2_detail = game_result['team2_detail']
         
-        # Load logos early to extract colors for background theme
+        # Logos come from the shared cache; the variants below are built once per team and size
         logo_size = 300
-        logo1_original = None
-        logo1_path = os.path.join(config.LOGOS_DIRECTORY, team1.get_logo_filename())
-        for logo_file in [logo1_path, logo1_path.replace("'", "'"), logo1_path.replace("'", "'")]:
-            try:
-                if os.path.exists(logo_file):
-                    logo1_original = Image.open(logo_file).convert('RGBA')
-                    break
-            except:
-                continue
-        
-        logo2_original = None
-        logo2_path = os.path.join(config.LOGOS_DIRECTORY, team2.get_logo_filename())
-        for logo_file in [logo2_path, logo2_path.replace("'", "'"), logo2_path.replace("'", "'")]:
-            try:
-                if os.path.exists(logo_file):
-                    logo2_original = Image.open(logo_file).convert('RGBA')
-                    break
-            except:
-                continue
         
         # Determine winner and loser
         if team1_score > team2_score:
-            winning_team_logo = logo1_original
-            losing_team_logo = logo2_original
             winner = team1
             loser = team2
         elif team2_score > team1_score:
-            winning_team_logo = logo2_original
-            losing_team_logo = logo1_original
             winner = team2
             loser = team1
         else:
             # Tie - use team1 as winner by default
-            winning_team_logo = logo1_original
-            losing_team_logo = logo2_original
             winner = team1
             loser = team2
         
         # Apply translucent winner's logo as background
-        apply_translucent_logo_background(img, winning_team_logo, width, height)
+        background_logo = logo_cache.logo_variant(winner, 'cover', (width, height), 0.7, translucent_cover_overlay)
+        if background_logo:
+            img.paste(background_logo, (0, 0), background_logo)
         
         # Add semi-transparent glass effect overlay behind text areas for readability
         overlay = Image.new('RGBA', (width, height), (0, 0, 0, 0))
@@ -327,19 +426,13 @@ def generate_game_image(game_result, filename, game_type="game", week=None, game
         draw = ImageDraw.Draw(img)
         
         # Resize logos for display
-        logo1 = None
-        if logo1_original:
-            logo1 = logo1_original.resize((logo_size, logo_size), Image.Resampling.LANCZOS)
+        logo1 = logo_cache.resized_logo(team1, logo_size)
         
-        logo2 = None
-        if logo2_original:
-            logo2 = logo2_original.resize((logo_size, logo_size), Image.Resampling.LANCZOS)
+        logo2 = logo_cache.resized_logo(team2, logo_size)
         
         # Resize loser logo for bottom right corner
         loser_logo_size = 200
-        loser_logo = None
-        if losing_team_logo:
-            loser_logo = losing_team_logo.resize((loser_logo_size, loser_logo_size), Image.Resampling.LANCZOS)
+        loser_logo = logo_cache.resized_logo(loser, loser_logo_size)
         
         # Draw decorative border with glow effect
         border_width = 8
@@ -402,13 +495,7 @@ def generate_game_image(game_result, filename, game_type="game", week=None, game
         # Draw stats vertically: Runs, Throws, Kicks, then big Score
         stat_spacing = 80
         stat_label_font_size = 36
-        try:
-            stat_label_font = ImageFont.truetype("arial.ttf", stat_label_font_size)
-        except:
-            try:
-                stat_label_font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", stat_label_font_size)
-            except:
-                stat_label_font = ImageFont.load_default()
+        stat_label_font = font_registry.get_font(stat_label_font_size)
         
         # Team 1 stats (left side, centered)
         y_pos = team1_start_y + 70
@@ -481,13 +568,7 @@ def generate_game_image(game_result, filename, game_type="game", week=None, game
         # Big Score for Team 1
         score1_text = str(team1_score)
         big_score_font_size = 200
-        try:
-            big_score_font = ImageFont.truetype("arial.ttf", big_score_font_size)
-        except:
-            try:
-                big_score_font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", big_score_font_size)
-            except:
-                big_score_font = ImageFont.load_default()
+        big_score_font = font_registry.get_font(big_score_font_size)
         
         score1_bbox = draw.textbbox((0, 0), score1_text, font=big_score_font)
         score1_width = score1_bbox[2] - score1_bbox[0]
@@ -584,21 +665,13 @@ def generate_game_image(game_result, filename, game_type="game", week=None, game
             loser_logo_x = width - loser_logo_size - 40
             loser_logo_y = height - loser_logo_size - 40
             # Add shadow behind logo
-            shadow_img = Image.new('RGBA', (loser_logo_size + 10, loser_logo_size + 10), (0, 0, 0, 0))
-            shadow_mask = Image.new('RGBA', loser_logo.size, (0, 0, 0, 150))
-            shadow_img.paste(shadow_mask, (5, 5), shadow_mask)
+            shadow_img = logo_cache.shadow(loser_logo_size)
             img.paste(shadow_img, (loser_logo_x - 5, loser_logo_y - 5), shadow_img)
             img.paste(loser_logo, (loser_logo_x, loser_logo_y), loser_logo)
         
         # Draw legend for Cascade Zone indicator
         legend_font_size = 26
-        try:
-            legend_font = ImageFont.truetype("arial.ttf", legend_font_size)
-        except:
-            try:
-                legend_font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", legend_font_size)
-            except:
-                legend_font = ImageFont.load_default()
+        legend_font = font_registry.get_font(legend_font_size)
         
         legend_y = height - 80
         legend_circle_radius = 7
@@ -622,385 +695,130 @@ def generate_game_image(game_result, filename, game_type="game", week=None, game
         return False
 
 
-def generate_tournament_bracket(teams, filename, round_stage='quarterfinals', quarterfinal_winners=None, semifinal_winners=None):
-    """Generate a tournament bracket image showing teams in bracket format with logos
-    round_stage: 'quarterfinals', 'semifinals', or 'finals'
-    quarterfinal_winners: List of 4 teams (winners of quarterfinals) - needed for semifinals/finals
-    semifinal_winners: List of 2 teams (winners of semifinals) - needed for finals
+def draw_advancement_odds(draw, advancement_odds, team, right_x, y, font):
+    """Draw a team's live title chance right-aligned at right_x (nothing without odds)"""
+    if not advancement_odds or team.name not in advancement_odds:
+        return
+    text = f"Title {advancement_odds[team.name]['title']:.0%}"
+    text_bbox = draw.textbbox((0, 0), text, font=font)
+    draw.text((right_x - (text_bbox[2] - text_bbox[0]), y), text, fill='#4ecdc4', font=font)
+
+
+def load_bracket_font(size):
+    """Arial at the given size, falling back to PIL's default font (from the font registry)"""
+    return font_registry.get_font(size)
+
+
+def load_bracket_logo(team, logo_size):
+    """Team logo resized to logo_size x logo_size, or None if it cannot be loaded (shared, do not modify)"""
+    return logo_cache.resized_logo(team, logo_size)
+
+
+def fit_text(draw, text, font, max_width):
+    """Shorten text with "..." until it fits in max_width pixels"""
+    if draw.textlength(text, font=font) <= max_width:
+        return text
+    while len(text) > 1 and draw.textlength(text + "...", font=font) > max_width:
+        text = text[:-1]
+    return text.rstrip() + "..."
+
+
+def generate_bracket_image(bracket_format, rounds, filename, first_round=0, seeds=None, advancement_odds=None):
+    """Generate a bracket image for any bracket.Bracket, laid out from the bracket tree
+    rounds: Entrants of each round in slot order, as in Bracket.play history (None = bye);
+            rounds not decided yet can be None or left out
+    first_round: First round to show (earlier rounds are already decided)
+    seeds: Optional dictionary of team name -> seed number shown above the name
+    advancement_odds: Optional bracket_odds.advancement_odds() result; shows each team's title chance
     """
     try:
-        # Sort teams by wins, then by point difference (same as tournament seeding)
-        sorted_teams = sorted(teams, key=lambda t: (t.wins, t.points_for - t.points_against), reverse=True)
-        
         # Create square image (1:1 aspect ratio) for Instagram
         width, height = 1600, 1600
-        img = Image.new('RGB', (width, height), color='#0a0a1a')
+        # Start from a copy of the prebuilt gradient background
+        img = gradient_canvas(width, height, '#0a0a1a', '#1a1a2e', 'vertical')
         draw = ImageDraw.Draw(img)
-        
-        # Draw gradient background
-        draw_gradient_background(img, width, height, '#0a0a1a', '#1a1a2e', 'vertical')
-        
-        # Try to load fonts
-        try:
-            title_font = ImageFont.truetype("arial.ttf", 64)
-            round_font = ImageFont.truetype("arial.ttf", 40)
-            team_font = ImageFont.truetype("arial.ttf", 28)
-            seed_font = ImageFont.truetype("arial.ttf", 20)
-        except:
-            try:
-                title_font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 64)
-                round_font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 40)
-                team_font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 28)
-                seed_font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 20)
-            except:
-                title_font = ImageFont.load_default()
-                round_font = ImageFont.load_default()
-                team_font = ImageFont.load_default()
-                seed_font = ImageFont.load_default()
-        
+
         # Draw title
+        title_font = load_bracket_font(64)
+        round_font = load_bracket_font(40)
         title = "TOURNAMENT BRACKET"
         title_bbox = draw.textbbox((0, 0), title, font=title_font)
         title_width = title_bbox[2] - title_bbox[0]
         title_x = (width - title_width) // 2
         title_y = 30
-        
+
         # Title with shadow
         for offset in [5, 4, 3, 2]:
             draw.text((title_x + offset, title_y + offset), title, fill='#000000', font=title_font)
         draw.text((title_x, title_y), title, fill='#4ecdc4', font=title_font)
-        
-        # Constants for bracket layout (adjusted for square format)
-        bracket_y_start = 120
-        match_height = 140
-        match_spacing = 160
-        logo_size = 60
-        
-        if round_stage == 'quarterfinals':
-            # Show all 8 teams in quarterfinals
-            qf_start_x = 100
-            sf_start_x = 600
-            final_start_x = 1100
-            box_width = 450
-            
-            # Quarterfinals section
-            round_label = "Quarterfinals"
-            draw.text((qf_start_x, bracket_y_start - 50), round_label, fill='#ffffff', font=round_font)
-            
-            qf_matchups = [
-                (sorted_teams[0], sorted_teams[7]),  # 1 vs 8
-                (sorted_teams[1], sorted_teams[6]),  # 2 vs 7
-                (sorted_teams[2], sorted_teams[5]),  # 3 vs 6
-                (sorted_teams[3], sorted_teams[4])   # 4 vs 5
-            ]
-            
-            # Draw quarterfinal matchups
-            for i, (team1, team2) in enumerate(qf_matchups):
-                y_pos = bracket_y_start + i * match_spacing
-                
-                # Draw matchup box
-                box_height = match_height
-                box_x = qf_start_x
-                box_y = y_pos
-                
-                # Background box for matchup
-                draw.rectangle([box_x, box_y, box_x + box_width, box_y + box_height], 
-                              fill='#1a1a2e', outline='#4ecdc4', width=3)
-                
-                # Draw team 1 (top)
-                team1_y = box_y + 8
-                team1_seed = sorted_teams.index(team1) + 1
-                
-                # Load and draw team1 logo
-                logo1 = None
-                logo1_path = os.path.join(config.LOGOS_DIRECTORY, team1.get_logo_filename())
-                for logo_file in [logo1_path, logo1_path.replace("'", "'"), logo1_path.replace("'", "'")]:
-                    try:
-                        if os.path.exists(logo_file):
-                            logo1 = Image.open(logo_file).convert('RGBA')
-                            logo1 = logo1.resize((logo_size, logo_size), Image.Resampling.LANCZOS)
-                            break
-                    except:
-                        continue
-                
-                if logo1:
-                    img.paste(logo1, (box_x + 8, team1_y), logo1)
-                
-                # Draw team 1 name and seed
-                seed_text = f"#{team1_seed}"
-                draw.text((box_x + 80, team1_y + 3), seed_text, fill='#888888', font=seed_font)
-                team1_text = team1.name
-                # Truncate long team names
-                if len(team1_text) > 20:
-                    team1_text = team1_text[:17] + "..."
-                draw.text((box_x + 80, team1_y + 20), team1_text, fill='#ffffff', font=team_font)
-                
-                # Draw team 2 (bottom)
-                team2_y = box_y + 70
-                team2_seed = sorted_teams.index(team2) + 1
-                
-                # Load and draw team2 logo
-                logo2 = None
-                logo2_path = os.path.join(config.LOGOS_DIRECTORY, team2.get_logo_filename())
-                for logo_file in [logo2_path, logo2_path.replace("'", "'"), logo2_path.replace("'", "'")]:
-                    try:
-                        if os.path.exists(logo_file):
-                            logo2 = Image.open(logo_file).convert('RGBA')
-                            logo2 = logo2.resize((logo_size, logo_size), Image.Resampling.LANCZOS)
-                            break
-                    except:
-                        continue
-                
-                if logo2:
-                    img.paste(logo2, (box_x + 8, team2_y), logo2)
-                
-                # Draw team 2 name and seed
-                seed_text = f"#{team2_seed}"
-                draw.text((box_x + 80, team2_y + 3), seed_text, fill='#888888', font=seed_font)
-                team2_text = team2.name
-                # Truncate long team names
-                if len(team2_text) > 20:
-                    team2_text = team2_text[:17] + "..."
-                draw.text((box_x + 80, team2_y + 20), team2_text, fill='#ffffff', font=team_font)
-                
-                # Draw line connecting to semifinal (light gray, dashed appearance)
-                line_start_x = box_x + box_width
-                line_start_y = box_y + box_height // 2
-                line_end_x = sf_start_x
-                
-                # Connect QF1 and QF2 to SF1, QF3 and QF4 to SF2
-                if i == 0:  # QF1 -> top of SF1
-                    line_end_y = bracket_y_start + 25
-                elif i == 1:  # QF2 -> bottom of SF1
-                    line_end_y = bracket_y_start + match_height - 25
-                elif i == 2:  # QF3 -> top of SF2
-                    line_end_y = bracket_y_start + match_spacing * 2 + 25
-                else:  # QF4 -> bottom of SF2
-                    line_end_y = bracket_y_start + match_spacing * 2 + match_height - 25
-                
-                # Draw connecting line
-                draw.line([(line_start_x, line_start_y), (line_start_x + 40, line_start_y)], 
-                         fill='#4ecdc4', width=2)
-                draw.line([(line_start_x + 40, line_start_y), (line_start_x + 40, line_end_y)], 
-                         fill='#4ecdc4', width=2)
-                draw.line([(line_start_x + 40, line_end_y), (line_end_x, line_end_y)], 
-                         fill='#4ecdc4', width=2)
-            
-            # Semifinals section (placeholders)
-            round_label = "Semifinals"
-            draw.text((sf_start_x, bracket_y_start - 50), round_label, fill='#666666', font=round_font)
-            
-            for i in range(2):
-                y_pos = bracket_y_start + i * match_spacing * 2
-                box_height = match_height
-                box_x = sf_start_x
-                box_y = y_pos
-                draw.rectangle([box_x, box_y, box_x + box_width, box_y + box_height], 
-                              fill='#1a1a2e', outline='#666666', width=2)
-                placeholder_text = "Winner"
-                draw.text((box_x + 20, box_y + 50), placeholder_text, fill='#666666', font=team_font)
-                
-                # Draw line to final
-                line_start_x = box_x + box_width
-                line_start_y = box_y + box_height // 2
-                line_end_x = final_start_x
-                final_center_y = bracket_y_start + match_spacing + match_height // 2
-                
-                if i == 0:
-                    line_end_y = final_center_y - 30
+
+        # Match boxes come from the bracket tree: later rounds centred on the matches feeding them
+        boxes = bracket_format.layout(100, 170, width - 200, height - 240, first_round)
+        box_height = boxes[0][0][3] - boxes[0][0][1]
+        row_height = box_height // 2
+        logo_size = max(16, min(60, row_height - 10))
+        team_font = load_bracket_font(max(12, min(28, row_height // 2 - 4)))
+        seed_font = load_bracket_font(max(10, min(20, row_height // 3)))
+
+        for column, round_boxes in enumerate(boxes):
+            round_index = first_round + column
+            entrants = rounds[round_index] if round_index < len(rounds) else None
+            is_final = round_index == bracket_format.rounds - 1
+            draw.text((round_boxes[0][0], 100), bracket_format.round_label(round_index),
+                      fill='#ffffff' if entrants else '#666666', font=round_font)
+
+            for match_index, (box_x0, box_y0, box_x1, box_y1) in enumerate(round_boxes):
+                if entrants and is_final:
+                    outline, outline_width = '#ffd700', 4
+                elif entrants:
+                    outline, outline_width = '#4ecdc4', 3
                 else:
-                    line_end_y = final_center_y + 30
-                
-                draw.line([(line_start_x, line_start_y), (line_start_x + 40, line_start_y)], 
-                         fill='#666666', width=2)
-                draw.line([(line_start_x + 40, line_start_y), (line_start_x + 40, line_end_y)], 
-                         fill='#666666', width=2)
-                draw.line([(line_start_x + 40, line_end_y), (line_end_x, line_end_y)], 
-                         fill='#666666', width=2)
-            
-            # Final section (placeholder)
-            round_label = "Final"
-            draw.text((final_start_x, bracket_y_start - 50), round_label, fill='#666666', font=round_font)
-            y_pos = bracket_y_start + match_spacing
-            box_height = match_height + 20
-            box_width = 400
-            box_x = final_start_x
-            box_y = y_pos
-            draw.rectangle([box_x, box_y, box_x + box_width, box_y + box_height], 
-                          fill='#1a1a2e', outline='#666666', width=2)
-            placeholder_text = "Winner"
-            draw.text((box_x + 20, box_y + 60), placeholder_text, fill='#666666', font=team_font)
-            
-        elif round_stage == 'semifinals' and quarterfinal_winners:
-            # Show semifinal matchups with QF winners
-            sf_start_x = 300
-            final_start_x = 900
-            box_width = 500
-            
-            # Semifinals section
-            round_label = "Semifinals"
-            draw.text((sf_start_x, bracket_y_start - 50), round_label, fill='#ffffff', font=round_font)
-            
-            sf_matchups = [
-                (quarterfinal_winners[0], quarterfinal_winners[1]),
-                (quarterfinal_winners[2], quarterfinal_winners[3])
-            ]
-            
-            # Draw semifinal matchups
-            for i, (team1, team2) in enumerate(sf_matchups):
-                y_pos = bracket_y_start + i * match_spacing * 2
-                
-                box_height = match_height
-                box_x = sf_start_x
-                box_y = y_pos
-                
-                draw.rectangle([box_x, box_y, box_x + box_width, box_y + box_height], 
-                              fill='#1a1a2e', outline='#4ecdc4', width=3)
-                
-                # Team 1
-                team1_y = box_y + 8
-                logo1 = None
-                logo1_path = os.path.join(config.LOGOS_DIRECTORY, team1.get_logo_filename())
-                for logo_file in [logo1_path, logo1_path.replace("'", "'"), logo1_path.replace("'", "'")]:
-                    try:
-                        if os.path.exists(logo_file):
-                            logo1 = Image.open(logo_file).convert('RGBA')
-                            logo1 = logo1.resize((logo_size, logo_size), Image.Resampling.LANCZOS)
-                            break
-                    except:
-                        continue
-                
-                if logo1:
-                    img.paste(logo1, (box_x + 8, team1_y), logo1)
-                
-                team1_text = team1.name
-                if len(team1_text) > 22:
-                    team1_text = team1_text[:19] + "..."
-                draw.text((box_x + 80, team1_y + 20), team1_text, fill='#ffffff', font=team_font)
-                
-                # Team 2
-                team2_y = box_y + 70
-                logo2 = None
-                logo2_path = os.path.join(config.LOGOS_DIRECTORY, team2.get_logo_filename())
-                for logo_file in [logo2_path, logo2_path.replace("'", "'"), logo2_path.replace("'", "'")]:
-                    try:
-                        if os.path.exists(logo_file):
-                            logo2 = Image.open(logo_file).convert('RGBA')
-                            logo2 = logo2.resize((logo_size, logo_size), Image.Resampling.LANCZOS)
-                            break
-                    except:
-                        continue
-                
-                if logo2:
-                    img.paste(logo2, (box_x + 8, team2_y), logo2)
-                
-                team2_text = team2.name
-                if len(team2_text) > 22:
-                    team2_text = team2_text[:19] + "..."
-                draw.text((box_x + 80, team2_y + 20), team2_text, fill='#ffffff', font=team_font)
-                
-                # Draw line connecting to final
-                line_start_x = box_x + box_width
-                line_start_y = box_y + box_height // 2
-                line_end_x = final_start_x
-                final_center_y = bracket_y_start + match_spacing + match_height // 2
-                
-                if i == 0:
-                    line_end_y = final_center_y - 30
+                    outline, outline_width = '#666666', 2
+                draw.rectangle([box_x0, box_y0, box_x1, box_y1], fill='#1a1a2e', outline=outline, width=outline_width)
+
+                if entrants:
+                    for row, team in enumerate(entrants[2 * match_index:2 * match_index + 2]):
+                        row_y = box_y0 + 6 + row * row_height
+                        text_x = box_x0 + logo_size + 20
+                        if team is None:
+                            draw.text((text_x, row_y + row_height // 3), "Bye", fill='#666666', font=team_font)
+                            continue
+
+                        logo = load_bracket_logo(team, logo_size)
+                        if logo:
+                            img.paste(logo, (box_x0 + 8, row_y), logo)
+
+                        if seeds and team.name in seeds:
+                            draw.text((text_x, row_y + 3), f"#{seeds[team.name]}", fill='#888888', font=seed_font)
+                        odds_width = 110 if advancement_odds else 12
+                        team_text = fit_text(draw, team.name, team_font, box_x1 - text_x - odds_width)
+                        draw.text((text_x, row_y + row_height // 3), team_text, fill='#ffffff', font=team_font)
+                        draw_advancement_odds(draw, advancement_odds, team, box_x1 - 12, row_y + 3, seed_font)
                 else:
-                    line_end_y = final_center_y + 30
-                
-                draw.line([(line_start_x, line_start_y), (line_start_x + 40, line_start_y)], 
-                         fill='#4ecdc4', width=2)
-                draw.line([(line_start_x + 40, line_start_y), (line_start_x + 40, line_end_y)], 
-                         fill='#4ecdc4', width=2)
-                draw.line([(line_start_x + 40, line_end_y), (line_end_x, line_end_y)], 
-                         fill='#4ecdc4', width=2)
-            
-            # Final section (placeholder)
-            round_label = "Final"
-            draw.text((final_start_x, bracket_y_start - 50), round_label, fill='#666666', font=round_font)
-            y_pos = bracket_y_start + match_spacing
-            box_height = match_height + 20
-            box_width = 450
-            box_x = final_start_x
-            box_y = y_pos
-            draw.rectangle([box_x, box_y, box_x + box_width, box_y + box_height], 
-                          fill='#1a1a2e', outline='#666666', width=2)
-            placeholder_text = "Winner"
-            draw.text((box_x + 20, box_y + 60), placeholder_text, fill='#666666', font=team_font)
-            
-        elif round_stage == 'finals' and semifinal_winners:
-            # Show final matchup with SF winners
-            final_start_x = 400
-            box_width = 700
-            
-            # Final section
-            round_label = "Final"
-            draw.text((final_start_x, bracket_y_start - 50), round_label, fill='#ffffff', font=round_font)
-            
-            y_pos = bracket_y_start + match_spacing
-            box_height = match_height + 40
-            box_x = final_start_x
-            box_y = y_pos
-            
-            draw.rectangle([box_x, box_y, box_x + box_width, box_y + box_height], 
-                          fill='#1a1a2e', outline='#ffd700', width=4)
-            
-            # Team 1
-            team1 = semifinal_winners[0]
-            team1_y = box_y + 15
-            logo1 = None
-            logo1_path = os.path.join(config.LOGOS_DIRECTORY, team1.get_logo_filename())
-            for logo_file in [logo1_path, logo1_path.replace("'", "'"), logo1_path.replace("'", "'")]:
-                try:
-                    if os.path.exists(logo_file):
-                        logo1 = Image.open(logo_file).convert('RGBA')
-                        logo1 = logo1.resize((logo_size + 20, logo_size + 20), Image.Resampling.LANCZOS)
-                        break
-                except:
-                    continue
-            
-            if logo1:
-                img.paste(logo1, (box_x + 15, team1_y), logo1)
-            
-            team1_text = team1.name
-            if len(team1_text) > 25:
-                team1_text = team1_text[:22] + "..."
-            draw.text((box_x + 100, team1_y + 25), team1_text, fill='#ffffff', font=team_font)
-            
-            # Team 2
-            team2 = semifinal_winners[1]
-            team2_y = box_y + 95
-            logo2 = None
-            logo2_path = os.path.join(config.LOGOS_DIRECTORY, team2.get_logo_filename())
-            for logo_file in [logo2_path, logo2_path.replace("'", "'"), logo2_path.replace("'", "'")]:
-                try:
-                    if os.path.exists(logo_file):
-                        logo2 = Image.open(logo_file).convert('RGBA')
-                        logo2 = logo2.resize((logo_size + 20, logo_size + 20), Image.Resampling.LANCZOS)
-                        break
-                except:
-                    continue
-            
-            if logo2:
-                img.paste(logo2, (box_x + 15, team2_y), logo2)
-            
-            team2_text = team2.name
-            if len(team2_text) > 25:
-                team2_text = team2_text[:22] + "..."
-            draw.text((box_x + 100, team2_y + 25), team2_text, fill='#ffffff', font=team_font)
-        
+                    placeholder_y = (box_y0 + box_y1) // 2 - 14
+                    draw.text((box_x0 + 20, placeholder_y), "Winner", fill='#666666', font=team_font)
+
+                # Connect each match to the top or bottom of the match its winner plays in
+                if column + 1 < len(boxes):
+                    parent_x0, parent_y0, _, parent_y1 = boxes[column + 1][match_index // 2]
+                    line_start_y = (box_y0 + box_y1) // 2
+                    line_end_y = parent_y0 + 25 if match_index % 2 == 0 else parent_y1 - 25
+                    elbow_x = box_x1 + (parent_x0 - box_x1) * 4 // 5
+                    line_color = '#4ecdc4' if entrants else '#666666'
+                    draw.line([(box_x1, line_start_y), (elbow_x, line_start_y)], fill=line_color, width=2)
+                    draw.line([(elbow_x, line_start_y), (elbow_x, line_end_y)], fill=line_color, width=2)
+                    draw.line([(elbow_x, line_end_y), (parent_x0, line_end_y)], fill=line_color, width=2)
+
         # Add decorative border
         border_width = 8
         border_color = '#4ecdc4'
         for i in range(3):
             draw.rectangle([i, i, width-1-i, height-1-i], outline=border_color, width=1)
         draw.rectangle([3, 3, width-4, height-4], outline=border_color, width=border_width)
-        
+
         # Save image
         img.save(filename)
-        print(f"Generated tournament bracket ({round_stage}): {filename}")
+        print(f"Generated tournament bracket ({bracket_format.round_label(first_round).lower()}): {filename}")
         return True
     except Exception as e:
         print(f"Error generating tournament bracket {filename}: {e}")
@@ -1008,3 +826,18 @@ def generate_tournament_bracket(teams, filename, round_stage='quarterfinals', qu
         traceback.print_exc()
         return False
 
+
+def generate_tournament_bracket(teams, filename, round_stage='quarterfinals', quarterfinal_winners=None, semifinal_winners=None,
+                                advancement_odds=None):
+    """Generate the 8-team (bracket.CLASSIC_8) tournament bracket image
+    round_stage: 'quarterfinals', 'semifinals', or 'finals'
+    quarterfinal_winners: List of 4 teams (winners of quarterfinals) - needed for semifinals/finals
+    semifinal_winners: List of 2 teams (winners of semifinals) - needed for finals
+    advancement_odds: Optional bracket_odds.advancement_odds() result; shows each team's title chance
+    """
+    # Sort teams by wins, then by point difference (same as tournament seeding)
+    sorted_teams = bracket.seed_teams(teams)
+    rounds = [bracket.CLASSIC_8.entrants(sorted_teams), quarterfinal_winners, semifinal_winners]
+    first_round = ('quarterfinals', 'semifinals', 'finals').index(round_stage)
+    seeds = {team.name: seed for seed, team in enumerate(sorted_teams, 1)}
+    return generate_bracket_image(bracket.CLASSIC_8, rounds, filename, first_round, seeds, advancement_odds)
@@ -469,6 +469,10 @@ def post_images_hourly(all_images_by_week, teams=None, upcoming_schedule=None,
         driver: (Deprecated - kept for compatibility, not used with Graph API)
     """
     import game_logic
+    import odds_matrix
+    
+    # One odds matrix for the whole schedule; it only recomputes teams whose state changed
+    league_odds = odds_matrix.OddsMatrix(teams) if teams else None
     
     print("\n" + "="*60)
     print("Starting Instagram posting schedule...")
@@ -510,13 +514,7 @@ def post_images_hourly(all_images_by_week, teams=None, upcoming_schedule=None,
         if upcoming_schedule and next_week in upcoming_schedule and teams:
             caption_parts.append("")
             caption_parts.append(f"Odds for Week {next_week}:")
-            matchups = upcoming_schedule[next_week]
-            for team1, team2 in matchups:
-                odds1, odds2 = game_logic.calculate_matchup_odds(team1, team2)
-                # Format odds with + sign for positive, no sign for negative
-                odds1_str = f"+{odds1}" if odds1 > 0 else str(odds1)
-                odds2_str = f"+{odds2}" if odds2 > 0 else str(odds2)
-                caption_parts.append(f"{team1.name} vs {team2.name}: {team1.name} {odds1_str}, {team2.name} {odds2_str}")
+            caption_parts.extend(league_odds.format_week_odds(upcoming_schedule[next_week]))
         
         caption = "\n".join(caption_parts)
         
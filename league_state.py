@@ -0,0 +1,170 @@
+"""Flat-array league state with copy-on-write snapshots for what-if branching"""
+import itertools
+
+import numpy as np
+
+import game_logic
+
+FIELDS = game_logic.TEAM_STATE_FIELDS
+FIELD_COLUMNS = {field: column for column, field in enumerate(FIELDS)}
+RECORD_FIELDS = ('wins', 'losses', 'points_for', 'points_against')
+
+
+class TeamView(game_logic.Team):
+    """
+    A Team whose state lives in one row of a LeagueState.
+
+    Works anywhere a Team does (play_game, standings, odds); reads and writes
+    go straight to the league's array.
+    """
+
+    def __init__(self, league, index):
+        # Team.__init__ is skipped on purpose: the state already lives in the league
+        self._league = league
+        self._index = index
+
+    @property
+    def name(self):
+        return self._league.names[self._index]
+
+
+def _field_property(column):
+    def getter(self):
+        return int(self._league._data[self._index, column])
+
+    def setter(self, value):
+        self._league._writable()[self._index, column] = value
+
+    return property(getter, setter)
+
+
+for _column, _field in enumerate(FIELDS):
+    setattr(TeamView, _field, _field_property(_column))
+
+
+class LeagueState:
+    """
+    State of every team in a league as one flat [n_teams, len(FIELDS)] int array.
+
+    snapshot() and branch() are O(1): the array is shared and only copied
+    (O(teams)) by whichever side writes to it first.
+    """
+
+    def __init__(self, names, data=None):
+        self.names = list(names)
+        if data is None:
+            data = np.zeros((len(self.names), len(FIELDS)), dtype=np.int32)
+            self._owned = True
+        else:
+            self._owned = False
+        self._data = data
+        self._views = None
+
+    @classmethod
+    def from_teams(cls, teams):
+        """Capture the current state of a list of Team objects"""
+        league = cls([team.name for team in teams])
+        league._data[:] = [[getattr(team, field) for field in FIELDS] for team in teams]
+        return league
+
+    def _writable(self):
+        """The state array, copied first if it is shared with a snapshot or branch"""
+        if not self._owned:
+            self._data = self._data.copy()
+            self._owned = True
+        return self._data
+
+    def snapshot(self):
+        """Read-only snapshot of the current state, for restore()"""
+        self._owned = False
+        snapshot = self._data.view()
+        snapshot.flags.writeable = False
+        return snapshot
+
+    def restore(self, snapshot):
+        """Return to a state captured by snapshot()"""
+        self._data = snapshot
+        self._owned = False
+
+    def branch(self):
+        """Independent LeagueState starting from the current state"""
+        return LeagueState(self.names, self.snapshot())
+
+    def team(self, index):
+        """TeamView for the team at index"""
+        return self.teams()[index]
+
+    def teams(self):
+        """TeamViews for every team, in league order"""
+        if self._views is None:
+            self._views = [TeamView(self, i) for i in range(len(self.names))]
+        return self._views
+
+    def index(self, name):
+        """Index of the team with the given name"""
+        return self.names.index(name)
+
+    def to_teams(self):
+        """Independent game_logic.Team objects holding the current state"""
+        teams = []
+        for name, row in zip(self.names, self._data.tolist()):
+            team = game_logic.Team(name)
+            for field, value in zip(FIELDS, row):
+                setattr(team, field, value)
+            teams.append(team)
+        return teams
+
+    def field(self, field):
+        """Read-only array of one field for every team"""
+        values = self._data[:, FIELD_COLUMNS[field]]
+        values.flags.writeable = False
+        return values
+
+    def reset_records(self):
+        """Zero wins, losses and points while keeping advantages"""
+        data = self._writable()
+        for field in RECORD_FIELDS:
+            data[:, FIELD_COLUMNS[field]] = 0
+
+    def play_game(self, team1_index, team2_index, seed=None, params=None):
+        """play_game between two teams of this league; returns play_game's result tuple"""
+        return game_logic.play_game(self.team(team1_index), self.team(team2_index), seed=seed, params=params)
+
+    def force_result(self, winner_index, loser_index, winner_points=0, loser_points=0, params=None):
+        """
+        Record a game outcome without simulating it: wins/losses, points and the
+        +/-1 overall advantage change within params.advantage_cap (run/throw/kick
+        advantages are left as is, since they depend on how the game was scored).
+        """
+        params = params or game_logic.DEFAULT_PARAMS
+        data = self._writable()
+        columns = FIELD_COLUMNS
+        data[winner_index, columns['wins']] += 1
+        data[loser_index, columns['losses']] += 1
+        data[winner_index, columns['points_for']] += winner_points
+        data[winner_index, columns['points_against']] += loser_points
+        data[loser_index, columns['points_for']] += loser_points
+        data[loser_index, columns['points_against']] += winner_points
+        overall = columns['overall_advantage']
+        data[winner_index, overall] = min(params.advantage_cap, data[winner_index, overall] + 1)
+        data[loser_index, overall] = max(-params.advantage_cap, data[loser_index, overall] - 1)
+
+    def outcome_branches(self, matches, params=None):
+        """
+        Branch once for every combination of winners of the given matches.
+
+        Args:
+            matches: List of (team1_index, team2_index) pairs, e.g. one week's games
+            params: game_logic.ModelParams for force_result (default: DEFAULT_PARAMS)
+
+        Yields:
+            (winner_indices, branch) with results applied via force_result
+        """
+        for outcome in itertools.product((0, 1), repeat=len(matches)):
+            branch = self.branch()
+            winners = []
+            for (team1_index, team2_index), team2_wins in zip(matches, outcome):
+                winner, loser = (team2_index, team1_index) if team2_wins else (team1_index, team2_index)
+                branch.force_result(winner, loser, params=params)
+                winners.append(winner)
+            yield tuple(winners), branch
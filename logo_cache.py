@@ -0,0 +1,232 @@
+"""Shared, size-bounded LRU cache of decoded team logos and their derived variants"""
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+
+import config
+
+# Default budget for decoded images, in bytes of pixel data
+LOGO_CACHE_BYTES = 192 * 1024 * 1024
+
+
+def image_bytes(image):
+    """Approximate memory held by a PIL image's pixel data"""
+    return image.width * image.height * len(image.getbands())
+
+
+class LogoCache:
+    """
+    Least-recently-used cache of images bounded by total pixel bytes.
+    Images found in an installed logo pack are served from the pack instead.
+
+    Values are shared between callers, so images taken from the cache must
+    not be modified in place (paste them, or copy() first). An image larger
+    than the whole budget is returned but not stored.
+
+    Args:
+        max_bytes: Pixel bytes kept before the least recently used entries are evicted
+    """
+
+    def __init__(self, max_bytes=LOGO_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, build):
+        """
+        Cached value for key, calling build() to make it on a miss.
+
+        Returns:
+            The image (None results are returned but not cached)
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        image = build()
+        if image is None:
+            return None
+
+        size = image_bytes(image)
+        with self._lock:
+            if key in self._entries or size > self.max_bytes:
+                return image
+            self._entries[key] = image
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= image_bytes(evicted)
+                self.evictions += 1
+        return image
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        """
+        Cache metrics.
+
+        Returns:
+            Dictionary with hits, misses, evictions, hit_rate, entries, bytes and max_bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes
+            }
+
+
+# One cache for every renderer in the process
+shared_cache = LogoCache(getattr(config, 'LOGO_CACHE_BYTES', LOGO_CACHE_BYTES))
+
+# logo_pack.LogoPack consulted before anything is decoded (see use_pack)
+_pack = None
+
+
+def use_pack(pack):
+    """Serve logos and variants the pack holds straight from it (None to stop)"""
+    global _pack
+    _pack = pack
+
+
+def _from_pack(source, kind, size, opacity):
+    if _pack is None:
+        return None
+    return _pack.image(source[0], source[1], kind, size, opacity)
+
+
+def pack_dominant_color(path):
+    """Dominant color the installed pack holds for a logo file (see LogoPack.dominant_color), or None"""
+    if _pack is None:
+        return None
+    try:
+        return _pack.dominant_color(path, os.stat(path).st_mtime_ns)
+    except OSError:
+        return None
+
+
+def logo_path(team, logos_directory=None):
+    """Path of the team's logo file, or None if it does not exist"""
+    if logos_directory is None:
+        logos_directory = config.LOGOS_DIRECTORY
+    path = os.path.join(logos_directory, team.get_logo_filename())
+    for logo_file in [path, path.replace("'", "'"), path.replace("'", "'")]:
+        if os.path.exists(logo_file):
+            return logo_file
+    return None
+
+
+def _source_key(team, logos_directory):
+    """(path, modification time) of the team's logo so an edited file is decoded again"""
+    path = logo_path(team, logos_directory)
+    if path is None:
+        return None
+    try:
+        return (path, os.stat(path).st_mtime_ns)
+    except OSError:
+        return None
+
+
+def _decode(path):
+    try:
+        return Image.open(path).convert('RGBA')
+    except Exception:
+        return None
+
+
+def load_logo(team, logos_directory=None, cache=None):
+    """
+    Team logo decoded to RGBA, or None if it cannot be loaded.
+
+    The image is shared through the cache: do not modify it in place.
+    """
+    cache = cache or shared_cache
+    source = _source_key(team, logos_directory)
+    if source is None:
+        return None
+    packed = _from_pack(source, 'original', None, None)
+    if packed is not None:
+        return packed
+    return cache.get((source, 'original', None, None), lambda: _decode(source[0]))
+
+
+def logo_variant(team, kind, size, opacity, build, logos_directory=None, cache=None):
+    """
+    Derived logo image, built once per (logo file, kind, size, opacity).
+
+    Args:
+        team: Team whose logo to use
+        kind: Name of the variant, e.g. 'resized' or 'cover'
+        size: Size the variant is built for (int or (width, height))
+        opacity: Opacity the variant is built for (None if not translucent)
+        build: Function (original RGBA logo, size, opacity) -> image
+
+    Returns:
+        The cached image, or None if the logo cannot be loaded
+    """
+    cache = cache or shared_cache
+    source = _source_key(team, logos_directory)
+    if source is None:
+        return None
+    packed = _from_pack(source, kind, size, opacity)
+    if packed is not None:
+        return packed
+
+    def build_variant():
+        original = load_logo(team, logos_directory, cache)
+        return None if original is None else build(original, size, opacity)
+
+    return cache.get((source, kind, size, opacity), build_variant)
+
+
+def resize_logo(logo, size, opacity=None):
+    """Logo LANCZOS-resized to size x size, with alpha scaled by opacity if given"""
+    resized = logo.resize((size, size), Image.Resampling.LANCZOS)
+    if opacity is not None:
+        resized.putalpha(resized.split()[3].point(lambda p: int(p * opacity)))
+    return resized
+
+
+def resized_logo(team, size, opacity=None, logos_directory=None, cache=None):
+    """Team logo resized to size x size (translucent if opacity is given), or None"""
+    return logo_variant(team, 'resized', size, opacity, resize_logo, logos_directory, cache)
+
+
+def shadow(size, offset=5, alpha=150):
+    """
+    Drop shadow for a size x size logo: a (size + 2 * offset) square with a
+    black block of the given alpha offset down and right. Shared by all teams.
+    """
+    def build():
+        shadow_img = Image.new('RGBA', (size + 2 * offset, size + 2 * offset), (0, 0, 0, 0))
+        shadow_mask = Image.new('RGBA', (size, size), (0, 0, 0, alpha))
+        shadow_img.paste(shadow_mask, (offset, offset), shadow_mask)
+        return shadow_img
+
+    return shared_cache.get((None, 'shadow', (size, offset), alpha), build)
+
+
+def cache_info():
+    """Metrics of the shared cache (see LogoCache.info), plus 'pack_hits' served from the logo pack"""
+    info = shared_cache.info()
+    info['pack_hits'] = _pack.hits if _pack is not None else 0
+    return info
@@ -0,0 +1,168 @@
+"""Team theme colors from logos, cached on disk by logo file hash so each logo is analyzed once
+
+Dominant colors at the logo pack's sample size come from the installed pack
+(logo_pack), which stores them with the pixels; the JSON cache only holds
+what the pack does not.
+"""
+import json
+import os
+
+from PIL import Image
+
+import config
+import image_generator
+import logo_cache
+import logo_pack
+
+COLOR_CACHE_FILENAME = 'logo_colors.json'
+
+
+def default_cache_path(logos_directory=None):
+    """config.LOGO_COLOR_CACHE, or logo_colors.json inside the logos directory"""
+    if logos_directory is None:
+        logos_directory = config.LOGOS_DIRECTORY
+    return getattr(config, 'LOGO_COLOR_CACHE', None) or os.path.join(logos_directory, COLOR_CACHE_FILENAME)
+
+
+def method_key(method, **options):
+    """Cache key of an analysis and its options, e.g. 'dominant/sample_size=50'"""
+    return "/".join([method] + [f"{name}={options[name]}" for name in sorted(options)])
+
+
+class ColorCache:
+    """
+    JSON file mapping logo content hashes to analysis results.
+
+    Results are keyed by file hash, so renaming a logo keeps its entry and
+    editing it misses. Files are re-hashed only when their modification
+    time changes. Nothing is written until save(), and only if something
+    was added.
+
+    Args:
+        path: Cache file (default: default_cache_path())
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_cache_path()
+        self.entries = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+        self._hashes = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def file_hash(self, path):
+        """Content hash of a file, remembered per (path, modification time)"""
+        key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+        if key not in self._hashes:
+            self._hashes[key] = logo_pack.file_hash(path)
+        return self._hashes[key]
+
+    def get(self, path, key, compute):
+        """
+        Result for a logo file, calling compute() on a miss.
+
+        Args:
+            path: Logo file
+            key: method_key of the analysis
+            compute: Function returning a JSON-serializable result
+        """
+        entry = self.entries.setdefault(self.file_hash(path), {})
+        if key in entry:
+            self.hits += 1
+            return entry[key]
+        self.misses += 1
+        entry[key] = compute()
+        self._dirty = True
+        return entry[key]
+
+    def save(self):
+        """Write the cache if anything was added (written beside it and renamed)"""
+        if not self._dirty:
+            return
+        temporary = self.path + '.tmp'
+        try:
+            with open(temporary, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, sort_keys=True)
+            os.replace(temporary, self.path)
+            self._dirty = False
+        except OSError as e:
+            print(f"Warning: Could not save logo color cache {self.path}: {e}")
+
+
+def dominant_color(path, color_cache, sample_size=50, load=None):
+    """
+    Dominant color of a logo file (image_generator.extract_dominant_color):
+    from the installed logo pack when it holds it, otherwise from the cache.
+
+    Args:
+        path: Logo file
+        color_cache: ColorCache used when the pack cannot answer
+        load: Function returning the decoded RGBA logo (default: decode path)
+    """
+    if sample_size == logo_pack.DOMINANT_COLOR_SAMPLE_SIZE:
+        packed = logo_cache.pack_dominant_color(path)
+        if packed is not None:
+            return packed
+
+    def compute():
+        logo = load() if load is not None else Image.open(path).convert('RGBA')
+        return list(image_generator.extract_dominant_color(logo, sample_size))
+
+    return tuple(color_cache.get(path, method_key('dominant', sample_size=sample_size), compute))
+
+
+def team_color(team, color_cache, sample_size=50, logos_directory=None):
+    """Dominant logo color of a team (see dominant_color), or the default color if the team has no logo"""
+    path = logo_cache.logo_path(team, logos_directory)
+    if path is None:
+        return image_generator.DEFAULT_THEME_COLOR
+    return dominant_color(path, color_cache, sample_size, lambda: logo_cache.load_logo(team, logos_directory))
+
+
+def team_palette(team, color_cache, colors=3, sample_size=100, logos_directory=None):
+    """k-means palette of a team's logo (image_generator.extract_palette): list of ((r, g, b), share)"""
+    path = logo_cache.logo_path(team, logos_directory)
+    if path is None:
+        return [(image_generator.DEFAULT_THEME_COLOR, 1.0)]
+
+    def compute():
+        logo = logo_cache.load_logo(team, logos_directory)
+        return [[list(color), share] for color, share in image_generator.extract_palette(logo, colors, sample_size)]
+
+    key = method_key('palette', colors=colors, sample_size=sample_size)
+    return [(tuple(color), share) for color, share in color_cache.get(path, key, compute)]
+
+
+def league_colors(teams, sample_size=50, logos_directory=None, cache_path=None):
+    """
+    Theme colors of a whole league, computed once per logo across runs.
+
+    Returns:
+        Dictionary mapping team names to (r, g, b)
+    """
+    color_cache = ColorCache(cache_path or default_cache_path(logos_directory))
+    colors = {team.name: team_color(team, color_cache, sample_size, logos_directory) for team in teams}
+    color_cache.save()
+    return colors
+
+
+def main():
+    color_cache = ColorCache()
+    # Use the pack's colors if it is current, without building one
+    logo_pack.load_pack(rebuild=False)
+    names = logo_pack.logo_files(config.LOGOS_DIRECTORY)
+    for name in names:
+        color = dominant_color(os.path.join(config.LOGOS_DIRECTORY, name), color_cache)
+        print(f"{name}: #{color[0]:02x}{color[1]:02x}{color[2]:02x}")
+    color_cache.save()
+    packed = len(names) - color_cache.hits - color_cache.misses
+    print(f"{len(names)} logos: {packed} from the logo pack, {color_cache.hits} cached, {color_cache.misses} computed")
+
+
+if __name__ == "__main__":
+    main()
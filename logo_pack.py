@@ -0,0 +1,312 @@
+"""Precompiled logo pack: decoded and resized logos stored as raw pixels, memory-mapped by renderers
+
+Build once with `python logo_pack.py` (or let load_pack() do it). The pack
+holds every logo in config.LOGOS_DIRECTORY as raw RGBA at the sizes the
+renderers use, plus its dominant color and a SHA-256 of the source file.
+Renderers map the file and wrap the pixels as read-only Pillow images
+without decoding or copying; pages are shared between worker processes by
+the OS. The pack is rebuilt only when a source logo is added, removed or
+changed, and unchanged logos are copied over from the old pack.
+
+File layout: magic, version, header offset and header length ('<8sIQI'),
+the pixel blocks, each starting on a PACK_ALIGNMENT boundary, then the JSON
+header (written last, so blocks stream straight to disk).
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+from PIL import Image
+
+import config
+import image_generator
+import logo_cache
+
+PACK_MAGIC = b'CASCLOGO'
+PACK_VERSION = 1
+PACK_PREFIX = struct.Struct('<8sIQI')
+PACK_ALIGNMENT = 64
+PACK_FILENAME = 'logos.pack'
+
+# Square sizes prebuilt for every logo: bracket rows, loser corner, team panels
+PACK_SIZES = (60, 200, 300)
+# Game image canvas covered by the translucent winner's logo
+COVER_SIZE = (1600, 1600)
+COVER_OPACITY = 0.7
+# sample_size of the stored dominant colors (image_generator.extract_dominant_color)
+DOMINANT_COLOR_SAMPLE_SIZE = 50
+
+LOGO_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.bmp')
+
+
+def pack_variants():
+    """(kind, size, opacity) of every image stored per logo, as logo_cache names them"""
+    return ([('original', None, None)] + [('resized', size, None) for size in PACK_SIZES] +
+            [('cover', COVER_SIZE, COVER_OPACITY)])
+
+
+def _variant_key(kind, size, opacity):
+    if isinstance(size, (tuple, list)):
+        size = "x".join(str(value) for value in size)
+    return f"{kind}/{size}/{opacity}"
+
+
+def _build_variant(logo, kind, size, opacity):
+    if kind == 'original':
+        return logo
+    if kind == 'cover':
+        return image_generator.translucent_cover_overlay(logo, size, opacity)
+    return logo_cache.resize_logo(logo, size, opacity)
+
+
+def default_pack_path(logos_directory=None):
+    """config.LOGO_PACK_PATH, or logos.pack inside the logos directory"""
+    if logos_directory is None:
+        logos_directory = config.LOGOS_DIRECTORY
+    return getattr(config, 'LOGO_PACK_PATH', None) or os.path.join(logos_directory, PACK_FILENAME)
+
+
+def logo_files(logos_directory):
+    """Image file names in the logos directory, sorted"""
+    return sorted(name for name in os.listdir(logos_directory)
+                  if name.lower().endswith(LOGO_EXTENSIONS) and os.path.isfile(os.path.join(logos_directory, name)))
+
+
+def file_hash(path):
+    """SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class LogoPack:
+    """
+    Read-only view of a pack file.
+
+    Images returned by image() are backed by the memory map and read-only;
+    keep the pack open while they are in use.
+
+    Args:
+        path: Pack file written by build_pack
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_offset, header_length = PACK_PREFIX.unpack_from(self._map, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {PACK_VERSION} logo pack")
+        header = json.loads(self._map[header_offset:header_offset + header_length].decode('utf-8'))
+        self.directory = header['directory']
+        self.variants = [tuple(tuple(value) if isinstance(value, list) else value for value in variant)
+                         for variant in header['variants']]
+        self.logos = header['logos']
+        # File name -> mtime_ns the entry is known to match (stat agreed, or the hash did)
+        self._current = {name: entry['mtime_ns'] for name, entry in self.logos.items()}
+        self.hits = 0
+
+    def close(self):
+        try:
+            self._map.close()
+        except BufferError:
+            # Images still wrap the map; it is unmapped once they are gone
+            pass
+
+    def stale_logos(self):
+        """
+        Logos whose pack entry no longer matches the source files: added,
+        removed or changed. A file whose modification time changed is
+        re-hashed and only counts as changed if its contents differ.
+        """
+        if not os.path.isdir(self.directory):
+            return sorted(self.logos)
+        names = logo_files(self.directory)
+        stale = sorted(set(self.logos) - set(names))
+        for name in names:
+            entry = self.logos.get(name)
+            if entry is None:
+                stale.append(name)
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            if stat.st_mtime_ns == entry['mtime_ns'] and stat.st_size == entry['bytes']:
+                continue
+            if file_hash(os.path.join(self.directory, name)) == entry['hash']:
+                self._current[name] = stat.st_mtime_ns
+            else:
+                stale.append(name)
+        return stale
+
+    def raw(self, name, kind, size, opacity):
+        """(memoryview of the pixels, width, height) of a stored image, or None"""
+        entry = self.logos.get(name)
+        block = entry and entry['images'].get(_variant_key(kind, size, opacity))
+        if not block or self._map.closed:
+            return None
+        offset, width, height = block
+        return memoryview(self._map)[offset:offset + width * height * 4], width, height
+
+    def image(self, path, mtime_ns, kind, size, opacity):
+        """
+        Stored image for a logo file, or None if the pack does not have it or
+        the file changed since the pack was checked.
+
+        Args:
+            path: Logo file path (must be in the pack's directory)
+            mtime_ns: Its current modification time
+            kind, size, opacity: Variant, as in logo_cache.logo_variant
+        """
+        directory, name = os.path.split(path)
+        if os.path.abspath(directory) != self.directory or self._current.get(name) != mtime_ns:
+            return None
+        raw = self.raw(name, kind, size, opacity)
+        if raw is None:
+            return None
+        pixels, width, height = raw
+        self.hits += 1
+        # RGBA raw buffers are mapped, not copied
+        return Image.frombuffer('RGBA', (width, height), pixels, 'raw', 'RGBA', 0, 1)
+
+    def dominant_color(self, path, mtime_ns):
+        """
+        Stored dominant color of a logo file (sampled with
+        DOMINANT_COLOR_SAMPLE_SIZE), or None if the pack does not have it or
+        the file changed since the pack was checked. Arguments as for image().
+        """
+        directory, name = os.path.split(path)
+        if os.path.abspath(directory) != self.directory or self._current.get(name) != mtime_ns:
+            return None
+        return tuple(self.logos[name]['dominant_color'])
+
+
+def build_pack(logos_directory=None, path=None, previous=None):
+    """
+    Decode, normalize and write every logo to a pack file.
+
+    Args:
+        logos_directory: Directory of source logos (default: config.LOGOS_DIRECTORY)
+        path: Pack file (default: default_pack_path())
+        previous: Open LogoPack whose blocks are reused for logos with the same hash
+
+    Returns:
+        Dictionary with 'logos' (number packed), 'built' and 'reused' file names
+    """
+    if logos_directory is None:
+        logos_directory = config.LOGOS_DIRECTORY
+    path = path or default_pack_path(logos_directory)
+    directory = os.path.abspath(logos_directory)
+    variants = pack_variants()
+    reusable = previous is not None and previous.variants == variants
+
+    logos = {}
+    built, reused = [], []
+    # Written beside the target and renamed, so a reader never maps a partial file
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(bytes(PACK_ALIGNMENT))
+        for name in logo_files(directory):
+            source = os.path.join(directory, name)
+            stat = os.stat(source)
+            digest = file_hash(source)
+            old = previous.logos.get(name) if reusable else None
+            if old is not None and old['hash'] == digest:
+                images = (previous.raw(name, *variant) for variant in variants)
+                dominant_color = old['dominant_color']
+                reused.append(name)
+            else:
+                try:
+                    logo = Image.open(source).convert('RGBA')
+                except Exception:
+                    continue
+                images = ((image.tobytes(), image.width, image.height)
+                          for image in (_build_variant(logo, *variant) for variant in variants))
+                dominant_color = list(image_generator.extract_dominant_color(logo, DOMINANT_COLOR_SAMPLE_SIZE))
+                built.append(name)
+
+            entry_images = {}
+            for variant, (pixels, width, height) in zip(variants, images):
+                f.seek(-(-f.tell() // PACK_ALIGNMENT) * PACK_ALIGNMENT)
+                entry_images[_variant_key(*variant)] = [f.tell(), width, height]
+                f.write(pixels)
+                if isinstance(pixels, memoryview):
+                    pixels.release()
+            logos[name] = {'hash': digest, 'mtime_ns': stat.st_mtime_ns, 'bytes': stat.st_size,
+                           'dominant_color': dominant_color, 'images': entry_images}
+
+        header = json.dumps({'directory': directory, 'variants': variants, 'logos': logos}).encode('utf-8')
+        header_offset = f.tell()
+        f.write(header)
+        f.seek(0)
+        f.write(PACK_PREFIX.pack(PACK_MAGIC, PACK_VERSION, header_offset, len(header)))
+
+    if previous is not None and os.path.abspath(previous.path) == os.path.abspath(path):
+        previous.close()
+    os.replace(temporary, path)
+    return {'logos': len(logos), 'built': built, 'reused': reused}
+
+
+def load_pack(logos_directory=None, path=None, rebuild=True, install=True):
+    """
+    Open the logo pack, rebuilding it first if it is missing or stale.
+
+    Args:
+        rebuild: Rebuild a missing or stale pack (otherwise return None for it)
+        install: Serve logo_cache lookups from the pack
+
+    Returns:
+        LogoPack, or None if there is no usable pack
+    """
+    if logos_directory is None:
+        logos_directory = config.LOGOS_DIRECTORY
+    if not os.path.isdir(logos_directory):
+        return None
+    path = path or default_pack_path(logos_directory)
+
+    pack = None
+    try:
+        pack = LogoPack(path)
+    except (OSError, ValueError):
+        pack = None
+    if pack is not None and pack.directory == os.path.abspath(logos_directory) and \
+            pack.variants == pack_variants() and not pack.stale_logos():
+        if install:
+            logo_cache.use_pack(pack)
+        return pack
+
+    if not rebuild:
+        if pack is not None:
+            pack.close()
+        return None
+    try:
+        build_pack(logos_directory, path, previous=pack)
+    except OSError as e:
+        print(f"Warning: Could not write logo pack {path}: {e}")
+        return None
+    finally:
+        if pack is not None:
+            pack.close()
+    pack = LogoPack(path)
+    if install:
+        logo_cache.use_pack(pack)
+    return pack
+
+
+def main():
+    path = default_pack_path()
+    previous = None
+    try:
+        previous = LogoPack(path)
+    except (OSError, ValueError):
+        pass
+    result = build_pack(path=path, previous=previous)
+    print(f"Packed {result['logos']} logos into {path} "
+          f"({len(result['built'])} built, {len(result['reused'])} unchanged)")
+
+
+if __name__ == "__main__":
+    main()
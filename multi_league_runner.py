@@ -0,0 +1,169 @@
+"""Run thousands of independent leagues across processes for balance testing"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import batch_simulation
+import game_logic
+
+# Columns of the per-league outcome buffer
+CHAMPION = 0
+REGULAR_SEASON_LEADER = 1
+GAMES = 2
+UPSETS = 3
+BLOWOUTS = 4
+SCORE_HISTOGRAM = 5
+SCORE_BINS = 64  # team scores 0..62, last bin holds 63 and above
+OUTCOME_COLUMNS = SCORE_HISTOGRAM + SCORE_BINS
+
+# Winning margin (points) counted as a blowout
+BLOWOUT_MARGIN = 15
+
+
+class LeagueSpec:
+    """
+    A batch of identical leagues to simulate.
+
+    Args:
+        n_teams: Teams per league
+        repetitions: Round robins played before the tournament
+        count: Number of independent leagues
+        max_rounds: Optional cap on weeks per round robin (like config.ROUNDS_PER_ROUND_ROBIN)
+        params: game_logic.ModelParams to play with (default: DEFAULT_PARAMS)
+    """
+
+    def __init__(self, n_teams, repetitions=1, count=1000, max_rounds=None, params=None):
+        self.n_teams = n_teams
+        self.repetitions = repetitions
+        self.count = count
+        self.max_rounds = max_rounds
+        self.params = params or game_logic.DEFAULT_PARAMS
+
+    def __repr__(self):
+        text = (f"LeagueSpec(n_teams={self.n_teams}, repetitions={self.repetitions}, "
+                f"count={self.count}, max_rounds={self.max_rounds}")
+        if self.params != game_logic.DEFAULT_PARAMS:
+            text += f", params={self.params}"
+        return text + ")"
+
+
+def _run_shard(buffer_name, total_rows, spec, start_row, n_leagues, seed):
+    """
+    Simulate n_leagues leagues of one spec and write their outcomes into rows
+    [start_row, start_row + n_leagues) of the shared outcome buffer.
+    """
+    rng = np.random.default_rng(seed)
+    league = batch_simulation.ReplicaLeague([f"Team {i + 1}" for i in range(spec.n_teams)], n_leagues, spec.params)
+
+    buffer = shared_memory.SharedMemory(name=buffer_name)
+    try:
+        outcomes = np.ndarray((total_rows, OUTCOME_COLUMNS), dtype=np.int64, buffer=buffer.buf)
+        rows = outcomes[start_row:start_row + n_leagues]
+
+        histogram = np.zeros((n_leagues, SCORE_BINS), dtype=np.int64)
+        league_rows = np.arange(n_leagues)[:, None]
+        for _ in range(spec.repetitions):
+            for matches in game_logic.iter_round_robin_weeks(range(spec.n_teams), max_rounds=spec.max_rounds):
+                result = league.play_week(matches, rng)
+                for scores in (result['team1_score'], result['team2_score']):
+                    np.add.at(histogram, (league_rows, np.minimum(scores, SCORE_BINS - 1)), 1)
+                rows[:, GAMES] += len(matches)
+                rows[:, BLOWOUTS] += (np.abs(result['team1_score'] - result['team2_score']) >= BLOWOUT_MARGIN).sum(axis=1)
+        rows[:, UPSETS] = league.upsets
+        rows[:, SCORE_HISTOGRAM:] = histogram
+        rows[:, REGULAR_SEASON_LEADER] = league.standings_order()[:, 0]
+
+        if spec.n_teams >= 8:
+            rows[:, CHAMPION] = league.play_tournament(rng)['champion']
+        else:
+            rows[:, CHAMPION] = rows[:, REGULAR_SEASON_LEADER]
+        del outcomes, rows
+    finally:
+        buffer.close()
+    return n_leagues
+
+
+def summarize(spec, outcomes):
+    """Aggregate the outcome rows of one spec into league-level statistics"""
+    games = outcomes[:, GAMES].sum()
+    histogram = outcomes[:, SCORE_HISTOGRAM:].sum(axis=0)
+    champion_frequencies = np.bincount(outcomes[:, CHAMPION], minlength=spec.n_teams) / len(outcomes)
+    return {
+        'spec': spec,
+        'leagues': len(outcomes),
+        'champion_frequencies': champion_frequencies,
+        'champion_entropy': float(-sum(p * math.log2(p) for p in champion_frequencies if p > 0)),
+        'leader_frequencies': np.bincount(outcomes[:, REGULAR_SEASON_LEADER], minlength=spec.n_teams) / len(outcomes),
+        'leader_won_title_rate': float(np.mean(outcomes[:, CHAMPION] == outcomes[:, REGULAR_SEASON_LEADER])),
+        'upset_rate': float(outcomes[:, UPSETS].sum() / games) if games else 0.0,
+        'blowout_rate': float(outcomes[:, BLOWOUTS].sum() / games) if games else 0.0,
+        'score_distribution': histogram / histogram.sum() if histogram.sum() else histogram.astype(float),
+        'mean_score': float(histogram @ np.arange(SCORE_BINS) / histogram.sum()) if histogram.sum() else 0.0
+    }
+
+
+def run_leagues(specs, max_workers=None, leagues_per_shard=1000, seed=None):
+    """
+    Simulate every league described by specs on a process pool.
+
+    Workers write per-league outcomes straight into one shared-memory buffer,
+    so only shard descriptions cross process boundaries. Shards have fixed
+    sizes and spawned seeds, so results do not depend on the worker count.
+
+    Args:
+        specs: List of LeagueSpec
+        max_workers: Worker processes (default: CPU count)
+        leagues_per_shard: Leagues simulated together in one vectorized shard
+        seed: Root seed (None for fresh entropy)
+
+    Returns:
+        List with one summarize() dictionary per spec, in order
+    """
+    shards = []
+    start_row = 0
+    for spec in specs:
+        for offset in range(0, spec.count, leagues_per_shard):
+            shards.append((spec, start_row + offset, min(leagues_per_shard, spec.count - offset)))
+        start_row += spec.count
+    total_rows = start_row
+    shard_seeds = np.random.SeedSequence(seed).spawn(len(shards))
+
+    buffer = shared_memory.SharedMemory(create=True, size=max(1, total_rows * OUTCOME_COLUMNS * 8))
+    try:
+        outcomes = np.ndarray((total_rows, OUTCOME_COLUMNS), dtype=np.int64, buffer=buffer.buf)
+        outcomes[:] = 0
+        workers = max_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_run_shard, buffer.name, total_rows, spec, row, n_leagues, shard_seed)
+                       for (spec, row, n_leagues), shard_seed in zip(shards, shard_seeds)]
+            for future in futures:
+                future.result()
+
+        summaries = []
+        start_row = 0
+        for spec in specs:
+            summaries.append(summarize(spec, outcomes[start_row:start_row + spec.count].copy()))
+            start_row += spec.count
+        del outcomes
+    finally:
+        buffer.close()
+        buffer.unlink()
+    return summaries
+
+
+def main():
+    specs = [LeagueSpec(8, 1, 10000), LeagueSpec(8, 3, 10000), LeagueSpec(16, 1, 5000)]
+    for summary in run_leagues(specs, seed=0):
+        print(f"\n{summary['spec']}")
+        print(f"  Upset rate: {summary['upset_rate']:.3f}")
+        print(f"  Mean team score: {summary['mean_score']:.2f}")
+        print(f"  Regular season leader won title: {summary['leader_won_title_rate']:.3f}")
+        print(f"  Blowout rate: {summary['blowout_rate']:.3f}")
+        print(f"  Champion entropy: {summary['champion_entropy']:.3f} bits")
+
+
+if __name__ == "__main__":
+    main()
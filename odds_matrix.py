@@ -0,0 +1,143 @@
+"""League-wide matchup odds for every pair of teams, refreshed only where team state changed"""
+import numpy as np
+
+import batch_simulation
+import game_logic
+import ratings
+
+
+def american_odds(probabilities):
+    """Vectorized game_logic.probability_to_american_odds (integer array, rounded to 5)"""
+    p = np.asarray(probabilities, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        favorite = np.round(-100 * p / (1 - p) / 5) * 5
+        underdog = np.round(100 * (1 - p) / p / 5) * 5
+    odds = np.where(p > 0.5, favorite, underdog)
+    odds = np.where(p <= 0, 1000, np.where(p >= 1, -1000, odds))
+    return odds.astype(np.int64)
+
+
+def format_odds(odds):
+    """American odds as caption text, e.g. +150 or -200"""
+    return f"+{odds}" if odds > 0 else str(odds)
+
+
+class OddsMatrix:
+    """
+    Win probabilities and American odds for every pairing in a league.
+
+    Entry (i, j) of probabilities is calculate_win_probability(teams[i], teams[j], params);
+    odds and opponent_odds hold the calculate_matchup_odds pair for that
+    matchup (teams[i] as team1, then teams[j]). Each team's state signature
+    (the fields win_probability_key reads) is remembered, and refresh()
+    recomputes only the rows and columns of teams whose signature changed,
+    in one vectorized pass.
+
+    Args:
+        teams: List of Team objects; the matrix follows their state as games are played
+        params: game_logic.ModelParams the odds are priced with (default: DEFAULT_PARAMS)
+    """
+
+    def __init__(self, teams, params=None):
+        self.teams = list(teams)
+        self.params = params or game_logic.DEFAULT_PARAMS
+        self._index = {team.name: i for i, team in enumerate(self.teams)}
+        n = len(self.teams)
+        self.probabilities = np.full((n, n), 0.5)
+        self.odds = american_odds(self.probabilities)
+        self.opponent_odds = self.odds.copy()
+        self._signatures = [None] * n
+
+    @staticmethod
+    def _signature(team):
+        return (team.overall_advantage, game_logic.best_stat_index(team), team.points_for, team.points_against)
+
+    def refresh(self):
+        """
+        Bring the matrix up to date with the teams' current state.
+
+        Returns:
+            Indices of the teams whose rows and columns were recomputed
+        """
+        signatures = [self._signature(team) for team in self.teams]
+        dirty = [i for i, signature in enumerate(signatures) if signature != self._signatures[i]]
+        if not dirty:
+            return dirty
+
+        overall, best, points_for, points_against = (np.array(column) for column in zip(*signatures))
+        point_diff = points_for - points_against
+        total = points_for + points_against
+        dirty_idx = np.array(dirty)
+
+        rows = self._probabilities(dirty_idx[:, None], np.arange(len(self.teams))[None, :],
+                                   overall, best, point_diff, total)
+        self.probabilities[dirty_idx, :] = rows
+        # Columns too: p(b, a) and 1 - p(a, b) can differ in the last bit
+        self.probabilities[:, dirty_idx] = self._probabilities(np.arange(len(self.teams))[:, None], dirty_idx[None, :],
+                                                               overall, best, point_diff, total)
+        for index in ((dirty_idx, slice(None)), (slice(None), dirty_idx)):
+            self.odds[index] = american_odds(self.probabilities[index])
+            self.opponent_odds[index] = american_odds(1.0 - self.probabilities[index])
+        self._signatures = signatures
+        return dirty
+
+    def _probabilities(self, team1_idx, team2_idx, overall, best, point_diff, total):
+        """batch_simulation.win_probabilities for index arrays into the per-team columns"""
+        return batch_simulation.win_probabilities(overall[team1_idx] - overall[team2_idx],
+                                                  point_diff[team1_idx] - point_diff[team2_idx],
+                                                  total[team1_idx], total[team2_idx],
+                                                  best[team1_idx], best[team2_idx], self.params)
+
+    def win_probability(self, team1, team2):
+        """calculate_win_probability(team1, team2, params) from the matrix"""
+        self.refresh()
+        return float(self.probabilities[self._index[team1.name], self._index[team2.name]])
+
+    def matchup_odds(self, team1, team2):
+        """calculate_matchup_odds(team1, team2, params) from the matrix: (team1_odds, team2_odds)"""
+        self.refresh()
+        i, j = self._index[team1.name], self._index[team2.name]
+        return int(self.odds[i, j]), int(self.opponent_odds[i, j])
+
+    def week_odds(self, matches):
+        """
+        Odds for a week of matches.
+
+        Returns:
+            List of (team1, team2, team1_odds, team2_odds)
+        """
+        return [(team1, team2) + self.matchup_odds(team1, team2) for team1, team2 in matches]
+
+    def rating_probabilities(self, standings_engine, prior=1.0):
+        """
+        Bradley-Terry P(teams[i] beats teams[j]) from the head-to-head results
+        (ratings.standings_ratings), in the layout of probabilities, so the
+        posted lines can be set against the ratings.
+
+        Args:
+            standings_engine: standings.StandingsEngine with the games played so far
+            prior: Virtual games per team (see ratings.bradley_terry)
+        """
+        team_ratings = ratings.standings_ratings(standings_engine, prior)
+        column = np.array([team_ratings[team.name] for team in self.teams])
+        return ratings.elo_expected(column[:, None], column[None, :])
+
+    def rated_week_odds(self, matches, standings_engine, prior=1.0):
+        """
+        Posted line of each match next to the ratings' prediction.
+
+        Returns:
+            List of (team1, team2, posted team1 win probability, rated team1 win probability)
+        """
+        self.refresh()
+        rated = self.rating_probabilities(standings_engine, prior)
+        rows = []
+        for team1, team2 in matches:
+            i, j = self._index[team1.name], self._index[team2.name]
+            rows.append((team1, team2, float(self.probabilities[i, j]), float(rated[i, j])))
+        return rows
+
+    def format_week_odds(self, matches):
+        """Caption lines 'A vs B: A -150, B +130' for a week of matches"""
+        return [f"{team1.name} vs {team2.name}: {team1.name} {format_odds(odds1)}, {team2.name} {format_odds(odds2)}"
+                for team1, team2, odds1, odds2 in self.week_odds(matches)]
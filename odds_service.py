@@ -0,0 +1,365 @@
+"""Monte Carlo championship odds derived from the real game model"""
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import batch_simulation
+import bracket
+import config
+import league_state
+
+# Defaults of the weekly futures (futures_odds), overridden by config.FUTURES_*.
+# A probability near 0.5 reaches +/- 0.01 after about 9,600 samples, so the sample
+# cap sits well above that and the precision target (or the time budget) ends sampling.
+FUTURES_PRECISION = 0.01
+FUTURES_SAMPLES = 20000
+FUTURES_TIME_BUDGET = 0.5
+
+
+def wilson_interval(successes, trials, z=1.96):
+    """Wilson score confidence interval for a binomial proportion"""
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+def wilson_half_width(successes, trials, z=1.96):
+    """Half the width of the Wilson interval, vectorized over successes"""
+    p = np.asarray(successes, dtype=float) / trials
+    denominator = 1 + z * z / trials
+    return z * np.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+
+
+def state_snapshot(teams):
+    """Picklable snapshot of team state: names plus one list per Team field"""
+    state = {field: [getattr(team, field) for team in teams]
+             for field in batch_simulation.ReplicaLeague.STATE_FIELDS}
+    state['names'] = [team.name for team in teams]
+    return state
+
+
+def schedule_indices(teams, schedule):
+    """Convert weeks of (team1, team2) Team pairs into weeks of index pairs"""
+    index = {team.name: i for i, team in enumerate(teams)}
+    return [[(index[team1.name], index[team2.name]) for team1, team2 in week] for week in schedule]
+
+
+def simulate_outcome_counts(state, remaining_schedule, replicas, seed, antithetic=False,
+                            common_random_numbers=False, bracket_format=None, params=None):
+    """
+    Play the remaining schedule and the tournament in `replicas` copies of the league.
+
+    Runs in worker processes, so it only takes and returns plain data.
+
+    Args:
+        common_random_numbers: Play every game from per-opportunity uniforms on their
+            own stream of seed, so runs of different scenarios with the same seed share them
+        antithetic: Play antithetic replica pairs (replicas must be even)
+        bracket_format: bracket.Bracket of the tournament (default: bracket.CLASSIC_8)
+        params: game_logic.ModelParams the games are played with (default: DEFAULT_PARAMS)
+
+    Returns:
+        Integer array [n_teams, bracket_format.rounds] counting, per round, how
+        often each team won it (columns follow bracket_format.advancement_names())
+    """
+    bracket_format = bracket_format or bracket.CLASSIC_8
+    league = batch_simulation.ReplicaLeague(state['names'], replicas, params, antithetic=antithetic)
+    if common_random_numbers:
+        sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        game_sequence, uniform_sequence = sequence.spawn(2)
+        rng = np.random.default_rng(game_sequence)
+        league.uniform_rng = np.random.default_rng(uniform_sequence)
+    else:
+        rng = np.random.default_rng(seed)
+    for field in league.STATE_FIELDS:
+        getattr(league, field)[:] = state[field]
+
+    for matches in remaining_schedule:
+        league.play_week(matches, rng)
+    rounds = league.play_bracket(bracket_format, rng)['rounds']
+
+    # Winners of every round are the entrants of the next, never byes
+    n_teams = len(state['names'])
+    return np.stack([np.bincount(winners.ravel(), minlength=n_teams) for winners in rounds[1:]], axis=1)
+
+
+class OddsService:
+    """
+    Championship odds by simulating the rest of the season and the playoff
+    bracket (bracket.CLASSIC_8 unless another is given) many times from the
+    current state.
+
+    Samples are split into fixed-size chunks, each with its own spawned seed,
+    and chunks are spread over a process pool. Results for a given seed and
+    sample count do not depend on the number of workers.
+
+    Sampling is sequential: with a target precision, chunks are added until
+    every published probability's confidence interval is narrow enough, so a
+    lopsided league stops after a few chunks while a close race gets up to
+    the full sample budget. The stopping check runs after every chunk in
+    chunk order, so it does not depend on the number of workers either.
+    """
+
+    def __init__(self, max_workers=None, chunk_size=2000):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def close(self):
+        """Shut down the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _chunk_plan(self, n_samples, seed, antithetic):
+        """Sizes and spawned seeds of the chunks making up n_samples (even sizes when antithetic)"""
+        n_chunks = max(1, math.ceil(n_samples / self.chunk_size))
+        chunk_seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+        chunk_sizes = [min(self.chunk_size, n_samples - i * self.chunk_size) for i in range(n_chunks)]
+        if antithetic:
+            chunk_sizes = [size + size % 2 for size in chunk_sizes]
+        return chunk_sizes, chunk_seeds
+
+    def _iter_chunks(self, state, remaining_schedule, chunk_sizes, chunk_seeds, antithetic,
+                     common_random_numbers=False, bracket_format=None, params=None):
+        """
+        Yield (size, counts, wave_done) for every chunk in chunk order. At most
+        one wave of max_workers chunks is in flight; wave_done marks its last chunk.
+        """
+        if self.max_workers == 1 or len(chunk_sizes) == 1:
+            for size, chunk_seed in zip(chunk_sizes, chunk_seeds):
+                yield size, simulate_outcome_counts(state, remaining_schedule, size, chunk_seed, antithetic,
+                                                    common_random_numbers, bracket_format, params), True
+            return
+
+        executor = self._get_executor()
+        pending = list(zip(chunk_sizes, chunk_seeds))
+        while pending:
+            wave, pending = pending[:self.max_workers], pending[self.max_workers:]
+            futures = [(size, executor.submit(simulate_outcome_counts, state, remaining_schedule, size,
+                                              chunk_seed, antithetic, common_random_numbers, bracket_format,
+                                              params))
+                       for size, chunk_seed in wave]
+            for position, (size, future) in enumerate(futures):
+                yield size, future.result(), position == len(futures) - 1
+
+    def _run_chunks(self, state, remaining_schedule, n_samples, time_budget, seed, target_half_width=None,
+                    min_samples=0, z=1.96, antithetic=False, bracket_format=None, params=None):
+        """
+        Run sample chunks until the precision target is met or the sample or
+        time budget is spent; returns (counts, samples).
+        """
+        start = time.perf_counter()
+        chunk_sizes, chunk_seeds = self._chunk_plan(n_samples, seed, antithetic)
+        rounds = (bracket_format or bracket.CLASSIC_8).rounds
+        counts = np.zeros((len(state['names']), rounds), dtype=np.int64)
+        samples = 0
+
+        for size, chunk_counts, wave_done in self._iter_chunks(state, remaining_schedule, chunk_sizes,
+                                                               chunk_seeds, antithetic, bracket_format=bracket_format,
+                                                               params=params):
+            counts += chunk_counts
+            samples += size
+            if (target_half_width is not None and samples >= min_samples and
+                    wilson_half_width(counts, samples, z).max() <= target_half_width):
+                break
+            # Time is only checked between waves so finished work in a wave is kept
+            if wave_done and time_budget is not None and time.perf_counter() - start > time_budget:
+                break
+        return counts, samples
+
+    def championship_odds(self, teams, remaining_schedule=None, n_samples=10000, time_budget=None,
+                          seed=None, z=1.96, target_half_width=None, min_samples=0, antithetic=False,
+                          bracket_format=None, params=None):
+        """
+        Estimate each team's chance to win every round of the playoff bracket,
+        e.g. to reach the semifinals, the final and win the title.
+
+        Args:
+            teams: List of Team objects in their current state (not modified)
+            remaining_schedule: Weeks still to play, each a list of (team1, team2) tuples
+            n_samples: Maximum number of simulated seasons
+            time_budget: Optional wall-clock limit in seconds; at least one chunk always runs
+            seed: Seed for reproducible odds (None for fresh entropy)
+            z: Normal quantile for the confidence intervals (1.96 = 95%)
+            target_half_width: Stop as soon as every probability's interval is within
+                +/- this (e.g. 0.01); None always uses the full sample budget
+            min_samples: Samples to run before the precision target is checked
+            antithetic: Simulate antithetic replica pairs (see batch_simulation.ReplicaLeague);
+                the Wilson intervals ignore the pairing, so they are conservative
+            bracket_format: bracket.Bracket the playoff is played with (default: bracket.CLASSIC_8)
+            params: game_logic.ModelParams the games are played with (default: DEFAULT_PARAMS)
+
+        Returns:
+            Dictionary mapping team names to a probability per name in
+            bracket_format.advancement_names() (e.g. 'semifinals', 'finals', 'title'),
+            matching '<round>_ci' (low, high) intervals and 'samples'
+        """
+        bracket_format = bracket_format or bracket.CLASSIC_8
+        _check_field(teams, bracket_format)
+        state = state_snapshot(teams)
+        schedule = schedule_indices(teams, remaining_schedule or [])
+        counts, samples = self._run_chunks(state, schedule, n_samples, time_budget, seed, target_half_width,
+                                           min_samples, z, antithetic, bracket_format, params)
+        return _odds_from_counts(teams, counts, samples, z, bracket_format.advancement_names())
+
+    def compare_scenarios(self, scenarios, n_samples=10000, seed=None, z=1.96, antithetic=False,
+                          bracket_format=None, params=None):
+        """
+        Odds under several what-if scenarios with common random numbers.
+
+        Every scenario is simulated on the same chunk seeds, with every game
+        played from a common stream of per-opportunity uniforms, so the random
+        draws line up between scenarios and the differences between them are
+        less noisy than those of independent runs. Difference intervals come from the
+        per-chunk paired differences (batch means).
+
+        Args:
+            scenarios: Dictionary mapping scenario names to (teams, remaining_schedule);
+                the first scenario is the baseline
+            n_samples: Simulated seasons per scenario
+            bracket_format: bracket.Bracket the playoff is played with (default: bracket.CLASSIC_8)
+            params: game_logic.ModelParams the games are played with (default: DEFAULT_PARAMS)
+
+        Returns:
+            Dictionary with 'odds' (scenario name -> championship_odds-style dictionary)
+            and 'differences' (scenario name -> team name -> round name ->
+            (difference from baseline, (low, high)); intervals are None with fewer than two chunks)
+        """
+        bracket_format = bracket_format or bracket.CLASSIC_8
+        round_names = bracket_format.advancement_names()
+        chunk_sizes, chunk_seeds = self._chunk_plan(n_samples, seed, antithetic)
+        chunk_odds = {}
+        odds = {}
+        for name, (teams, remaining_schedule) in scenarios.items():
+            _check_field(teams, bracket_format)
+            state = state_snapshot(teams)
+            schedule = schedule_indices(teams, remaining_schedule or [])
+            counts = [chunk_counts for _, chunk_counts, _ in
+                      self._iter_chunks(state, schedule, chunk_sizes, chunk_seeds, antithetic,
+                                        common_random_numbers=True, bracket_format=bracket_format,
+                                        params=params)]
+            chunk_odds[name] = np.stack(counts) / np.array(chunk_sizes)[:, None, None]
+            odds[name] = _odds_from_counts(teams, sum(counts), sum(chunk_sizes), z, round_names)
+
+        baseline = next(iter(scenarios))
+        team_names = [team.name for team in scenarios[baseline][0]]
+        weights = np.array(chunk_sizes) / sum(chunk_sizes)
+        differences = {}
+        for name in scenarios:
+            paired = chunk_odds[name] - chunk_odds[baseline]
+            mean = np.tensordot(weights, paired, axes=1)
+            half_width = None
+            if len(chunk_sizes) > 1:
+                half_width = z * paired.std(axis=0, ddof=1) / math.sqrt(len(chunk_sizes))
+            differences[name] = {
+                team_name: {round_name: (float(mean[i, column]),
+                                         None if half_width is None else
+                                         (float(mean[i, column] - half_width[i, column]),
+                                          float(mean[i, column] + half_width[i, column])))
+                            for column, round_name in enumerate(round_names)}
+                for i, team_name in enumerate(team_names)
+            }
+        return {'odds': odds, 'differences': differences}
+
+    def what_if_odds(self, teams, matches, remaining_schedule=None, n_samples=10000, seed=None, z=1.96,
+                     bracket_format=None, params=None):
+        """
+        Championship odds for every combination of winners of some matches,
+        e.g. "what if Vista Vipers lose week 5".
+
+        Each combination is forced on a copy-on-write branch of the current
+        league (league_state.LeagueState.outcome_branches) and all of them are
+        simulated against the unforced league with compare_scenarios.
+
+        Args:
+            teams: List of Team objects in their current state (not modified)
+            matches: (team1, team2) Team pairs whose winners are forced
+            remaining_schedule: Weeks still to play after the matches
+            params: game_logic.ModelParams for the forced results and the games (default: DEFAULT_PARAMS)
+
+        Returns:
+            compare_scenarios result; the baseline 'current' plays the matches
+            out, every other scenario is keyed by the tuple of winners' names
+        """
+        league = league_state.LeagueState.from_teams(teams)
+        pairs = [(league.index(team1.name), league.index(team2.name)) for team1, team2 in matches]
+        remaining_schedule = list(remaining_schedule or [])
+        scenarios = {'current': (teams, [list(matches)] + remaining_schedule)}
+        for winners, branch in league.outcome_branches(pairs, params):
+            scenarios[tuple(league.names[winner] for winner in winners)] = (branch.teams(), remaining_schedule)
+        return self.compare_scenarios(scenarios, n_samples, seed, z, bracket_format=bracket_format, params=params)
+
+
+def _check_field(teams, bracket_format):
+    if len(teams) < bracket_format.n_teams:
+        raise ValueError(f"Championship odds need at least {bracket_format.n_teams} teams for the tournament")
+
+
+def _odds_from_counts(teams, counts, samples, z, round_names):
+    """championship_odds result dictionary from outcome counts, one column per round name"""
+    odds = {}
+    for i, team in enumerate(teams):
+        team_odds = {'samples': samples}
+        for column, round_name in enumerate(round_names):
+            team_odds[round_name] = float(counts[i, column] / samples)
+            team_odds[f"{round_name}_ci"] = wilson_interval(int(counts[i, column]), samples, z)
+        odds[team.name] = team_odds
+    return odds
+
+
+_default_service = None
+
+
+def championship_odds(teams, remaining_schedule=None, n_samples=10000, time_budget=None, seed=None,
+                      target_half_width=None, bracket_format=None, params=None):
+    """championship_odds using a shared module-level OddsService"""
+    return _shared_service().championship_odds(teams, remaining_schedule, n_samples, time_budget, seed,
+                                               target_half_width=target_half_width, bracket_format=bracket_format,
+                                               params=params)
+
+
+def _shared_service():
+    global _default_service
+    if _default_service is None:
+        _default_service = OddsService()
+    return _default_service
+
+
+def futures_odds(teams, remaining_schedule, seed, bracket_format=None, params=None, service=None):
+    """
+    Championship odds as posted each week: config.FUTURES_SAMPLES samples at
+    most, within config.FUTURES_TIME_BUDGET seconds, stopping once every
+    probability is within +/- config.FUTURES_PRECISION (None: always the full sample count).
+
+    Args:
+        seed: Seed of the run, e.g. game_logic.game_seed(root, season, FUTURES_STREAM, week)
+        service: OddsService to run on (default: a shared module-level one)
+
+    Returns:
+        OddsService.championship_odds result
+    """
+    service = service or _shared_service()
+    return service.championship_odds(
+        teams, remaining_schedule, getattr(config, 'FUTURES_SAMPLES', FUTURES_SAMPLES),
+        getattr(config, 'FUTURES_TIME_BUDGET', FUTURES_TIME_BUDGET), seed,
+        target_half_width=getattr(config, 'FUTURES_PRECISION', FUTURES_PRECISION),
+        bracket_format=bracket_format, params=params)
@@ -0,0 +1,100 @@
+"""Parameter sweeps over the game model constants, scored by competitive balance"""
+import itertools
+import math
+
+import numpy as np
+
+import game_logic
+import multi_league_runner
+
+# ModelParams fields that only take whole numbers
+INTEGER_FIELDS = ('scoring_opportunities', 'point_diff_floor', 'advantage_cap')
+
+# Balance metrics reported for every parameter set
+METRICS = ('upset_rate', 'blowout_rate', 'champion_entropy', 'leader_won_title_rate', 'mean_score')
+
+
+def parameter_grid(base=None, **values):
+    """
+    ModelParams for every combination of the given field values, e.g.
+    parameter_grid(cascade_chance=[1/20, 1/15, 1/10], advantage_cap=[2, 3, 4]).
+    Fields not given keep their value in base (default: DEFAULT_PARAMS).
+    """
+    base = base or game_logic.DEFAULT_PARAMS
+    fields = list(values)
+    return [base.replace(**dict(zip(fields, combination)))
+            for combination in itertools.product(*(values[field] for field in fields))]
+
+
+def random_parameters(n, ranges, base=None, seed=None):
+    """
+    n ModelParams with fields drawn uniformly at random.
+
+    Args:
+        n: Number of parameter sets
+        ranges: Dictionary mapping fields to (low, high); integer fields include high
+        base: Values of the fields not in ranges (default: DEFAULT_PARAMS)
+        seed: Seed for the draws
+    """
+    base = base or game_logic.DEFAULT_PARAMS
+    rng = np.random.default_rng(seed)
+    draws = {}
+    for field, (low, high) in ranges.items():
+        if field in INTEGER_FIELDS:
+            draws[field] = rng.integers(low, high + 1, size=n).tolist()
+        else:
+            draws[field] = rng.uniform(low, high, size=n).tolist()
+    return [base.replace(**{field: values[i] for field, values in draws.items()}) for i in range(n)]
+
+
+def sweep(param_sets, n_teams=8, repetitions=1, leagues=2000, max_rounds=None, max_workers=None,
+          leagues_per_shard=500, seed=None):
+    """
+    Simulate leagues under every parameter set and report balance metrics.
+
+    All sets go to one multi_league_runner.run_leagues call, so their shards
+    share one process pool and results do not depend on the worker count.
+
+    Args:
+        param_sets: List of game_logic.ModelParams
+        n_teams, repetitions, max_rounds: League format (see multi_league_runner.LeagueSpec)
+        leagues: Leagues simulated per parameter set
+        max_workers: Worker processes (default: CPU count)
+        seed: Root seed (None for fresh entropy)
+
+    Returns:
+        List with one dictionary per parameter set, in order: 'params' plus METRICS
+    """
+    specs = [multi_league_runner.LeagueSpec(n_teams, repetitions, leagues, max_rounds, params)
+             for params in param_sets]
+    summaries = multi_league_runner.run_leagues(specs, max_workers=max_workers,
+                                                leagues_per_shard=leagues_per_shard, seed=seed)
+    results = []
+    for summary in summaries:
+        result = {'params': summary['spec'].params}
+        result.update((metric, summary[metric]) for metric in METRICS)
+        results.append(result)
+    return results
+
+
+def format_results(results, sort_by='champion_entropy', reverse=True):
+    """Table of sweep results, one line per parameter set, showing the fields that vary"""
+    varying = [field for field in game_logic.ModelParams.FIELDS
+               if len({getattr(result['params'], field) for result in results}) > 1]
+    lines = ["  ".join(f"{name:>12.12}" for name in varying + list(METRICS))]
+    for result in sorted(results, key=lambda result: result[sort_by], reverse=reverse):
+        values = [getattr(result['params'], field) for field in varying] + [result[metric] for metric in METRICS]
+        lines.append("  ".join(f"{value:12.4f}" if isinstance(value, float) else f"{value:>12}" for value in values))
+    return "\n".join(lines)
+
+
+def main():
+    param_sets = parameter_grid(cascade_chance=[1 / 20, 1 / 15, 1 / 10], advantage_weight=[0.01, 0.02, 0.04],
+                                advantage_cap=[2, 3, 4])
+    results = sweep(param_sets, leagues=2000, seed=0)
+    print(f"{len(results)} parameter sets, 8 teams (max champion entropy {math.log2(8):.3f} bits)\n")
+    print(format_results(results))
+
+
+if __name__ == "__main__":
+    main()
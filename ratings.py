@@ -0,0 +1,216 @@
+"""Team strength ratings (Elo, Bradley-Terry) fitted over game history"""
+import math
+
+import numpy as np
+
+import batch_simulation
+import game_logic
+
+ELO_INITIAL = 1500.0
+ELO_K = 24.0
+# Rating points per factor of 10 in the odds, as in chess Elo
+ELO_SCALE = 400.0
+
+
+def elo_expected(rating1, rating2):
+    """Chance the side rated rating1 beats the side rated rating2 (works on arrays)"""
+    return 1.0 / (1.0 + 10.0 ** ((np.asarray(rating2) - np.asarray(rating1)) / ELO_SCALE))
+
+
+def elo_update(ratings, team1_idx, team2_idx, team1_won, k=ELO_K):
+    """
+    Apply one batch of games to ratings in place, all predicted from the
+    ratings before the batch (e.g. one week of a round robin).
+
+    Args:
+        ratings: Float array [..., n_teams]; leading axes are independent leagues
+        team1_idx, team2_idx: Team indices of each game, shape [games]
+        team1_won: Booleans broadcastable to [..., games]
+
+    Returns:
+        Predicted team1 win probabilities [..., games] made before the update
+    """
+    team1_idx = np.asarray(team1_idx)
+    team2_idx = np.asarray(team2_idx)
+    expected = elo_expected(ratings[..., team1_idx], ratings[..., team2_idx])
+    change = k * (np.asarray(team1_won, dtype=float) - expected)
+    # add.at so a team playing more than once in the batch gets every change
+    np.add.at(ratings, (Ellipsis, team1_idx), change)
+    np.add.at(ratings, (Ellipsis, team2_idx), -change)
+    return expected
+
+
+def elo_ratings(n_teams, team1_idx, team2_idx, team1_won, weeks=None, k=ELO_K, initial=ELO_INITIAL):
+    """
+    Elo ratings after a game history.
+
+    Args:
+        n_teams: Number of teams (indices run 0..n_teams - 1)
+        team1_idx, team2_idx, team1_won: One entry per game, in the order played
+        weeks: Week of each game; games of the same week are rated together
+            from the ratings at the start of the week. None rates the games
+            one after another.
+
+    Returns:
+        Float array [n_teams]
+    """
+    team1_idx = np.asarray(team1_idx)
+    team2_idx = np.asarray(team2_idx)
+    team1_won = np.asarray(team1_won, dtype=bool)
+    ratings = np.full(n_teams, float(initial))
+    if weeks is None:
+        for i, j, won in zip(team1_idx.tolist(), team2_idx.tolist(), team1_won.tolist()):
+            change = k * (won - 1.0 / (1.0 + 10.0 ** ((ratings[j] - ratings[i]) / ELO_SCALE)))
+            ratings[i] += change
+            ratings[j] -= change
+        return ratings
+
+    weeks = np.asarray(weeks)
+    order = np.argsort(weeks, kind='stable')
+    boundaries = np.flatnonzero(np.diff(weeks[order])) + 1
+    for games in np.split(order, boundaries):
+        elo_update(ratings, team1_idx[games], team2_idx[games], team1_won[games], k)
+    return ratings
+
+
+def wins_matrix(n_teams, team1_idx, team2_idx, team1_won):
+    """[n_teams, n_teams] count of games team i won against team j"""
+    team1_won = np.asarray(team1_won, dtype=bool)
+    winners = np.where(team1_won, team1_idx, team2_idx)
+    losers = np.where(team1_won, team2_idx, team1_idx)
+    wins = np.zeros((n_teams, n_teams), dtype=np.int64)
+    np.add.at(wins, (winners, losers), 1)
+    return wins
+
+
+def bradley_terry(wins, prior=1.0, iterations=500, tolerance=1e-10, initial=None):
+    """
+    Maximum likelihood Bradley-Terry strengths by the MM algorithm (Hunter 2004),
+    where P(i beats j) = 1 / (1 + exp(s_j - s_i)).
+
+    Every team also gets prior virtual games against an average (s = 0)
+    opponent, half of them won, so unbeaten and winless teams stay finite.
+
+    Args:
+        wins: [..., N, N] win counts (entry (i, j) = games i won against j), e.g.
+            StandingsEngine.head_to_head_wins or wins_matrix(); leading axes are
+            independent leagues fitted together
+        initial: Optional starting strengths [..., N] (e.g. the previous week's fit)
+
+    Returns:
+        Float array [..., N] of strengths with mean 0
+    """
+    wins = np.asarray(wins, dtype=float)
+    games = wins + np.swapaxes(wins, -1, -2)
+    total_wins = wins.sum(axis=-1) + prior / 2
+    strength = np.ones(wins.shape[:-1]) if initial is None else np.exp(initial)
+    for _ in range(iterations):
+        pair_sum = strength[..., :, None] + strength[..., None, :]
+        denominator = (games / pair_sum).sum(axis=-1) + prior / (strength + 1.0)
+        updated = total_wins / denominator
+        # Pin the geometric mean at 1 (mean log strength 0)
+        updated /= np.exp(np.log(updated).mean(axis=-1, keepdims=True))
+        converged = np.max(np.abs(updated - strength)) < tolerance
+        strength = updated
+        if converged:
+            break
+    return np.log(strength)
+
+
+def bradley_terry_probability(strengths):
+    """[..., N, N] matrix of P(i beats j) from bradley_terry strengths"""
+    strengths = np.asarray(strengths)
+    return 1.0 / (1.0 + np.exp(strengths[..., None, :] - strengths[..., :, None]))
+
+
+def to_elo_scale(strengths):
+    """Bradley-Terry strengths as Elo-style ratings (same odds per rating gap as elo_expected)"""
+    return ELO_INITIAL + np.asarray(strengths) * ELO_SCALE / math.log(10)
+
+
+def standings_ratings(standings_engine, prior=1.0):
+    """
+    Bradley-Terry ratings of a league from its head-to-head results.
+
+    Args:
+        standings_engine: standings.StandingsEngine with the games played so far
+
+    Returns:
+        Dictionary mapping team names to Elo-scale ratings
+    """
+    strengths = bradley_terry(standings_engine.head_to_head_wins, prior=prior)
+    return dict(zip(standings_engine.names, to_elo_scale(strengths).tolist()))
+
+
+def prediction_scores(probabilities, outcomes):
+    """
+    Accuracy of win probability predictions.
+
+    Args:
+        probabilities: Predicted team1 win probabilities
+        outcomes: Whether team1 won
+
+    Returns:
+        Dictionary with 'games', 'brier', 'log_loss' and 'accuracy' (lower is better for the first two)
+    """
+    probabilities = np.clip(np.ravel(probabilities).astype(float), 1e-12, 1 - 1e-12)
+    outcomes = np.ravel(outcomes).astype(float)
+    return {
+        'games': int(outcomes.size),
+        'brier': float(np.mean((probabilities - outcomes) ** 2)),
+        'log_loss': float(-np.mean(outcomes * np.log(probabilities) + (1 - outcomes) * np.log(1 - probabilities))),
+        'accuracy': float(np.mean((probabilities > 0.5) == (outcomes == 1)))
+    }
+
+
+def compare_predictions(n_teams=8, repetitions=3, replicas=2000, k=ELO_K, prior=1.0, seed=None):
+    """
+    Score the game model's own win probability against Elo and Bradley-Terry.
+
+    Plays replicas independent seasons with batch_simulation.ReplicaLeague.
+    Before each week every method predicts that week's games from what it
+    knows so far: the model from the current team states
+    (calculate_win_probability), Elo from ratings updated through the previous
+    week, Bradley-Terry from a fit on all earlier results.
+
+    Returns:
+        Dictionary mapping 'model', 'elo' and 'bradley_terry' to prediction_scores
+    """
+    rng = np.random.default_rng(seed)
+    league = batch_simulation.ReplicaLeague([f"Team {i + 1}" for i in range(n_teams)], replicas)
+    rows = np.arange(replicas)[:, None]
+    elo = np.full((replicas, n_teams), ELO_INITIAL)
+    wins = np.zeros((replicas, n_teams, n_teams))
+    strengths = np.zeros((replicas, n_teams))
+    predictions = {'model': [], 'elo': [], 'bradley_terry': []}
+    outcomes = []
+
+    for _ in range(repetitions):
+        for matches in game_logic.iter_round_robin_weeks(range(n_teams)):
+            team1_idx = np.array([match[0] for match in matches])
+            team2_idx = np.array([match[1] for match in matches])
+            predictions['model'].append(league.win_probability(rows, team1_idx[None, :], team2_idx[None, :]))
+            predictions['bradley_terry'].append(bradley_terry_probability(strengths)[:, team1_idx, team2_idx])
+
+            team1_won = league.play_matchups(team1_idx[None, :], team2_idx[None, :], rng=rng)['team1_won']
+            predictions['elo'].append(elo_update(elo, team1_idx, team2_idx, team1_won, k))
+            outcomes.append(team1_won)
+
+            winners = np.where(team1_won, team1_idx, team2_idx)
+            losers = np.where(team1_won, team2_idx, team1_idx)
+            np.add.at(wins, (np.broadcast_to(rows, winners.shape), winners, losers), 1)
+            strengths = bradley_terry(wins, prior=prior, initial=strengths)
+
+    outcomes = np.concatenate(outcomes, axis=1)
+    return {name: prediction_scores(np.concatenate(values, axis=1), outcomes)
+            for name, values in predictions.items()}
+
+
+def main():
+    for name, scores in compare_predictions(seed=0).items():
+        print(f"{name:>14}: Brier {scores['brier']:.4f}, log loss {scores['log_loss']:.4f}, "
+              f"accuracy {scores['accuracy']:.3f} ({scores['games']} games)")
+
+
+if __name__ == "__main__":
+    main()
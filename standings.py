@@ -0,0 +1,183 @@
+"""Incremental league standings with per-week checkpoints"""
+import bisect
+
+import numpy as np
+
+import game_logic
+
+
+class StandingsEngine:
+    """
+    League table updated one game at a time.
+
+    The table is kept sorted as games are recorded (a bisect-maintained list
+    of (-wins, -point differential, team index) keys), so reading it never
+    re-sorts, and end_week() stores a checkpoint so standings as of any
+    finished week are a lookup instead of a replay.
+
+    Ordering matches the sorted(..., reverse=True) used for seeding: wins,
+    then point differential, ties in the order teams were given. Results are
+    also stored per pairing in dense [N, N] matrices (head_to_head_games,
+    head_to_head_wins and head_to_head_points, row team against column team)
+    for O(1) head-to-head queries and vectorized schedule strength.
+
+    Args:
+        teams: List of Team objects, in league order
+        reset_records: Start from 0-0 records instead of the teams' current ones
+        head_to_head_tiebreak: Order teams still tied on wins and point
+            differential by their wins against each other
+    """
+
+    def __init__(self, teams, reset_records=False, head_to_head_tiebreak=False):
+        self.teams = list(teams)
+        self.names = [team.name for team in self.teams]
+        self._index = {name: i for i, name in enumerate(self.names)}
+        if reset_records:
+            self.wins = [0] * len(self.teams)
+            self.losses = [0] * len(self.teams)
+            self.points_for = [0] * len(self.teams)
+            self.points_against = [0] * len(self.teams)
+        else:
+            self.wins = [team.wins for team in self.teams]
+            self.losses = [team.losses for team in self.teams]
+            self.points_for = [team.points_for for team in self.teams]
+            self.points_against = [team.points_against for team in self.teams]
+        self.best_stats = [game_logic.best_stat_index(team) for team in self.teams]
+        self.head_to_head_tiebreak = head_to_head_tiebreak
+        n = len(self.teams)
+        self.head_to_head_games = np.zeros((n, n), dtype=np.int32)
+        self.head_to_head_wins = np.zeros((n, n), dtype=np.int32)
+        self.head_to_head_points = np.zeros((n, n), dtype=np.int64)
+        self._order = sorted(self._key(i) for i in range(len(self.teams)))
+        self._checkpoints = {}
+
+    def _key(self, i):
+        return (-self.wins[i], -(self.points_for[i] - self.points_against[i]), i)
+
+    def _update(self, i, won, points_for, points_against):
+        """Apply one game to team i and move it to its new place in the table"""
+        del self._order[bisect.bisect_left(self._order, self._key(i))]
+        if won:
+            self.wins[i] += 1
+        else:
+            self.losses[i] += 1
+        self.points_for[i] += points_for
+        self.points_against[i] += points_against
+        bisect.insort(self._order, self._key(i))
+
+    def record_game(self, game_result):
+        """Apply a play_game result dictionary (ties cannot happen, so one side wins)"""
+        team1, team2 = game_result['team1'], game_result['team2']
+        team1_score, team2_score = game_result['team1_score'], game_result['team2_score']
+        i, j = self._index[team1.name], self._index[team2.name]
+        self._update(i, team1_score > team2_score, team1_score, team2_score)
+        self._update(j, team2_score > team1_score, team2_score, team1_score)
+        self.head_to_head_games[i, j] += 1
+        self.head_to_head_games[j, i] += 1
+        if team1_score > team2_score:
+            self.head_to_head_wins[i, j] += 1
+        else:
+            self.head_to_head_wins[j, i] += 1
+        self.head_to_head_points[i, j] += team1_score
+        self.head_to_head_points[j, i] += team2_score
+        # Best stat as of this game, so a replay of past weeks does not pick up the
+        # live teams' end-of-season advantages (older results fall back to the teams)
+        self.best_stats[i] = game_result.get('team1_best_stat', game_logic.best_stat_index(team1))
+        self.best_stats[j] = game_result.get('team2_best_stat', game_logic.best_stat_index(team2))
+
+    def end_week(self, week):
+        """Checkpoint the table after week so it can be read back later"""
+        self._checkpoints[week] = self.table()
+
+    def weeks(self):
+        """Weeks with a checkpoint, in order"""
+        return sorted(self._checkpoints)
+
+    def _ranked_indices(self):
+        """Team indices in standings order, with the head-to-head tiebreak if enabled"""
+        order = [i for _, _, i in self._order]
+        if not self.head_to_head_tiebreak:
+            return order
+
+        ranked = []
+        start = 0
+        while start < len(order):
+            end = start + 1
+            while end < len(order) and self._order[end][:2] == self._order[start][:2]:
+                end += 1
+            group = order[start:end]
+            if len(group) > 1:
+                # Wins against the other tied teams; the stable sort keeps league order for ties
+                group_wins = self.head_to_head_wins[np.ix_(group, group)].sum(axis=1)
+                group = [group[k] for k in np.argsort(-group_wins, kind='stable')]
+            ranked.extend(group)
+            start = end
+        return ranked
+
+    def head_to_head(self, team1_name, team2_name):
+        """
+        Record between two teams.
+
+        Returns:
+            Dictionary with games, wins and points for each side, e.g.
+            {'games': 2, 'team1_wins': 1, 'team2_wins': 1, 'team1_points': 40, 'team2_points': 37}
+        """
+        i, j = self._index[team1_name], self._index[team2_name]
+        return {
+            'games': int(self.head_to_head_games[i, j]),
+            'team1_wins': int(self.head_to_head_wins[i, j]),
+            'team2_wins': int(self.head_to_head_wins[j, i]),
+            'team1_points': int(self.head_to_head_points[i, j]),
+            'team2_points': int(self.head_to_head_points[j, i])
+        }
+
+    def strength_of_schedule(self):
+        """
+        Games-weighted average win percentage of each team's opponents,
+        leaving out the opponents' games against that team.
+
+        Returns:
+            Array of floats in league order (0.0 for teams without games)
+        """
+        games = self.head_to_head_games.astype(float)
+        wins = self.head_to_head_wins.astype(float)
+        # Opponent j's record excluding its games against team i
+        opponent_wins = wins.sum(axis=1)[None, :] - wins.T
+        opponent_games = games.sum(axis=1)[None, :] - games
+        opponent_pct = np.divide(opponent_wins, opponent_games, out=np.zeros_like(games), where=opponent_games > 0)
+        total_games = games.sum(axis=1)
+        return np.divide((games * opponent_pct).sum(axis=1), total_games,
+                         out=np.zeros(len(total_games)), where=total_games > 0)
+
+    def table(self, week=None):
+        """
+        Standings rows, best first: (name, wins, losses, points_for, points_against, best_stat).
+
+        Args:
+            week: Week whose checkpoint to return (default: the current table)
+        """
+        if week is not None:
+            return self._checkpoints[week]
+        return tuple((self.names[i], self.wins[i], self.losses[i], self.points_for[i],
+                      self.points_against[i], game_logic.STAT_NAMES[self.best_stats[i]])
+                     for i in self._ranked_indices())
+
+    def ranked_teams(self):
+        """Team objects in current standings order, e.g. for tournament seeding"""
+        return [self.teams[i] for i in self._ranked_indices()]
+
+    def format_caption(self, week=None):
+        """Standings in the format_standings_for_caption layout"""
+        standings_lines = []
+        for rank, (name, wins, losses, points_for, points_against, best_stat) in enumerate(self.table(week), 1):
+            point_diff = points_for - points_against
+            point_diff_str = f"+{point_diff}" if point_diff >= 0 else str(point_diff)
+            standings_lines.append(f"{rank}. {name} ({wins}-{losses}, PF: {points_for}, PA: {points_against}, Best: {best_stat}, {point_diff_str})")
+        return "\n".join(standings_lines)
+
+    def display(self, week=None):
+        """Print standings in the display_standings layout"""
+        for rank, (name, wins, losses, points_for, points_against, best_stat) in enumerate(self.table(week), 1):
+            print(f"{rank}. {name}: W-L: {wins}-{losses}, "
+                  f"PF: {points_for}, PA: {points_against}, "
+                  f"Best Stat: {best_stat}")